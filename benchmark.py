@@ -0,0 +1,229 @@
+import argparse
+import contextlib
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from . import get_data
+from .get_data import decode_nbt_base64, extract_all_items, extract_pets
+from .items import ItemIndex
+from .pet_index import PetIndex
+from .mapleWeight import score_profile
+from .individual_weights.mw_utils.Accessory_Registry import load_registry
+from .individual_weights.mw_utils.MP_Calc import calculate_magical_power
+from .individual_weights.weapons import weapon_weight
+from .individual_weights.pets import pet_weight
+from .individual_weights.slayers import slayer_weight
+from .individual_weights.farming import farming_weight
+from .individual_weights.dungeons import dungeon_weight
+from .individual_weights.generic_skills import generic_skill_weight
+from .individual_weights.foraging import foraging_weight
+from .individual_weights.diana import diana_weight
+from .individual_weights.fishing import fishing_weight
+from .individual_weights.mining import mining_weight
+
+# Offline benchmarks against the bundled profile fixtures (no network).
+# Every stage is run `repeat` times over all fixture profiles. Wall time comes from clean runs; allocations come
+# from one extra run under tracemalloc so the tracing overhead doesn't leak into the timings.
+# NBT decoding is measured cold (the decode cache is cleared before each run) since that's the expensive case.
+#   python -m MapleWeight.benchmark -o bench.json
+#   python -m MapleWeight.benchmark -o bench_new.json --compare bench.json
+
+HERE = os.path.dirname(__file__)
+PROFILE_CACHE_FIXTURE = os.path.join(HERE, "profile_cache.json")
+PROFILE_DUMP_FIXTURE = os.path.join(HERE, "full_profile_data_dump.json")
+DEFAULT_REPEAT = 5
+NO_DATA = {}  # stands in for museum / garden responses, which aren't part of the fixtures
+
+
+def load_fixtures():
+    """[(label, profile, uuid)] for every fixture profile that has data for its player."""
+    fixtures = []
+    with open(PROFILE_CACHE_FIXTURE, "r", encoding="utf-8") as f:
+        cache = json.load(f)
+    for username, (profiles, _) in cache["profile_cache"].items():
+        uuid = cache["uuid_cache"][username][0]
+        for profile in profiles:
+            if uuid in profile.get("members", {}):
+                fixtures.append((f"{username}/{profile.get('cute_name', '?')}", profile, uuid))
+
+    with open(PROFILE_DUMP_FIXTURE, "r", encoding="utf-8") as f:
+        dump = json.load(f)
+    for uuid, member in dump.get("members", {}).items():
+        if "inventory" in member:
+            fixtures.append((f"dump/{uuid[:8]}", dump, uuid))
+    return fixtures
+
+
+def _nbt_blobs(value):
+    # Every encoded inventory blob, found the same way extract_all_items finds them ("data" strings)
+    if isinstance(value, dict):
+        for key, inner in value.items():
+            if key == "data" and isinstance(inner, str):
+                yield inner
+            else:
+                yield from _nbt_blobs(inner)
+    elif isinstance(value, list):
+        for inner in value:
+            yield from _nbt_blobs(inner)
+
+
+class Prepared:
+    """Per-fixture inputs decoded once up front, so category stages only measure the scorer itself."""
+
+    def __init__(self, label, profile, uuid):
+        self.label = label
+        self.profile = profile
+        self.uuid = uuid
+        self.blobs = list(_nbt_blobs(profile["members"][uuid].get("inventory", {})))
+        self.item_list = list(extract_all_items(profile, uuid, museum_data=NO_DATA))
+        self.pet_list = list(extract_pets(profile, uuid))
+
+    # Fresh indexes per run: the indexes cache their queries, which would flatter every run after the first
+    @property
+    def items(self):
+        return ItemIndex(self.item_list)
+
+    @property
+    def pets(self):
+        return PetIndex(self.pet_list)
+
+
+def _decode_all(p):
+    for blob in p.blobs:
+        decode_nbt_base64(blob)
+
+
+# stage -> (setup(p) -> args, fn(*args), clears the NBT cache first)
+STAGES = {
+    "decode_nbt_base64": (lambda p: (p,), _decode_all, True),
+    "extract_all_items": (lambda p: (p.profile, p.uuid, NO_DATA), extract_all_items, True),
+    "calculate_magical_power": (lambda p: (p.items, p.profile, p.uuid), calculate_magical_power, False),
+    "weapon_weight": (lambda p: (p.items, p.profile, p.uuid), weapon_weight, False),
+    "pet_weight": (lambda p: (p.pets, p.profile, p.uuid), pet_weight, False),
+    "slayer_weight": (lambda p: (p.profile, p.uuid, p.pets, p.items), slayer_weight, False),
+    "farming_weight": (lambda p: (p.profile, p.uuid, p.pets, p.items, NO_DATA), farming_weight, False),
+    "generic_skill_weight": (lambda p: (p.profile, p.uuid), generic_skill_weight, False),
+    "dungeon_weight": (lambda p: (p.profile, p.uuid, p.pets, p.items), dungeon_weight, False),
+    "foraging_weight": (lambda p: (p.profile, p.uuid, p.items), foraging_weight, False),
+    "diana_weight": (lambda p: (p.profile, p.uuid, p.items), diana_weight, False),
+    "fishing_weight": (lambda p: (p.profile, p.uuid, p.pets, p.items), fishing_weight, False),
+    "mining_weight": (lambda p: (p.profile, p.uuid, p.items, p.pets), mining_weight, False),
+    "score_profile": (lambda p: (p.label, p.profile, p.uuid, NO_DATA, NO_DATA), score_profile, True),
+}
+
+
+def _run_once(prepared, setup, fn, cold):
+    # Arguments are built outside the timed region
+    calls = [setup(p) for p in prepared]
+    if cold:
+        get_data._nbt_cache.clear()
+    start = time.perf_counter()
+    for args in calls:
+        fn(*args)
+    return time.perf_counter() - start
+
+
+def _allocations(prepared, setup, fn, cold):
+    calls = [setup(p) for p in prepared]
+    if cold:
+        get_data._nbt_cache.clear()
+    tracemalloc.start()
+    try:
+        for args in calls:
+            fn(*args)
+        retained, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"peak_bytes": peak, "retained_bytes": retained}
+
+
+def bench_stage(name, prepared, repeat):
+    setup, fn, cold = STAGES[name]
+    _run_once(prepared, setup, fn, cold)  # warm-up (imports, registry, regex compilation)
+    times = [_run_once(prepared, setup, fn, cold) for _ in range(repeat)]
+    median = statistics.median(times)
+    return {
+        "runs": repeat,
+        "min_s": min(times),
+        "median_s": median,
+        "mean_s": statistics.fmean(times),
+        "max_s": max(times),
+        "per_profile_ms": median / len(prepared) * 1000,
+        "profiles_per_s": len(prepared) / median if median else None,
+        **_allocations(prepared, setup, fn, cold),
+    }
+
+
+def _git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=HERE, capture_output=True, text=True, timeout=5)
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def run_benchmarks(stages=None, repeat=DEFAULT_REPEAT):
+    """Runs the selected stages (default: all) and returns the report as a dict."""
+    load_registry()
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        # The scorers print the odd diagnostic; keep them out of the report
+        fixtures = load_fixtures()
+        prepared = [Prepared(*fixture) for fixture in fixtures]
+        results = {name: bench_stage(name, prepared, repeat) for name in (stages or STAGES)}
+    return {
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.time(),
+        "repeat": repeat,
+        "profiles": [p.label for p in prepared],
+        "items": sum(len(p.item_list) for p in prepared),
+        "stages": results,
+    }
+
+
+def format_report(report, baseline=None):
+    lines = [f"{len(report['profiles'])} profiles, {report['items']} items, {report['repeat']} runs per stage"
+             + (f" @ {report['commit']}" if report["commit"] else "")]
+    lines.append(f"{'stage':<24}{'median ms':>11}{'per prof ms':>13}{'prof/s':>10}{'peak KiB':>10}" + ("  vs baseline" if baseline else ""))
+    for name, stage in report["stages"].items():
+        line = (f"{name:<24}{stage['median_s'] * 1000:>11.2f}{stage['per_profile_ms']:>13.3f}"
+                f"{stage['profiles_per_s'] or 0:>10.1f}{stage['peak_bytes'] / 1024:>10.0f}")
+        old = (baseline or {}).get("stages", {}).get(name)
+        if old and old["median_s"]:
+            line += f"  {(stage['median_s'] / old['median_s'] - 1) * 100:+.1f}%"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def cli(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark MapleWeight's decode and scoring stages on the bundled fixtures.")
+    parser.add_argument("-n", "--repeat", type=int, default=DEFAULT_REPEAT, help=f"timed runs per stage (default: {DEFAULT_REPEAT})")
+    parser.add_argument("-s", "--stage", action="append", choices=list(STAGES), help="only run this stage (can be repeated)")
+    parser.add_argument("-o", "--output", default=None, help="write the report as JSON to this path")
+    parser.add_argument("--compare", default=None, help="JSON report from an earlier run to compare against")
+    args = parser.parse_args(argv)
+
+    if args.repeat < 1:
+        parser.error("--repeat must be at least 1")
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    report = run_benchmarks(args.stage, args.repeat)
+    print(format_report(report, baseline))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Report written to {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    cli()
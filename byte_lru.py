@@ -0,0 +1,48 @@
+from collections import OrderedDict
+from .metrics import CACHE_HITS, CACHE_MISSES, CACHE_EVICTIONS
+
+# LRU cache bounded by the total size of what it holds rather than by entry count.
+# Hits, misses and evictions are counted in the metrics registry under cache=`name`.
+
+
+class ByteLRU:
+    def __init__(self, max_bytes, name="byte_lru"):
+        self.max_bytes = max_bytes
+        self.name = name
+        self.size = 0
+        self._entries = OrderedDict()  # key -> (value, nbytes)
+
+    def get(self, key, default=None):
+        entry = self._entries.get(key)
+        if entry is None:
+            CACHE_MISSES.inc(cache=self.name)
+            return default
+        self._entries.move_to_end(key)
+        CACHE_HITS.inc(cache=self.name)
+        return entry[0]
+
+    def put(self, key, value, nbytes):
+        if nbytes > self.max_bytes:
+            return  # would evict everything else and still not fit
+
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.size -= old[1]
+
+        self._entries[key] = (value, nbytes)
+        self.size += nbytes
+
+        while self.size > self.max_bytes:
+            _, (_, evicted_bytes) = self._entries.popitem(last=False)
+            self.size -= evicted_bytes
+            CACHE_EVICTIONS.inc(cache=self.name)
+
+    def clear(self):
+        self._entries.clear()
+        self.size = 0
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,76 @@
+import os
+import sqlite3
+import threading
+import time
+
+# Keyed on-disk cache backing the UUID / profile caches in get_data.py.
+# SQLite in WAL mode: every read and write touches a single row, readers never block the writer,
+# and several worker processes can share the same file safely.
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache (
+    namespace  TEXT NOT NULL,
+    key        TEXT NOT NULL,
+    value      BLOB NOT NULL,
+    updated_at REAL NOT NULL,
+    expires_at REAL NOT NULL,
+    PRIMARY KEY (namespace, key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS cache_expires_at ON cache (expires_at);
+"""
+
+
+class CacheStore:
+    def __init__(self, path, *, busy_timeout=30):
+        self.path = path
+        self.busy_timeout = busy_timeout
+        self._conn = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def _connection(self):
+        # sqlite connections must not cross a fork, so a child process opens its own
+        if self._conn is None or self._pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=self.busy_timeout, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(SCHEMA)
+            self._conn = conn
+            self._pid = os.getpid()
+        return self._conn
+
+    def get(self, namespace, key, now=None):
+        """Returns (value, updated_at) for a live entry, or None."""
+        now = time.time() if now is None else now
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT value, updated_at FROM cache WHERE namespace = ? AND key = ? AND expires_at > ?",
+                (namespace, key, now),
+            ).fetchone()
+        if row is None:
+            return None
+        return bytes(row[0]), row[1]
+
+    def put(self, namespace, key, value, updated_at, expires_at):
+        with self._lock:
+            self._connection().execute(
+                "INSERT OR REPLACE INTO cache (namespace, key, value, updated_at, expires_at) VALUES (?, ?, ?, ?, ?)",
+                (namespace, key, value, updated_at, expires_at),
+            )
+
+    def delete(self, namespace, key):
+        with self._lock:
+            self._connection().execute("DELETE FROM cache WHERE namespace = ? AND key = ?", (namespace, key))
+
+    def purge_expired(self, now=None):
+        """Deletes every expired row and returns how many were removed."""
+        now = time.time() if now is None else now
+        with self._lock:
+            return self._connection().execute("DELETE FROM cache WHERE expires_at <= ?", (now,)).rowcount
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None and self._pid == os.getpid():
+                self._conn.close()
+            self._conn = None
+            self._pid = None
@@ -0,0 +1,122 @@
+import asyncio
+import atexit
+import threading
+from .mapleWeight import main
+from .http_client import close_session
+
+# Long-lived entry point for bots and services.
+# Async callers await MapleWeightClient methods on their own loop, so lookups share that loop's pooled session
+# and in-flight deduplication. Sync callers go through one persistent background loop thread instead of
+# spinning up a new event loop (and a new HTTP session) per call with asyncio.run.
+
+
+class BackgroundLoop:
+    """An event loop running forever in a daemon thread; coroutines are submitted to it from any thread."""
+
+    def __init__(self, name="mapleweight-loop"):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    @property
+    def running(self):
+        return self._thread.is_alive() and not self.loop.is_closed()
+
+    def submit(self, coro):
+        """Schedules coro on the background loop and returns a concurrent.futures.Future for its result."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro, timeout=None):
+        """Blocks until coro has finished on the background loop and returns its result."""
+        return self.submit(coro).result(timeout)
+
+    def stop(self, timeout=10):
+        if not self.running:
+            return
+        # Close this loop's HTTP session on the loop itself before stopping it; other loops keep theirs
+        try:
+            self.run(close_session(), timeout)
+        except Exception as e:
+            print(f"Error closing HTTP session on background loop: {e}")
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(timeout)
+        if not self._thread.is_alive():
+            self.loop.close()
+
+
+_background = None
+_background_lock = threading.Lock()
+
+
+def get_background_loop():
+    """The shared background loop, started on first use and stopped at interpreter exit."""
+    global _background
+    with _background_lock:
+        if _background is None or not _background.running:
+            _background = BackgroundLoop()
+        return _background
+
+
+def stop_background_loop():
+    global _background
+    with _background_lock:
+        background, _background = _background, None
+    if background is not None:
+        background.stop()
+
+
+atexit.register(stop_background_loop)
+
+
+class MapleWeightClient:
+    """
+    Async-first MapleWeight client.
+
+        async with MapleWeightClient(API_KEY) as client:
+            result = await client.get_weight("username")
+
+    From sync code (or from another loop without tying up executor threads):
+
+        client = MapleWeightClient(API_KEY)
+        result = client.get_weight_sync("username")
+        result = await asyncio.wrap_future(client.submit("username"))
+
+    Clients don't own a connection pool: every lookup on a loop goes through that loop's shared session
+    (see http_client.py), so opening and closing clients per command is cheap and keeps connections warm.
+    Close the session once, when the application shuts down, by awaiting http_client.close_session() on that
+    loop (or wrap the app's lifetime in http_client.http_session()). The background loop closes its own.
+    """
+
+    def __init__(self, api_key, *, quiet=True):
+        self.api_key = api_key
+        self.quiet = quiet  # default for every lookup; True means nothing is printed
+
+    async def get_weight(self, username, *, profile=None, infodump=False, quiet=None):
+        """Returns a WeightResult for the player (see result.py)."""
+        return await main(
+            username, self.api_key, profile=profile, infodump=infodump,
+            quiet=self.quiet if quiet is None else quiet,
+        )
+
+    async def aclose(self):
+        # Nothing to release: the loop's session is shared with every other lookup, so it's left open (see above)
+        pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+    # Sync API, backed by the shared background loop
+
+    def submit(self, username, **kwargs):
+        """Starts a lookup on the background loop and returns a concurrent.futures.Future."""
+        return get_background_loop().submit(self.get_weight(username, **kwargs))
+
+    def get_weight_sync(self, username, *, timeout=None, **kwargs):
+        return self.submit(username, **kwargs).result(timeout)
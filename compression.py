@@ -0,0 +1,53 @@
+import hashlib
+import json
+import zlib
+
+# Compressed framing for cached JSON payloads (mostly raw Hypixel profile responses).
+# A frame is MAGIC + codec byte + zlib stream. Anything without the magic prefix is treated as plain
+# UTF-8 JSON, so rows written before compression was added still load.
+
+MAGIC = b"MWZ"
+CODEC_ZLIB = b"\x01"
+COMPRESSION_LEVEL = 6
+
+
+def pack_json(value, *, compress=True):
+    raw = json.dumps(value, separators=(",", ":")).encode("utf-8")
+    if not compress:
+        return raw
+    return MAGIC + CODEC_ZLIB + zlib.compress(raw, COMPRESSION_LEVEL)
+
+
+def unpack_json(blob):
+    blob = bytes(blob)
+    if blob.startswith(MAGIC):
+        codec = blob[len(MAGIC):len(MAGIC) + 1]
+        if codec != CODEC_ZLIB:
+            raise ValueError(f"Unknown cache payload codec: {codec!r}")
+        blob = zlib.decompress(blob[len(MAGIC) + 1:])
+    return json.loads(blob)
+
+
+class CompressedJSON:
+    """A JSON value held in compressed form and only decoded when load() is called."""
+    __slots__ = ("blob", "_digest")
+
+    def __init__(self, blob):
+        self.blob = bytes(blob)
+        self._digest = None
+
+    @classmethod
+    def from_value(cls, value):
+        return cls(pack_json(value))
+
+    def load(self):
+        return unpack_json(self.blob)
+
+    def digest(self):
+        """Content hash of the payload, computed once. Handy as a cheap "has this changed" fingerprint."""
+        if self._digest is None:
+            self._digest = hashlib.blake2b(self.blob, digest_size=16).hexdigest()
+        return self._digest
+
+    def __len__(self):
+        return len(self.blob)
@@ -0,0 +1,183 @@
+import math
+from functools import partial
+import numpy as np
+from .individual_weights import slayers, dungeons, mining, diana, farming
+from .individual_weights.generic_skills import skill_curve
+
+# NumPy versions of the weight curves, for scoring a whole column of values (one per player) in one call.
+# Results are identical to the scalar functions they mirror. np.log isn't always rounded the same way as
+# math.log (they can differ in the last bit), so any value that lands within a hair of an int()/round()
+# boundary is recomputed with the scalar function; everywhere else a last-bit difference can't change the result.
+# Inputs are treated as float64. Like math.log, a value outside a curve's domain raises ValueError.
+#   scores = batch_score({"zombie": [120_000, 2_400_000], "catacombs": [5.6e8, 1.2e7]})
+
+BOUNDARY_TOLERANCE = 1e-9  # relative; far above the error a last-bit log difference can cause
+
+
+def _values(x):
+    return np.asarray(x, dtype=np.float64)
+
+
+def _log(value, base):
+    # math.log(x, base) is log(x) / log(base)
+    if not np.all(value > 0):
+        raise ValueError("math domain error")
+    return np.log(value) / math.log(base)
+
+
+def _fix_boundaries(out, raw, x, scalar, boundary):
+    """Recomputes with `scalar` wherever `raw` is within tolerance of a rounding boundary."""
+    if boundary == "half":  # round(): boundaries at n + 0.5
+        distance = np.abs(raw - np.floor(raw) - 0.5)
+    else:  # int(): boundaries at whole numbers
+        distance = np.abs(raw - np.round(raw))
+    suspect = np.nonzero(distance <= BOUNDARY_TOLERANCE * np.maximum(1.0, np.abs(raw)))[0]
+    for i in suspect:
+        out[i] = scalar(float(x[i]))
+    return out
+
+
+def _truncated(raw, x, scalar, floor_zero=False):
+    out = np.trunc(raw).astype(np.int64)
+    if floor_zero:
+        out = np.maximum(out, 0)
+    return _fix_boundaries(out, raw, x, scalar, "int")
+
+
+# Slayers
+
+def r(x):
+    x = _values(x)
+    raw = (2/3) * (1100 * _log((x + 300000) / 30000, 100) - 400)
+    return _truncated(raw, x, slayers.r)
+
+
+def s(x):
+    return r(x) / 4
+
+
+def w(x):
+    return r(x) * 1.5
+
+
+def e(x):
+    x = _values(x)
+    base = r(np.minimum(x, 1_000_000)) * 2.25
+    extra = (r(x) - slayers.r(1_000_000)) * 1.125  # same operation order as slayers.e
+    return np.where(x <= 1_000_000, base, base + extra)
+
+
+def b(x):
+    x = _values(x)
+    base = r(np.minimum(x, 1_000_000)) * 3
+    extra = (r(x) - slayers.r(1_000_000)) * 3 * 0.75  # same operation order as slayers.b
+    return np.where(x <= 1_000_000, base, base + extra)
+
+
+# Dungeons, mining, diana
+
+def catacombs_weight(cata_exp):
+    x = _values(cata_exp)
+    raw = 1400 * _log((x + 20_000_000) / 2_000_000, 45) - 847
+    return _truncated(raw, x, dungeons.catacombs_weight, floor_zero=True)
+
+
+def m_weight(x):
+    x = _values(x)
+    raw = 1300 * _log((x + 2_000_000) / 2_000_000, 300)
+    return _truncated(raw, x, mining.m_weight)
+
+
+def g_weight(x):
+    x = _values(x)
+    raw = 1900 * _log((x + 2_000_000) / 2_000_000, 300)
+    return _truncated(raw, x, mining.g_weight)
+
+
+def mythos_kill_weight(x):
+    x = _values(x)
+    raw = 293 * _log(x + 2000, 23) - 711
+    return _truncated(raw, x, diana.mythos_kill_weight, floor_zero=True)
+
+
+# Skills
+
+def farming_exp_curve(farming_exp):
+    """Vector farming_exp_weight score: 0 for no EXP, farming.farming_exp_curve otherwise."""
+    x = _values(farming_exp)
+    has_exp = x > 0
+    safe = np.where(has_exp, x, 0.0)
+    raw = ((5000 * _log((safe + 20000000) / 2000, 200)) - 8700) / 3.5
+    out = np.maximum(np.round(raw), 0).astype(np.int64)  # np.round rounds half to even, like round()
+    out = _fix_boundaries(out, raw, safe, farming.farming_exp_curve, "half")
+    return np.where(has_exp, out, 0)
+
+
+def skill_weight(exp, scale):
+    """Vector generic_skills.skill_curve (alchemy, carpentry, enchanting, taming, foraging, fishing)."""
+    x = _values(exp)
+    raw = (1000 * _log((x + 10_000_000) / 30_000_000, 200) + 208) * scale
+    return _truncated(raw, x, lambda value: skill_curve(value, scale))
+
+
+# Batch API
+
+SKILL_SCALES = {
+    "alchemy": 0.5,
+    "carpentry": 0.4,
+    "enchanting": 0.2,
+    "taming": 0.2,
+    "foraging": 1.2,
+    "fishing": 0.75,
+}
+
+# column name -> vector curve
+CURVES = {
+    "zombie": r,
+    "spider": s,
+    "wolf": w,
+    "enderman": e,
+    "blaze": b,
+    "catacombs": catacombs_weight,
+    "mithril_powder": m_weight,
+    "gemstone_powder": g_weight,
+    "glacite_powder": g_weight,
+    "mythos_kills": mythos_kill_weight,
+    "farming": farming_exp_curve,
+    **{skill: partial(skill_weight, scale=scale) for skill, scale in SKILL_SCALES.items()},
+}
+
+
+def batch_score(columns):
+    """{column name: values for N players} -> {column name: array of N scores}, see CURVES for the names."""
+    unknown = set(columns) - set(CURVES)
+    if unknown:
+        raise KeyError(f"No curve for: {', '.join(sorted(unknown))}")
+    return {name: CURVES[name](values) for name, values in columns.items()}
+
+
+def experience_columns(members):
+    """
+    Pulls every column in CURVES out of N profile member dicts (profile["members"][uuid]), read the same way
+    the scorers read them, so batch_score(experience_columns(members)) scores the whole batch at once.
+    """
+    def get(member, *path):
+        value = member
+        for key in path:
+            value = value.get(key, {}) if isinstance(value, dict) else {}
+        return value if isinstance(value, (int, float)) else 0
+
+    columns = {name: np.zeros(len(members)) for name in CURVES}
+    for i, member in enumerate(members):
+        for boss in ("zombie", "spider", "wolf", "enderman", "blaze"):
+            columns[boss][i] = get(member, "slayer", "slayer_bosses", boss, "xp")
+        columns["catacombs"][i] = get(member, "dungeons", "dungeon_types", "catacombs", "experience")
+        # mining.hotm_weight adds up glacite powder for its "mithril" value, so this does too
+        columns["mithril_powder"][i] = get(member, "mining_core", "powder_glacite") + get(member, "mining_core", "powder_spent_glacite")
+        columns["gemstone_powder"][i] = get(member, "mining_core", "powder_gemstone") + get(member, "mining_core", "powder_spent_gemstone")
+        columns["glacite_powder"][i] = get(member, "mining_core", "powder_glacite") + get(member, "mining_core", "powder_spent_glacite")
+        columns["mythos_kills"][i] = get(member, "player_stats", "mythos", "kills")
+        columns["farming"][i] = get(member, "player_data", "experience", "SKILL_FARMING")
+        for skill in SKILL_SCALES:
+            columns[skill][i] = get(member, "player_data", "experience", f"SKILL_{skill.upper()}")
+    return columns
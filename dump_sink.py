@@ -0,0 +1,128 @@
+import asyncio
+import json
+import os
+import zlib
+
+import aiofiles
+import aiofiles.os
+
+from .items import Item, ItemIndex
+from .pet_index import Pet, PetIndex
+
+# Opt-in diagnostic dumps (e.g. every decoded item for a player).
+# Nothing is written unless enable_item_dumps() has been called. Records are appended to one JSON-lines file,
+# encoded incrementally with a `default=` hook (no recursive copy of the data first) and written asynchronously.
+# With compress=True every record is its own gzip member, so the file is still a valid .gz that can be
+# appended to. Once the file grows past max_bytes it's rotated to path.1, path.2, ... keeping `backups` old files.
+
+DEFAULT_DUMP_PATH = "item_dump.jsonl"
+DEFAULT_MAX_BYTES = 16 * 1024 * 1024
+DEFAULT_BACKUPS = 3
+WRITE_CHUNK_SIZE = 64 * 1024
+GZIP_LEVEL = 6
+
+
+def json_default(obj):
+    """`default=` hook for json: handles the records and indexes the scorers work with."""
+    if isinstance(obj, (Item, Pet)):
+        return obj.to_dict()
+    if isinstance(obj, (ItemIndex, PetIndex)):
+        return list(obj)
+    if isinstance(obj, (bytes, bytearray)):
+        return list(obj)
+    if hasattr(obj, "value"):
+        return obj.value  # nbtlib tags
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+_encoder = json.JSONEncoder(default=json_default, ensure_ascii=False, separators=(",", ":"))
+
+
+class DumpSink:
+    def __init__(self, path=DEFAULT_DUMP_PATH, *, compress=False, max_bytes=DEFAULT_MAX_BYTES, backups=DEFAULT_BACKUPS):
+        if compress and not path.endswith(".gz"):
+            path += ".gz"
+        self.path = path
+        self.compress = compress
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self._size = None  # current file size, looked up on first write
+        self._lock = None
+        self._lock_loop = None
+
+    def _get_lock(self):
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._lock_loop is not loop:
+            self._lock = asyncio.Lock()
+            self._lock_loop = loop
+        return self._lock
+
+    def _chunks(self, record):
+        compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31) if self.compress else None  # 31 = gzip framing
+        pending = []
+        pending_size = 0
+
+        def flush():
+            data = "".join(pending).encode("utf-8")
+            pending.clear()
+            return compressor.compress(data) if compressor else data
+
+        for piece in _encoder.iterencode(record):
+            pending.append(piece)
+            pending_size += len(piece)
+            if pending_size >= WRITE_CHUNK_SIZE:
+                pending_size = 0
+                yield flush()
+        pending.append("\n")
+        yield flush()
+        if compressor:
+            yield compressor.flush()
+
+    async def _rotate(self):
+        for i in range(self.backups - 1, 0, -1):
+            src = f"{self.path}.{i}"
+            if await aiofiles.os.path.exists(src):
+                await aiofiles.os.replace(src, f"{self.path}.{i + 1}")
+        if self.backups > 0:
+            await aiofiles.os.replace(self.path, f"{self.path}.1")
+        else:
+            await aiofiles.os.remove(self.path)
+        self._size = 0
+
+    async def write(self, record):
+        async with self._get_lock():
+            if self._size is None:
+                try:
+                    self._size = (await aiofiles.os.stat(self.path)).st_size
+                except FileNotFoundError:
+                    self._size = 0
+            if self._size >= self.max_bytes:
+                await self._rotate()
+
+            directory = os.path.dirname(self.path)
+            if directory:
+                await aiofiles.os.makedirs(directory, exist_ok=True)
+
+            async with aiofiles.open(self.path, "ab") as f:
+                for chunk in self._chunks(record):
+                    if chunk:
+                        await f.write(chunk)
+                        self._size += len(chunk)
+
+
+_sink = None
+
+
+def enable_item_dumps(path=DEFAULT_DUMP_PATH, *, compress=False, max_bytes=DEFAULT_MAX_BYTES, backups=DEFAULT_BACKUPS):
+    global _sink
+    _sink = DumpSink(path, compress=compress, max_bytes=max_bytes, backups=backups)
+    return _sink
+
+
+def disable_item_dumps():
+    global _sink
+    _sink = None
+
+
+def get_dump_sink():
+    return _sink
@@ -1,60 +1,126 @@
-import aiohttp
-import json
 import base64, zlib
-import nbtlib
 from nbtlib.tag import ByteArray
 import gzip
-import io
 import time
 import os
-
-_profile_cache = {}  # username -> (profiles, last_updated_time)
+import logging
+import hashlib
+from .http_client import fetch_json
+from .rate_limit import get_limiter
+from .single_flight import SingleFlight
+from .cache_store import CacheStore
+from .compression import CompressedJSON, pack_json, unpack_json
+from .byte_lru import ByteLRU
+from .nbt_reader import read_items
+from .items import Item, ItemIndex, items_from_nbt
+from .pet_index import Pet, PetIndex
+from .metrics import CACHE_HITS, CACHE_MISSES, CACHE_EVICTIONS, NBT_BYTES_DECODED, NBT_BLOBS_DECODED
+
+_profile_cache = {}  # username -> (CompressedJSON of profiles, last_updated_time)
 _uuid_cache = {}     # username -> (uuid, last_updated_time)
-CACHE_PATH = os.path.join(os.path.dirname(__file__), "profile_cache.json")
 
 CACHE_TTL = 300     # how long data is trusted (used on access)
 CACHE_MAX_AGE = 600 # how long we keep data before purging on access
+STORE_PURGE_INTERVAL = 60  # how often expired rows are swept out of the on-disk store
+
+# The dicts above are the in-process layer; the SQLite store behind them persists entries across restarts
+# and worker processes. Entries are read and written one at a time, so nothing is loaded at import time.
+CACHE_PATH = os.path.join(os.path.dirname(__file__), "profile_cache.sqlite3")
+_store = CacheStore(CACHE_PATH)
+_last_store_purge = 0
+
+_in_flight = SingleFlight()  # concurrent lookups of the same player share one request
+
+# Routine lookup outcomes (unknown names, missing museum / garden data) go to this logger rather than stdout,
+# so quiet lookups stay silent unless the application configures logging.
+log = logging.getLogger(__name__)
+
+
+class NotFoundError(ValueError):
+    """No such player, or no such profile on that player."""
 
-CACHE_PATH = os.path.join(os.path.dirname(__file__), "profile_cache.json")
-_last_saved = 0
 
-if os.path.exists(CACHE_PATH):
+class UpstreamError(ValueError):
+    """Mojang or Hypixel answered with an error; `status` is the HTTP status of the last attempt."""
+
+    def __init__(self, message, status):
+        super().__init__(message)
+        self.status = status
+
+NBT_CACHE_MAX_BYTES = 64 * 1024 * 1024  # budget in decompressed NBT bytes
+_nbt_cache = ByteLRU(NBT_CACHE_MAX_BYTES, name="nbt")  # blake2b(encoded blob) -> decoded items
+
+
+def _cache_get(memory, namespace, key, *, compressed=False):
+    """
+    Returns (value, cached_at) from memory, falling back to the on-disk store.
+    With compressed=True the value is a CompressedJSON that the caller decodes when it actually needs it.
+    """
+    entry = memory.get(key)
+    if entry is not None:
+        return entry
+
     try:
-        with open(CACHE_PATH, "r", encoding="utf-8") as f:
-            raw = json.load(f)
-            _uuid_cache = raw.get("uuid_cache", {})
-            _profile_cache = {
-                k: (v[0], float(v[1])) for k, v in raw.get("profile_cache", {}).items()
-            }
-            _last_saved = float(raw.get("last_saved", 0))
+        row = _store.get(namespace, key)
     except Exception as e:
-        print("Failed to load persistent cache:", e)
+        print(f"Failed to read {namespace} cache:", e)
+        return None
+    if row is None:
+        return None
+
+    blob, cached_at = row
+    entry = memory[key] = (CompressedJSON(blob) if compressed else unpack_json(blob), cached_at)
+    return entry
 
+def _cache_put(memory, namespace, key, value, now, *, compressed=False):
+    if compressed:
+        payload = CompressedJSON.from_value(value)
+        memory[key] = (payload, now)
+        blob = payload.blob
+    else:
+        memory[key] = (value, now)
+        blob = pack_json(value, compress=False)
 
-def _save_profile_cache():
     try:
-        with open(CACHE_PATH, "w", encoding="utf-8") as f:
-            json.dump({
-                "uuid_cache": _uuid_cache,
-                "profile_cache": {k: [v[0], v[1]] for k, v in _profile_cache.items()},
-                "last_saved": time.time()
-            }, f)
+        _store.put(namespace, key, blob, now, now + CACHE_MAX_AGE)
     except Exception as e:
-        print("Failed to save profile cache:", e)
+        print(f"Failed to save {namespace} cache:", e)
+    return memory[key][0]
 
 def purge_expired_cache():
+    global _last_store_purge
     now = time.time()
     expired_users = [
         user for user, (_, last_updated) in _profile_cache.items()
         if now - last_updated > CACHE_MAX_AGE
     ]
     for user in expired_users:
-        print(f"{user} has been deleted from cache")
         del _profile_cache[user]
+        CACHE_EVICTIONS.inc(cache="profiles")
         if user in _uuid_cache:
             del _uuid_cache[user]
+            CACHE_EVICTIONS.inc(cache="uuid")
+
+    if now - _last_store_purge > STORE_PURGE_INTERVAL:
+        _last_store_purge = now
+        try:
+            _store.purge_expired(now)
+        except Exception as e:
+            print("Failed to purge persistent cache:", e)
+
+def _nbt_cache_key(data_string):
+    if isinstance(data_string, str):
+        data_string = data_string.encode("ascii", "ignore")
+    return hashlib.blake2b(data_string, digest_size=16).digest()
 
 def decode_nbt_base64(data_string):
+    # Identical blobs (unchanged backpacks, repeat lookups of the same player) are only decoded once.
+    # The result is shared between callers, so it must be treated as read-only.
+    key = _nbt_cache_key(data_string)
+    cached = _nbt_cache.get(key)  # counts the hit / miss
+    if cached is not None:
+        return cached
+
     try:
         raw = base64.b64decode(data_string)
 
@@ -63,11 +129,13 @@ def decode_nbt_base64(data_string):
         except zlib.error:
             decompressed = gzip.decompress(raw)
 
-        stream = io.BytesIO(decompressed)
-        nbt = nbtlib.File.parse(stream)
-
-        # ✅ Access directly as a dict
-        return nbt['i'] if 'i' in nbt else []
+        # Only the fields the scorers read are materialised (see nbt_reader.ITEM_SPEC),
+        # and each item is turned into a compact Item record right away
+        decoded = items_from_nbt(read_items(decompressed))
+        NBT_BLOBS_DECODED.inc()
+        NBT_BYTES_DECODED.inc(len(decompressed))
+        _nbt_cache.put(key, decoded, len(decompressed))
+        return decoded
     except Exception as e:
         print(f"Error decoding item data: {e}")
         return []
@@ -75,10 +143,12 @@ def decode_nbt_base64(data_string):
 def to_json_safe(obj):
     if isinstance(obj, dict):
         return {k: to_json_safe(v) for k, v in obj.items()}
-    elif isinstance(obj, list):
+    elif isinstance(obj, (list, ItemIndex, PetIndex)):
         return [to_json_safe(i) for i in obj]
-    elif isinstance(obj, ByteArray):
-        return list(obj)  # Convert ByteArray to a normal list of ints
+    elif isinstance(obj, (Item, Pet)):
+        return to_json_safe(obj.to_dict())
+    elif isinstance(obj, (bytes, ByteArray)):
+        return list(obj)  # Convert byte arrays to a normal list of ints
     elif hasattr(obj, 'value'):
         return obj.value  # Handle Int, String, etc.
     else:
@@ -86,50 +156,78 @@ def to_json_safe(obj):
 
 async def get_uuid(username: str):
     now = time.time()
-    if username in _uuid_cache:
-        uuid, cached_at = _uuid_cache[username]
+    cached = _cache_get(_uuid_cache, "uuid", username)
+    if cached:
+        uuid, cached_at = cached
         if now - cached_at < CACHE_TTL:
+            CACHE_HITS.inc(cache="uuid")
             return uuid
 
+    CACHE_MISSES.inc(cache="uuid")
+    return await _in_flight.do(("uuid", username), _fetch_uuid, username)
+
+async def _fetch_uuid(username):
+    now = time.time()
     url = f"https://api.mojang.com/users/profiles/minecraft/{username}"
-    async with aiohttp.ClientSession() as session:
-        async with session.get(url) as resp:
-            if resp.status == 204:
-                print(f"Username '{username}' not found.")
-                return None
-            data = await resp.json()
-            uuid = data.get("id")
-            if uuid:
-                _uuid_cache[username] = (uuid, now)
-                _save_profile_cache()
-            return uuid
+    status, data = await fetch_json(url, endpoint="mojang_profile")
+    if status == 429 or status >= 500:
+        raise UpstreamError(f"Failed to look up UUID (HTTP {status}): {data}", status)
+    # Any other 4xx is about the name itself (unknown, malformed), so it's treated as not found
+    uuid = (data or {}).get("id") if status == 200 else None
+    if not uuid:
+        log.info("Username '%s' not found.", username)
+        return None
+    _cache_put(_uuid_cache, "uuid", username, uuid, now)
+    return uuid
+
+async def get_skyblock_profiles(api_key: str, username: str, uuid: str = None):
+    return (await get_skyblock_profiles_payload(api_key, username, uuid)).load()
 
-async def get_skyblock_profiles(api_key: str, username: str):
+async def get_skyblock_profiles_payload(api_key, username, uuid=None):
+    """
+    The profiles as the CompressedJSON they're cached as. Its digest() identifies exactly the data that was
+    handed out, even if the cache entry for username has been refreshed since.
+    """
     purge_expired_cache()
     now = time.time()
 
     # Use cached profile data
-    if username in _profile_cache:
-        profiles, cached_at = _profile_cache[username]
+    cached = _cache_get(_profile_cache, "profiles", username, compressed=True)
+    if cached:
+        payload, cached_at = cached
         if now - cached_at < CACHE_TTL:
-            return profiles
+            CACHE_HITS.inc(cache="profiles")
+            return payload
+
+    CACHE_MISSES.inc(cache="profiles")
+    return await _in_flight.do(("profiles", username), _fetch_skyblock_profiles, api_key, username, uuid)
+
+def profiles_fingerprint(username):
+    """Content hash of the fresh cached profiles for username, or None if there are none. Never hits the API."""
+    entry = _profile_cache.get(username)
+    if entry is None:
+        return None
+    payload, cached_at = entry
+    if time.time() - cached_at >= CACHE_TTL:
+        return None
+    return payload.digest()
+
+async def _fetch_skyblock_profiles(api_key, username, uuid):
+    now = time.time()
 
-    # Ensure UUID is fresh
-    uuid = await get_uuid(username)
+    # Ensure UUID is fresh (callers that already resolved it pass it in to skip the second lookup)
+    if uuid is None:
+        uuid = await get_uuid(username)
     if not uuid:
-        raise ValueError(f"Unable to resolve UUID for username '{username}'")
+        raise NotFoundError(f"Unable to resolve UUID for username '{username}'")
 
     url = f'https://api.hypixel.net/v2/skyblock/profiles?uuid={uuid}'
     headers = {'API-Key': api_key}
-    async with aiohttp.ClientSession() as session:
-        async with session.get(url, headers=headers) as response:
-            data = await response.json()
-            if not data.get("success"):
-                raise ValueError(f"Failed to fetch profiles: {data}")
-            profiles = data.get("profiles", [])
-            _profile_cache[username] = (profiles, now)
-            _save_profile_cache()
-            return profiles
+    status, data = await fetch_json(url, headers=headers, limiter=get_limiter(api_key), endpoint="skyblock_profiles")
+    if not data or not data.get("success"):
+        raise UpstreamError(f"Failed to fetch profiles (HTTP {status}): {data}", status)
+    profiles = data.get("profiles") or []
+    return _cache_put(_profile_cache, "profiles", username, profiles, now, compressed=True)
 
 item_sources = [
     "inv_contents",
@@ -177,10 +275,10 @@ def extract_talisman_bag(profile, uuid):
 
 def filter_zero_worth(decoded_items):
     def is_worth_item(item):
-        if item.get("Count", 1) != 1:
+        if item.count != 1:
             return False
 
-        lore = item.get("tag", {}).get("display", {}).get("Lore", [])
+        lore = item.lore
         if not lore:
             return True
 
@@ -257,13 +355,9 @@ def extract_all_items(profile, uuid, museum_data):
                             print(f"[Museum Debug] Failed to decode museum item: {e}")
             else:
                 print("[Museum Debug] 'items' key is not a dict.")
-        else:
-            print(f"[Museum Debug] UUID {uuid} not found in museum data.")
-    else:
-        print("[Museum Debug] No museum data provided.")
+    # No museum data / player not in it just means the museum API is off for them; nothing worth printing
 
-    with open(f"item_dump_{uuid}.json", "w+", encoding='utf-8') as f:
-        json.dump(to_json_safe(items), f)
+    # Item dumps are opt-in now, see dump_sink.enable_item_dumps()
     return items
 
 
@@ -292,36 +386,37 @@ def get_personal_gold_collection(profile_data):
         return 0
 
 async def get_museum_data(api_key, profile_id):
+    return await _in_flight.do(("museum", profile_id), _fetch_museum_data, api_key, profile_id)
+
+async def _fetch_museum_data(api_key, profile_id):
     url = f"https://api.hypixel.net/v2/skyblock/museum?profile={profile_id}"
     headers = {"API-Key": api_key}
 
-    async with aiohttp.ClientSession() as session:
-        try:
-            async with session.get(url, headers=headers) as resp:
-                if resp.status != 200:
-                    print(f"[Museum Debug] Failed to fetch museum data: HTTP {resp.status}")
-                    return {}
-
-                data = await resp.json()
-                return data.get("members", {})
-        except Exception as e:
-            print(f"[Museum Debug] Exception while fetching museum data: {e}")
+    try:
+        status, data = await fetch_json(url, headers=headers, limiter=get_limiter(api_key), endpoint="skyblock_museum")
+        if status != 200 or data is None:
+            log.info("No museum data for profile %s: HTTP %s", profile_id, status)
             return {}
 
+        return data.get("members", {})
+    except Exception as e:
+        log.warning("Failed to fetch museum data for profile %s: %s", profile_id, e)
+        return {}
+
 async def get_garden_data(api_key, profile_id):
+    return await _in_flight.do(("garden", profile_id), _fetch_garden_data, api_key, profile_id)
+
+async def _fetch_garden_data(api_key, profile_id):
     url = f"https://api.hypixel.net/v2/skyblock/garden?profile={profile_id}"
     headers = {"API-Key": api_key}
 
-    async with aiohttp.ClientSession() as session:
-        try:
-            async with session.get(url, headers=headers) as resp:
-                if resp.status != 200:
-                    print(f"[Garden Debug] Failed to fetch garden data: HTTP {resp.status}")
-                    return {}
-
-                data = await resp.json()
+    try:
+        status, data = await fetch_json(url, headers=headers, limiter=get_limiter(api_key), endpoint="skyblock_garden")
+        if status != 200 or data is None:
+            log.info("No garden data for profile %s: HTTP %s", profile_id, status)
+            return {}
 
-                return data.get("garden", {})
-        except Exception as e:
-            print(f"[Garden Debug] Exception while fetching garden data: {e}")
-            return {}
\ No newline at end of file
+        return data.get("garden", {})
+    except Exception as e:
+        log.warning("Failed to fetch garden data for profile %s: %s", profile_id, e)
+        return {}
\ No newline at end of file
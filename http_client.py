@@ -0,0 +1,114 @@
+import asyncio
+import json
+import time
+import aiohttp
+from contextlib import asynccontextmanager
+from urllib.parse import urlsplit
+from .rate_limit import MAX_RETRIES, retry_delay, should_retry
+from .metrics import HTTP_LATENCY
+
+# Shared, pooled HTTP sessions used by every Hypixel / Mojang call.
+# Opening a new ClientSession per request means a fresh TCP + TLS handshake every time, so instead each event
+# loop gets one session (and its keep-alive connection pool), created on first use and reused after that.
+# A session belongs to the loop it was created on: close_session() closes the running loop's session only.
+
+CONNECTION_LIMIT = 100          # total open connections across all hosts
+CONNECTION_LIMIT_PER_HOST = 20  # open connections per host (api.hypixel.net, api.mojang.com)
+KEEPALIVE_TIMEOUT = 60          # seconds an idle connection is kept around for reuse
+DNS_CACHE_TTL = 300
+REQUEST_TIMEOUT = 15
+
+# event loop -> its session. Not a WeakKeyDictionary: the session references its loop, so the key would never die.
+# Instead entries of loops that have since closed (e.g. an asyncio.run that never called close_session) are dropped.
+_sessions = {}
+
+
+def _new_session():
+    connector = aiohttp.TCPConnector(
+        limit=CONNECTION_LIMIT,
+        limit_per_host=CONNECTION_LIMIT_PER_HOST,
+        keepalive_timeout=KEEPALIVE_TIMEOUT,
+        ttl_dns_cache=DNS_CACHE_TTL,
+    )
+    return aiohttp.ClientSession(
+        connector=connector,
+        timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT),
+    )
+
+
+def _drop_closed_loops():
+    for loop in [loop for loop in _sessions if loop.is_closed()]:
+        del _sessions[loop]
+
+
+async def get_session():
+    """Returns the running loop's session, creating it on first use."""
+    loop = asyncio.get_running_loop()
+    session = _sessions.get(loop)
+    if session is None or session.closed:
+        _drop_closed_loops()
+        session = _sessions[loop] = _new_session()
+    return session
+
+
+async def close_session():
+    """Closes the running loop's session. Call this before the loop shuts down; other loops' sessions are left alone."""
+    session = _sessions.pop(asyncio.get_running_loop(), None)
+    if session is not None and not session.closed:
+        await session.close()
+
+
+async def _read_json(resp):
+    try:
+        return await resp.json(content_type=None)
+    except (aiohttp.ContentTypeError, json.JSONDecodeError, UnicodeDecodeError):
+        return None
+
+
+async def fetch_json(url, *, headers=None, limiter=None, retries=MAX_RETRIES, endpoint=None):
+    """
+    GETs a JSON endpoint through the running loop's session and returns (status, data).
+    If a limiter is given, every attempt waits for a token and the limiter is fed the response headers.
+    429s, 5xxs and connection errors are retried with jittered backoff; the last response is returned as-is.
+    Every attempt's latency is recorded under `endpoint` (default: host + path).
+    """
+    if endpoint is None:
+        parts = urlsplit(url)
+        endpoint = parts.netloc + parts.path
+
+    for attempt in range(retries + 1):
+        if limiter is not None:
+            await limiter.acquire()
+
+        session = await get_session()
+        start = time.perf_counter()
+        status = "error"
+        try:
+            async with session.get(url, headers=headers) as resp:
+                status = resp.status
+                if limiter is not None:
+                    limiter.update_from_headers(resp.headers)
+
+                if should_retry(resp.status) and attempt < retries:
+                    delay = retry_delay(attempt, resp.headers if resp.status == 429 else None)
+                else:
+                    data = None if resp.status == 204 else await _read_json(resp)
+                    return resp.status, data
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+            if attempt >= retries:
+                raise
+            delay = retry_delay(attempt)
+        finally:
+            # Latency until the body was read (or the attempt failed), not counting limiter waits or backoff
+            HTTP_LATENCY.observe(time.perf_counter() - start, endpoint=endpoint, status=status)
+
+        await asyncio.sleep(delay)
+
+
+@asynccontextmanager
+async def http_session():
+    """Keeps the running loop's session open for the duration of the block and closes it afterwards."""
+    try:
+        yield await get_session()
+    finally:
+        await close_session()
@@ -0,0 +1,132 @@
+import hashlib
+import json
+from collections import OrderedDict
+from .metrics import CACHE_HITS, CACHE_MISSES, CACHE_EVICTIONS
+
+# Incremental rescoring.
+# Every category declares which slices of the fetched data it reads. Before scoring, each slice is hashed and
+# the hashes are combined into one fingerprint per category; a category whose fingerprint matches the last
+# snapshot of the same profile reuses that snapshot's result instead of being scored again.
+#
+# Paths start at one of these roots:
+#   "member"  profile["members"][uuid]
+#   "profile" the whole profile (banking etc.)
+#   "museum"  museum_data[uuid]
+#   "garden"  garden_data
+# If a scorer starts reading something new, add its path here, or the category won't notice changes to it.
+
+ITEM_INPUTS = (("member", "inventory"), ("museum", "items"))  # everything extract_all_items decodes
+PET_INPUTS = (("member", "pets_data", "pets"),)
+SKILL_EXP = ("member", "player_data", "experience")
+
+CATEGORY_INPUTS = {
+    "weapons": ITEM_INPUTS + (
+        ("member", "nether_island_player_data", "abiphone", "contact_data"),  # abicase MP
+        ("member", "rift", "access", "consumed_prism"),
+    ),
+    "pets": PET_INPUTS + (
+        ("member", "collection", "GOLD_INGOT"),
+        ("profile", "banking", "balance"),
+    ),
+    "slayers": ITEM_INPUTS + PET_INPUTS + (("member", "slayer", "slayer_bosses"),),
+    "farming": ITEM_INPUTS + PET_INPUTS + (
+        SKILL_EXP + ("SKILL_FARMING",),
+        ("member", "jacobs_contest", "unique_brackets"),
+        ("garden", "commission_data"),
+        ("garden", "crop_upgrade_levels"),
+        ("garden", "resources_collected"),
+    ),
+    "generic_skills": (
+        SKILL_EXP + ("SKILL_ALCHEMY",),
+        SKILL_EXP + ("SKILL_CARPENTRY",),
+        SKILL_EXP + ("SKILL_ENCHANTING",),
+        SKILL_EXP + ("SKILL_TAMING",),
+        ("member", "pets_data", "pet_care"),
+    ),
+    "dungeons": ITEM_INPUTS + PET_INPUTS + (
+        ("member", "dungeons"),
+        ("member", "objectives", "tutorial"),
+    ),
+    "foraging": ITEM_INPUTS + (SKILL_EXP + ("SKILL_FORAGING",),),
+    "diana": ITEM_INPUTS + (
+        ("member", "bestiary", "kills"),
+        ("member", "player_stats", "mythos", "kills"),
+    ),
+    "fishing": ITEM_INPUTS + PET_INPUTS + (
+        SKILL_EXP + ("SKILL_FISHING",),
+        ("member", "trophy_fish"),
+        ("member", "bestiary", "kills"),
+    ),
+    "mining": ITEM_INPUTS + PET_INPUTS + (("member", "mining_core"),),
+}
+
+MAX_SNAPSHOTS = 2048  # profiles whose last result is kept for incremental rescoring
+
+_MISSING = object()
+
+
+def _lookup(value, path):
+    for key in path:
+        if not isinstance(value, dict):
+            return _MISSING
+        value = value.get(key, _MISSING)
+        if value is _MISSING:
+            return _MISSING
+    return value
+
+
+def _digest(value):
+    if value is _MISSING:
+        return b"-"
+    encoded = json.dumps(value, sort_keys=True, separators=(",", ":"), default=str).encode("utf-8")
+    return hashlib.blake2b(encoded, digest_size=16).digest()
+
+
+def category_fingerprints(profile, uuid, museum_data, garden_data):
+    """category name -> hex fingerprint of everything that category reads. Shared slices are hashed once."""
+    roots = {
+        "member": profile.get("members", {}).get(uuid.replace("-", ""), _MISSING),
+        "profile": profile,
+        "museum": (museum_data or {}).get(uuid, _MISSING),
+        "garden": garden_data or {},
+    }
+    path_digests = {}
+    fingerprints = {}
+    for name, paths in CATEGORY_INPUTS.items():
+        h = hashlib.blake2b(digest_size=16)
+        for path in paths:
+            digest = path_digests.get(path)
+            if digest is None:
+                root = roots[path[0]]
+                digest = path_digests[path] = _digest(_MISSING if root is _MISSING else _lookup(root, path[1:]))
+            h.update(repr(path).encode("utf-8"))
+            h.update(digest)
+        fingerprints[name] = h.hexdigest()
+    return fingerprints
+
+
+# Last scored result per (uuid, profile_id)
+_snapshots = OrderedDict()
+
+
+def get_snapshot(uuid, profile_id):
+    result = _snapshots.get((uuid, profile_id))
+    if result is None:
+        CACHE_MISSES.inc(cache="snapshot")
+    else:
+        CACHE_HITS.inc(cache="snapshot")
+        _snapshots.move_to_end((uuid, profile_id))
+    return result
+
+
+def save_snapshot(result):
+    key = (result.uuid, result.profile_id)
+    _snapshots[key] = result
+    _snapshots.move_to_end(key)
+    while len(_snapshots) > MAX_SNAPSHOTS:
+        _snapshots.popitem(last=False)
+        CACHE_EVICTIONS.inc(cache="snapshot")
+
+
+def clear_snapshots():
+    _snapshots.clear()
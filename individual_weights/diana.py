@@ -1,15 +1,14 @@
 import math
 
+from ..items import as_index
+
 def daedalus_axe_weight(items):
     max_score = 0
-    for item in items:
-        extra = item.get("tag", {}).get("ExtraAttributes", {})
-        item_id = extra.get("id", "")
-        if item_id not in {"DAEDALUS_AXE", "STARRED_DAEDALUS_AXE"}:
-            continue
+    for item in as_index(items).by_ids(("DAEDALUS_AXE", "STARRED_DAEDALUS_AXE")):
+        item_id = item.id
 
         score = 0
-        enchants = extra.get("enchantments", {})
+        enchants = item.enchantments
         if enchants.get("looting", 0) == 5:
             score += 50
 
@@ -65,10 +64,8 @@ def bestiary_weight(profile, uuid):
     return round(total_weight), ", ".join(desc_parts)
 
 def clover_helmet_weight(items):
-    for item in items:
-        extra = item.get("tag", {}).get("ExtraAttributes", {})
-        if extra.get("id") == "CLOVER_HELMET":
-            return 500, "Clover Helmet"
+    if as_index(items).has("CLOVER_HELMET"):
+        return 500, "Clover Helmet"
     return 0, ""
 
 def magic_find_armor_weight(items):
@@ -83,16 +80,13 @@ def magic_find_armor_weight(items):
         "INFERNAL_CRIMSON_HELMET", "INFERNAL_CRIMSON_CHESTPLATE", "INFERNAL_CRIMSON_LEGGINGS", "INFERNAL_CRIMSON_BOOTS"
     }
 
-    for item in items:
-        extra = item.get("tag", {}).get("ExtraAttributes", {})
-        item_id = extra.get("id", "")
-        if item_id not in magic_find_ids:
-            continue
-        if extra.get("modifier", "").lower() != "renowned":
+    for item in as_index(items).by_ids(magic_find_ids):
+        item_id = item.id
+        if item.modifier.lower() != "renowned":
             continue
 
         piece_score = 10
-        enchants = extra.get("enchantments", {})
+        enchants = item.enchantments
         desc = f"{item_id}: +10"
 
         legion_level = enchants.get("ultimate_legion", 0)
@@ -121,6 +115,7 @@ def magic_find_armor_weight(items):
     return total_score, breakdown
 
 def diana_weight(profile, uuid, items):
+    items = as_index(items)
     weights = []
 
     axe_score = daedalus_axe_weight(items)
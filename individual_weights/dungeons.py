@@ -1,6 +1,11 @@
 import re
 import math
 import json
+
+from ..items import as_index
+
+WITHER_ARMOR_PATTERN = re.compile(r"(?:\w+_)?WITHER_(HELMET|CHESTPLATE|LEGGINGS|BOOTS)\Z")
+BOSS_HEAD_PATTERN = re.compile(r"(DIAMOND|GOLD)_(\w+)_HEAD\Z")
 # Define scoring helpers used across wither armor scoring
 
 gem_tier_points = {
@@ -99,17 +104,23 @@ def score_wither_armor_piece(extra):
 def score_dungeon_armors(items):
     slot_best = {}
 
-    for item in items:
-        tag = item.get("tag", {})
-        extra = tag.get("ExtraAttributes", {})
-        item_id = extra.get("id", "")
+    items = as_index(items)
+    candidate_ids = (
+        items.ids_matching(WITHER_ARMOR_PATTERN)
+        | items.ids_matching(BOSS_HEAD_PATTERN)
+        | {"SKELETON_MASTER_CHESTPLATE", "WITHER_GOGGLES"}
+    )
+
+    for item in items.by_ids(candidate_ids):
+        extra = item.extra
+        item_id = item.id
 
         # Wither Armor
-        wither_match = re.fullmatch(r"(?:\w+_)?WITHER_(HELMET|CHESTPLATE|LEGGINGS|BOOTS)", item_id)
+        wither_match = WITHER_ARMOR_PATTERN.match(item_id)
         if wither_match:
             slot = wither_match.group(1)
             score, desc = score_wither_armor_piece(extra)
-            name = tag.get("display", {}).get("Name", "Unnamed")
+            name = item.name
             if slot not in slot_best or score > slot_best[slot][0]:
                 slot_best[slot] = (score, name, desc)
             continue
@@ -119,24 +130,24 @@ def score_dungeon_armors(items):
             if extra.get("dungeon_skill_req") == "CATACOMBS:36" and extra.get("baseStatBoostPercentage") == 50:
                 score, desc = score_wither_armor_piece(extra)
                 score += 11
-                name = tag.get("display", {}).get("Name", "Unnamed")
+                name = item.name
                 if "SM_CHEST" not in slot_best or score > slot_best["SM_CHEST"][0]:
                     slot_best["SM_CHEST"] = (score, name, desc)
 
         if item_id == "WITHER_GOGGLES":
             score, desc = score_wither_armor_piece(extra)
-            name = tag.get("display", {}).get("Name", "Unnamed")
+            name = item.name
             if "GOGGLES" not in slot_best or score > slot_best["GOGGLES"][0]:
                 slot_best["GOGGLES"] = (score, name, desc)
 
         # Golden/Diamond Boss Heads
-        head_match = re.fullmatch(r"(DIAMOND|GOLD)_(\w+)_HEAD", item_id)
+        head_match = BOSS_HEAD_PATTERN.match(item_id)
         if head_match:
             tier, boss = head_match.groups()
             slot = f"{boss}_HEAD"
 
             score, desc = score_wither_armor_piece(extra)
-            name = tag.get("display", {}).get("Name", "Unnamed")
+            name = item.name
 
             # Add +20 for diamond heads
             if tier == "DIAMOND":
@@ -255,13 +266,15 @@ def general_dungeon_items(items):
     best_last_breath_score = 0
     best_last_breath_level = 0
 
-    for item in items:
-        extra = item.get("tag", {}).get("ExtraAttributes", {})
-        item_id = extra.get("id", "")
+    candidate_ids = set().union(*target_items)
+    candidate_ids.add("LAST_BREATH")
+
+    for item in as_index(items).by_ids(candidate_ids):
+        item_id = item.id
 
         # Special-case: Last Breath (evaluate best one only)
         if item_id == "LAST_BREATH":
-            enchants = extra.get("enchantments", {})
+            enchants = item.enchantments
             level = enchants.get("ultimate_reiterate", 0)
             score = 10 if level >= 1 else 5
             if score > best_last_breath_score:
@@ -287,6 +300,7 @@ def general_dungeon_items(items):
 
 
 def dungeon_weight(profile, uuid, all_pets, items):
+    items = as_index(items)
     weights = []
 
     armor_score, armor_desc = score_dungeon_armors(items)
@@ -3,6 +3,19 @@ import json
 import re
 from collections import defaultdict
 
+from ..items import as_index
+from ..pet_index import MAX_LEVEL_EXP, as_pet_index, exp_for_level
+
+MATHEMATICAL_HOE_PATTERN = re.compile(r"THEORETICAL_HOE_([A-Z_]+)_\d")
+DICER_PATTERN = re.compile(r"(MELON_DICER|PUMPKIN_DICER)_(\d)")
+FARMING_ARMOR_PATTERN = re.compile(r"(MELON|CROPIE|SQUASH|FERMENTO)_(HELMET|CHESTPLATE|LEGGINGS|BOOTS)")
+
+def farming_exp_curve(farming_exp):
+    base = (farming_exp + 20000000) / 2000
+    log_term = math.log(base, 200)
+    weighted = (5000 * log_term) - 8700
+    return max(0, round(weighted / 3.5))
+
 def farming_exp_weight(profile, uuid):
     normalized_uuid = uuid.replace("-", "")
     member = profile.get("members", {}).get(normalized_uuid, {})
@@ -16,10 +29,7 @@ def farming_exp_weight(profile, uuid):
     if not isinstance(farming_exp, (int, float)) or farming_exp <= 0:
         return 0, []
 
-    base = (farming_exp + 20000000) / 2000
-    log_term = math.log(base, 200)
-    weighted = (5000 * log_term) - 8700
-    weight = max(0, round(weighted / 3.5))
+    weight = farming_exp_curve(farming_exp)
 
     return weight, [f"{int(farming_exp):,} Farming Exp", f"{weight} Weight"]
 
@@ -61,8 +71,8 @@ def medal_score(profile, uuid):
     return total, [breakdown] if breakdown else []
 
 def farming_pet_weight(profile, uuid, all_pets):
-    max_exp = 25353230
-    hedgehog_cap = 5619230
+    max_exp = MAX_LEVEL_EXP
+    hedgehog_cap = exp_for_level(80, "LEGENDARY")
 
     # Define scoring rules
     scoring = {
@@ -80,13 +90,13 @@ def farming_pet_weight(profile, uuid, all_pets):
 
     best_by_type = {}
 
-    for pet in all_pets:
-        pet_type = pet.get("type")
-        tier = pet.get("tier")
-        exp = pet.get("exp", 0)
-        item = pet.get("heldItem")
+    for pet in as_pet_index(all_pets).by_types(scoring):
+        pet_type = pet.type
+        tier = pet.tier
+        exp = pet.exp
+        item = pet.held_item
 
-        if pet_type not in scoring or tier not in scoring[pet_type]:
+        if tier not in scoring[pet_type]:
             continue
 
         cap = scoring[pet_type].get("exp_cap", max_exp)
@@ -214,23 +224,18 @@ def crop_milestone_weight(garden_data):
 def get_mathematical_hoes_by_crop(items):
     hoes_by_crop = defaultdict(list)
 
-    for item in items:
-        extra = item.get("tag", {}).get("ExtraAttributes", {})
-        item_id = extra.get("id", "")
-
-        match = re.match(r"THEORETICAL_HOE_([A-Z_]+)_\d", item_id)
-        if match:
-            raw_crop = match.group(1)
-            crop_key = {
-                "WHEAT": "Wheat",
-                "CARROT": "Carrot",
-                "POTATO": "Potato",
-                "CANE": "Sugar Cane",
-                "NETHER_WART": "Nether Wart",
-                "WARTS": "Nether Wart"
-            }.get(raw_crop, raw_crop.title().replace("_", " "))
+    for item, match in as_index(items).matching(MATHEMATICAL_HOE_PATTERN):
+        raw_crop = match.group(1)
+        crop_key = {
+            "WHEAT": "Wheat",
+            "CARROT": "Carrot",
+            "POTATO": "Potato",
+            "CANE": "Sugar Cane",
+            "NETHER_WART": "Nether Wart",
+            "WARTS": "Nether Wart"
+        }.get(raw_crop, raw_crop.title().replace("_", " "))
 
-            hoes_by_crop[crop_key].append(item)
+        hoes_by_crop[crop_key].append(item)
 
     return hoes_by_crop
 
@@ -277,10 +282,10 @@ def score_best_mathematical_hoes(items):
 
         for tool in tools:
             score = 0
-            extra = tool.get("tag", {}).get("ExtraAttributes", {})
+            extra = tool.extra
 
             # Tier score
-            item_id = extra.get("id", "")
+            item_id = tool.id
             if "_1" in item_id:
                 score += 1
             elif "_2" in item_id:
@@ -298,11 +303,11 @@ def score_best_mathematical_hoes(items):
                 score += 5 * digits
 
             # Recomb score
-            recomb = extra.get("rarity_upgrades", 0)
+            recomb = tool.rarity_upgrades
             if recomb == 1:
                 score += 2
 
-            cultivating_level = extra.get("enchantments", {}).get("cultivating", 0)
+            cultivating_level = tool.enchantments.get("cultivating", 0)
             if cultivating_level == 9:
                 score += 5
             elif cultivating_level == 10:
@@ -316,13 +321,13 @@ def score_best_mathematical_hoes(items):
                 score += 1  # Additional bonus
 
             # Gemstone score
-            gems = extra.get("gems", {})
+            gems = tool.gems
             score += gemstone_score(gems)
 
             # Track best
             if score > best_score:
                 best_score = score
-                best_tool_name = tool.get("tag", {}).get("display", {}).get("Name", "Unnamed")
+                best_tool_name = tool.name
 
         scored[crop] = (best_tool_name, best_score)
 
@@ -347,14 +352,9 @@ def score_best_dicers(items):
         "PUMPKIN_DICER": "Pumpkin Dicer"
     }
 
-    for item in items:
-        extra = item.get("tag", {}).get("ExtraAttributes", {})
-        item_id = extra.get("id", "")
-        name = item.get("tag", {}).get("display", {}).get("Name", "Unnamed")
-
-        match = re.match(r"(MELON_DICER|PUMPKIN_DICER)_(\d)", item_id)
-        if not match:
-            continue
+    for item, match in as_index(items).matching(DICER_PATTERN):
+        extra = item.extra
+        name = item.name
 
         base_id, tier_str = match.groups()
         tier = int(tier_str)
@@ -371,7 +371,7 @@ def score_best_dicers(items):
             score = 0
 
         # Cultivating bonus
-        cultivating_level = extra.get("enchantments", {}).get("cultivating", 0)
+        cultivating_level = item.enchantments.get("cultivating", 0)
         if base_id == "PUMPKIN_DICER":
             if cultivating_level == 9:
                 score += 10
@@ -384,7 +384,7 @@ def score_best_dicers(items):
                 score += 15
 
         # Rarity upgrade
-        if extra.get("rarity_upgrades", 0) == 1:
+        if item.rarity_upgrades == 1:
             score += 2
 
         # Farming for Dummies
@@ -406,7 +406,7 @@ def score_best_dicers(items):
             score += 1
 
         # Gemstones
-        gems = extra.get("gems", {})
+        gems = item.gems
         score += gemstone_score(gems)
 
         # Store best per crop
@@ -438,26 +438,23 @@ def score_best_special_farming_tools(items):
 
     tool_scores = {}
 
-    for item in items:
-        extra = item.get("tag", {}).get("ExtraAttributes", {})
-        item_id = extra.get("id", "")
-        name = item.get("tag", {}).get("display", {}).get("Name", "Unnamed")
-
-        if item_id not in tool_ids:
-            continue
+    for item in as_index(items).by_ids(tool_ids):
+        extra = item.extra
+        item_id = item.id
+        name = item.name
 
         crop_name = tool_ids[item_id]
         score = 0
 
         # Cultivating
-        cultivating_level = extra.get("enchantments", {}).get("cultivating", 0)
+        cultivating_level = item.enchantments.get("cultivating", 0)
         if cultivating_level == 9:
             score += 5
         elif cultivating_level == 10:
             score += 15
 
         # Rarity upgrade
-        if extra.get("rarity_upgrades", 0) == 1:
+        if item.rarity_upgrades == 1:
             score += 2
 
         # Farming for Dummies
@@ -479,7 +476,7 @@ def score_best_special_farming_tools(items):
                 score += 1
 
         # Gemstones
-        gems = extra.get("gems", {})
+        gems = item.gems
         score += gemstone_score(gems)
 
         # Only keep best-scoring of each tool
@@ -506,27 +503,22 @@ def ranchers_boots_weight(items):
     best_score = 0
     best_name = None
 
-    for item in items:
-        extra = item.get("tag", {}).get("ExtraAttributes", {})
-        item_id = extra.get("id", "")
-        name = item.get("tag", {}).get("display", {}).get("Name", "Unnamed")
-
-        if item_id != "RANCHERS_BOOTS":
-            continue
+    for item in as_index(items).by_id("RANCHERS_BOOTS"):
+        name = item.name
 
         score = 5  # Base score for owning Rancher's Boots
 
         # Reforge bonus
-        if extra.get("modifier", "").lower() == "mossy":
+        if item.modifier.lower() == "mossy":
             score += 15
 
         # Pesterminator enchantment score
-        enchants = extra.get("enchantments", {})
+        enchants = item.enchantments
         pest_level = enchants.get("pesterminator", 0)
         score += (pest_level - 3) if pest_level > 3 else 0
 
         # Gemstone score
-        gems = extra.get("gems", {})
+        gems = item.gems
         score += gemstone_score(gems)
 
         # Keep highest scoring
@@ -551,35 +543,28 @@ def farming_armor_weight(items):
 
     best_by_slot = {}
 
-    for item in items:
-        extra = item.get("tag", {}).get("ExtraAttributes", {})
-        item_id = extra.get("id", "")
-        name = item.get("tag", {}).get("display", {}).get("Name", "Unnamed")
-
-        # Match valid farming armor
-        match = re.match(r"(MELON|CROPIE|SQUASH|FERMENTO)_(HELMET|CHESTPLATE|LEGGINGS|BOOTS)", item_id)
-        if not match:
-            continue
+    for item, match in as_index(items).matching(FARMING_ARMOR_PATTERN):
+        name = item.name
 
         piece_type, slot = match.groups()
         score = base_points.get(piece_type, 0)
 
         # Rarity upgrade
-        if extra.get("rarity_upgrades", 0) == 1:
+        if item.rarity_upgrades == 1:
             score += 2
 
         # Reforge bonus
-        if extra.get("modifier", "").lower() == "mossy":
+        if item.modifier.lower() == "mossy":
             score += 15
 
         # Pesterminator
-        enchants = extra.get("enchantments", {})
+        enchants = item.enchantments
         pest_level = enchants.get("pesterminator", 0)
         if pest_level > 3:
             score += pest_level - 3
 
         # Gemstones
-        gems = extra.get("gems", {})
+        gems = item.gems
         gem_score = gemstone_score(gems)
 
         # Special cases
@@ -616,15 +601,11 @@ def farming_equipment_weight(items):
 
     best_by_id = {}
 
-    for item in items:
-        extra = item.get("tag", {}).get("ExtraAttributes", {})
-        item_id = extra.get("id", "")
-
-        if item_id not in equipment_ids:
-            continue
+    for item in as_index(items).by_ids(equipment_ids):
+        item_id = item.id
 
-        enchants = extra.get("enchantments", {})
-        modifier = extra.get("modifier", "").lower()
+        enchants = item.enchantments
+        modifier = item.modifier.lower()
 
         # Equipment bonus (only for these two)
         equipment_score = 3 if item_id == "PEST_VEST" else 5 if item_id == "ZORROS_CAPE" else 0
@@ -668,6 +649,7 @@ def farming_equipment_weight(items):
     return total_score, [", ".join(breakdown)]
 
 def farming_weight(profile, uuid, all_pets, items, garden_data):
+    items = as_index(items)
     farming_weights = []
 
     farm_score, farm_desc = farming_exp_weight(profile, uuid)
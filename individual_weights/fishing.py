@@ -1,4 +1,10 @@
-import math
+import re
+
+from ..items import as_index
+from ..pet_index import MAX_LEVEL_EXP, as_pet_index
+from .generic_skills import skill_curve
+
+ARMOR_PIECE_PATTERN = re.compile(r".*_(HELMET|CHESTPLATE|LEGGINGS|BOOTS)\Z")
 
 def rod_weight(items):
     water_rods = {
@@ -19,12 +25,12 @@ def rod_weight(items):
         return 2 ** (level - 2) if level < 10 else 250
 
     def score_rod(item):
-        ea = item.get("tag", {}).get("ExtraAttributes", {})
-        item_id = ea.get("id", "")
+        ea = item.extra
+        item_id = item.id
         base = 0
 
         # Determine base rod type and attribute
-        attr_data = ea.get("attributes", {})
+        attr_data = item.attributes
         trophy_hunter = attr_data.get("trophy_hunter", 0)
 
         # Water rod
@@ -40,7 +46,7 @@ def rod_weight(items):
                 base += bonus_from_attr_level(0)
 
         # Enchantments
-        enchants = ea.get("enchantments", {})
+        enchants = item.enchantments
         piscary = enchants.get("piscary", 0)
         if piscary == 6:
             base += 5
@@ -50,7 +56,7 @@ def rod_weight(items):
         base += 5 * enchants.get("quick_bite", 0)
 
         # Upgrade level
-        upgrade_level = ea.get("upgrade_level", 0)
+        upgrade_level = item.upgrade_level
         if upgrade_level == 8:
             base += 5
         elif upgrade_level == 9:
@@ -76,7 +82,7 @@ def rod_weight(items):
             "FLAWLESS": 4,
             "PERFECT": 7
         }
-        gems = ea.get("gems", {})
+        gems = item.gems
         for gem_data in gems.values():
             if isinstance(gem_data, dict):
                 base += gem_map.get(gem_data.get("quality", ""), 0)
@@ -89,13 +95,12 @@ def rod_weight(items):
     best_trophy = 0
     best_lava = 0
 
-    for item in items:
-        ea = item.get("tag", {}).get("ExtraAttributes", {})
-        item_id = ea.get("id", "")
+    for item in as_index(items).by_ids(water_rods.keys() | trophy_rods.keys()):
+        item_id = item.id
         if item_id in water_rods:
             best_water = max(best_water, score_rod(item))
         elif item_id in trophy_rods:
-            if ea.get("attributes", {}).get("trophy_hunter", 0) > 0:
+            if item.attributes.get("trophy_hunter", 0) > 0:
                 best_trophy = max(best_trophy, score_rod(item))
             else:
                 best_lava = max(best_lava, score_rod(item))
@@ -160,9 +165,9 @@ def best_full_set(items):
     from collections import defaultdict
     set_coverage = defaultdict(set)
 
-    for item in items:
-        ea = item.get("tag", {}).get("ExtraAttributes", {})
-        item_id = ea.get("id", "")
+    items = as_index(items)
+    for item in items.by_ids(items.ids_matching(ARMOR_PIECE_PATTERN) | lava_sc_lookup.keys()):
+        item_id = item.id
 
         slot = None
         for suf in ["_HELMET", "_CHESTPLATE", "_LEGGINGS", "_BOOTS"]:
@@ -231,13 +236,14 @@ def best_armor_pieces(items):
     best_pieces = {}
     magma_sets = {"bf_fe": [], "bf_mf": []}
 
-    for item in items:
-        ea = item.get("tag", {}).get("ExtraAttributes", {})
-        item_id = ea.get("id", "")
-        ench = ea.get("enchantments", {})
-        attrs = ea.get("attributes", {})
-        gems = ea.get("gems", {})
-        reforge = ea.get("modifier", "")
+    items = as_index(items)
+    candidate_ids = items.ids_matching(ARMOR_PIECE_PATTERN) | lava_sc_lookup.keys() | {"TIKI_MASK"}
+    for item in items.by_ids(candidate_ids):
+        item_id = item.id
+        ench = item.enchantments
+        attrs = item.attributes
+        gems = item.gems
+        reforge = item.modifier
 
         slot = None
         score = 0
@@ -328,6 +334,7 @@ def armor_weight(items):
         "SALMON": 3
     }
 
+    items = as_index(items)
     base_set = best_full_set(items)
     set_bonus = set_scores.get(base_set, 20 if base_set == "lava_sc" else 0) if base_set else 0
     base_text = f"Set Bonus: +{set_bonus} ({base_set})" if base_set else "No full set bonus"
@@ -351,13 +358,13 @@ def equipment_weight(items):
 
     best_by_slot = {}
 
-    for item in items:
-        ea = item.get("tag", {}).get("ExtraAttributes", {})
-        item_id = ea.get("id", "")
-        stars = ea.get("upgrade_level", 0)
-        rarity_up = ea.get("rarity_upgrades", 0)
-        reforge = ea.get("modifier", "")
-        attrs = ea.get("attributes", {})
+    equipment_ids = set().union(*slot_map.values())
+    for item in as_index(items).by_ids(equipment_ids):
+        item_id = item.id
+        stars = item.upgrade_level
+        rarity_up = item.rarity_upgrades
+        reforge = item.modifier
+        attrs = item.attributes
 
         for slot, ids in slot_map.items():
             if item_id in ids:
@@ -399,9 +406,7 @@ def fishing_exp_weight(profile, uuid):
 
     # EXP-based weight
     exp = member.get("player_data", {}).get("experience", {}).get("SKILL_FISHING", 0)
-    value = ((exp + 10_000_000) / 30_000_000)
-    log_term = math.log(value, 200)
-    exp_score = int((1000 * log_term + 208) * 0.75)
+    exp_score = skill_curve(exp, 0.75)
 
     total_score = exp_score
     breakdown = f"{exp:,} Fishing EXP → +{exp_score}"
@@ -409,7 +414,7 @@ def fishing_exp_weight(profile, uuid):
     return total_score, breakdown
 
 def pet_weight(pets):
-    pet_caps = 25353230
+    pet_caps = MAX_LEVEL_EXP
     pet_points = {
         "HERMIT_CRAB": {"common": 3, "uncommon": 3, "rare": 3, "epic": 5, "legendary": 10, "mythic": 30},
         "FLYING_FISH": {"common": 3, "uncommon": 3, "rare": 3, "epic": 3, "legendary": 10, "mythic": 40},
@@ -423,14 +428,11 @@ def pet_weight(pets):
 
     best_by_type = {}
 
-    for pet in pets:
-        pet_type = pet.get("type")
-        rarity = pet.get("tier", "common").lower()
-        exp = pet.get("exp", 0)
-        held = pet.get("heldItem", "")
-
-        if pet_type not in pet_points:
-            continue
+    for pet in as_pet_index(pets).by_types(pet_points):
+        pet_type = pet.type
+        rarity = (pet.tier or "common").lower()
+        exp = pet.exp
+        held = pet.held_item
 
         base = 0
         if isinstance(pet_points[pet_type], int):
@@ -478,6 +480,7 @@ def bestiary_weight(profile, uuid):
     return round(total_weight), "Fishing Diversity Value [judged via bestiaries]:" + ", ".join(desc_parts) + f" | Total FDV Weight: +{round(total_weight)}"
 
 def fishing_weight(profile, uuid, all_pets, items):
+    items = as_index(items)
     weights = []
 
     exp_score, exp_desc = fishing_exp_weight(profile, uuid)
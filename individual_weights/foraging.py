@@ -1,4 +1,5 @@
-import math
+from ..items import as_index
+from .generic_skills import skill_curve
 
 # Foraging weight function based on EXP
 def foraging_exp_weight(profile, uuid):
@@ -7,9 +8,7 @@ def foraging_exp_weight(profile, uuid):
 
     # EXP-based weight
     exp = member.get("player_data", {}).get("experience", {}).get("SKILL_FORAGING", 0)
-    value = ((exp + 10_000_000) / 30_000_000)
-    log_term = math.log(value, 200)
-    exp_score = int((1000 * log_term + 208) * 1.2)
+    exp_score = skill_curve(exp, 1.2)
 
     total_score = exp_score
     breakdown = f"{exp:,} Foraging EXP → +{exp_score}"
@@ -17,8 +16,8 @@ def foraging_exp_weight(profile, uuid):
     return total_score, breakdown
 
 def cloak_weight(items):
-    for item in items:
-        item_id = item.get("tag", {}).get("ExtraAttributes", {}).get("id", "")
+    for item in as_index(items).by_ids(("ANNIHILATION_CLOAK", "DESTRUCTION_CLOAK")):
+        item_id = item.id
         if item_id == "ANNIHILATION_CLOAK":
             return 35, "Annihilation Cloak → +35"
         elif item_id == "DESTRUCTION_CLOAK":
@@ -1,14 +1,17 @@
 import math
 
+# Shared skill EXP curve; each skill scales it by its own factor
+def skill_curve(exp, scale):
+    value = ((exp + 10_000_000) / 30_000_000)
+    log_term = math.log(value, 200)
+    return int((1000 * log_term + 208) * scale)
+
 # Alchemy weight based on the provided logarithmic formula
 def alchemy_weight(profile, uuid):
     normalized_uuid = uuid.replace("-", "")
     member = profile.get("members", {}).get(normalized_uuid, {})
     exp = member.get("player_data", {}).get("experience", {}).get("SKILL_ALCHEMY", 0)
-
-    value = ((exp + 10_000_000) / 30_000_000)
-    log_term = math.log(value, 200)
-    score = int((1000 * log_term + 208) * 0.5)
+    score = skill_curve(exp, 0.5)
 
     return score, [f"{exp:,} Alchemy EXP → +{score}"]
 
@@ -17,10 +20,7 @@ def carpentry_weight(profile, uuid):
     normalized_uuid = uuid.replace("-", "")
     member = profile.get("members", {}).get(normalized_uuid, {})
     exp = member.get("player_data", {}).get("experience", {}).get("SKILL_CARPENTRY", 0)
-
-    value = ((exp + 10_000_000) / 30_000_000)
-    log_term = math.log(value, 200)
-    score = int((1000 * log_term + 208) * 0.4)
+    score = skill_curve(exp, 0.4)
 
     return score, [f"{exp:,} Carpentry EXP → +{score}"]
 
@@ -29,10 +29,7 @@ def enchanting_weight(profile, uuid):
     normalized_uuid = uuid.replace("-", "")
     member = profile.get("members", {}).get(normalized_uuid, {})
     exp = member.get("player_data", {}).get("experience", {}).get("SKILL_ENCHANTING", 0)
-
-    value = ((exp + 10_000_000) / 30_000_000)
-    log_term = math.log(value, 200)
-    score = int((1000 * log_term + 208) * 0.2)
+    score = skill_curve(exp, 0.2)
 
     return score, [f"{exp:,} Enchanting EXP → +{score}"]
 
@@ -43,9 +40,7 @@ def taming_weight(profile, uuid):
 
     # EXP-based weight
     exp = member.get("player_data", {}).get("experience", {}).get("SKILL_TAMING", 0)
-    value = ((exp + 10_000_000) / 30_000_000)
-    log_term = math.log(value, 200)
-    exp_score = int((1000 * log_term + 208) * 0.2)
+    exp_score = skill_curve(exp, 0.2)
 
     # Sacrificed pets score
     sacrificed = member.get("pets_data", {}).get("pet_care", {}).get("pet_types_sacrificed", [])
@@ -1,5 +1,7 @@
 import math
 
+from ..items import as_index
+
 gem_tiers = {
     "ROUGH": 1,
     "FLAWED": 1,
@@ -50,9 +52,8 @@ def score_mining_armor(items):
     valid_slots = {"HELMET", "CHESTPLATE", "LEGGINGS", "BOOTS"}
     best_per_slot = {}
 
-    for item in items:
-        extra = item.get("tag", {}).get("ExtraAttributes", {})
-        item_id = extra.get("id", "")
+    for item in as_index(items).with_prefix(*sets):
+        item_id = item.id
         for set_name in sets:
             if item_id.startswith(set_name):
                 parts = item_id.split("_")
@@ -61,19 +62,19 @@ def score_mining_armor(items):
                     continue  # skip things like chisel, gauntlet, etc.
 
                 base_score = sets[set_name]["base"]
-                slot_score = gemstone_score(extra.get("gems", {}), sets[set_name]["slot_value"])
+                slot_score = gemstone_score(item.gems, sets[set_name]["slot_value"])
 
                 # Modifiers & upgrades
                 mods = 0
-                if extra.get("rarity_upgrades", 0) >= 1:
+                if item.rarity_upgrades >= 1:
                     mods += 2
-                modifier = extra.get("modifier", "").lower()
+                modifier = item.modifier.lower()
                 if modifier == "jaded":
                     mods += 7
                 if modifier == "dimensional":
                     mods += 2
 
-                enchants = extra.get("enchantments", {})
+                enchants = item.enchantments
                 ice_cold = enchants.get("ice_cold", 0)
                 ultimate_wisdom = enchants.get("ultimate_wisdom", 0)
 
@@ -102,9 +103,8 @@ def score_mineral_armor(items):
     valid_slots = {"HELMET", "CHESTPLATE", "LEGGINGS", "BOOTS"}
     best_per_slot = {}
 
-    for item in items:
-        extra = item.get("tag", {}).get("ExtraAttributes", {})
-        item_id = extra.get("id", "")
+    for item in as_index(items).with_prefix(*sets):
+        item_id = item.id
         for set_name in sets:
             if item_id.startswith(set_name):
                 parts = item_id.split("_")
@@ -116,7 +116,7 @@ def score_mineral_armor(items):
                 mods = 0
 
                 # Ice Cold and Ultimate Wisdom only
-                enchants = extra.get("enchantments", {})
+                enchants = item.enchantments
                 ice_cold = enchants.get("ice_cold", 0)
                 ultimate_wisdom = enchants.get("ultimate_wisdom", 0)
 
@@ -125,9 +125,9 @@ def score_mineral_armor(items):
                     mods += 5
                 mods += ultimate_wisdom
 
-                if extra.get("rarity_upgrades", 0) >= 1:
+                if item.rarity_upgrades >= 1:
                     mods += 2
-                modifier = extra.get("modifier", "").lower()
+                modifier = item.modifier.lower()
                 if modifier == "jaded":
                     mods += 7
                 if modifier == "dimensional":
@@ -195,11 +195,9 @@ def main_drill_weight(items):
     best_score = 0
     best_desc = []
 
-    for item in items:
-        extra = item.get("tag", {}).get("ExtraAttributes", {})
-        drill_id = extra.get("id", "")
-        if drill_id not in drill_values:
-            continue
+    for item in as_index(items).by_ids(drill_values):
+        extra = item.extra
+        drill_id = item.id
 
         score = 0
         breakdown = []
@@ -210,14 +208,14 @@ def main_drill_weight(items):
         breakdown.append(f"{drill_names[drill_id]} +{base_val}")
 
         # Reforge
-        reforge = extra.get("modifier", "").lower()
+        reforge = item.modifier.lower()
         if reforge in reforge_values:
             val = reforge_values[reforge]
             score += val
             breakdown.append(f"{reforge.title()} Reforge +{val}")
 
         # Enchantments
-        enchants = extra.get("enchantments", {})
+        enchants = item.enchantments
         if enchants.get("efficiency", 0) == 10:
             score += 5
             breakdown.append("Efficiency 10 +5")
@@ -261,12 +259,12 @@ def main_drill_weight(items):
             breakdown.append(f"Polarvoid {polarvoid} +3")
 
         # Rarity upgrade
-        if extra.get("rarity_upgrades", 0) >= 1:
+        if item.rarity_upgrades >= 1:
             score += 2
             breakdown.append("Rarity Upgrade +2")
 
         # Gemstones
-        gems = extra.get("gems", {})
+        gems = item.gems
         gem_score = gemstone_score(gems, 3)
         if gem_score > 0:
             score += gem_score
@@ -300,7 +298,7 @@ def main_drill_weight(items):
 
 def blegg_weight(items):
     for item in items:
-        extra = item.get("tag", {}).get("ExtraAttributes", {})
+        extra = item.extra
         if extra.get("drill_part_upgrade_module", "").lower() == "goblin_omelette_blue_cheese":
             return 100, ["Blegg Drill: Goblin Omelette Blue Cheese +100"]
     return 0, []
@@ -344,6 +342,7 @@ def hotm_weight(profile, uuid):
     return total, ', '.join(breakdown) + f" | +{total}"
 
 def mining_weight(profile, uuid, items, pets):
+    items = as_index(items)
     weights = []
 
     armor_score, armor_desc = score_mining_armor(items)
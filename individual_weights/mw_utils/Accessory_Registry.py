@@ -0,0 +1,121 @@
+import json
+import os
+import time
+
+# Accessory lines (Accessory_Lines.json) flattened into item_id -> (group name, tier order), loaded once per process.
+# After loading, the source file is only stat'ed again every RECHECK_INTERVAL seconds, and reloaded if it changed.
+# enable_registry_cache(path) also keeps the flattened form in a JSON file at `path`, keyed by the source's mtime,
+# so later processes skip rebuilding it. Off by default: the package directory may well be read-only.
+
+SOURCE_PATH = os.path.join(os.path.dirname(__file__), "Accessory_Lines.json")
+CACHE_VERSION = 2
+RECHECK_INTERVAL = 60
+
+_cache_path = None
+_groups = {}  # group name -> [[display name, item id], ...] in tier order, as in the JSON
+_registry = {}  # item id -> (group name, tier order)
+_source_mtime = None
+_last_check = 0.0
+
+
+def _build_registry(groups):
+    registry = {}
+    for group_name, entries in groups.items():
+        for tier, (_, item_id) in enumerate(entries):
+            registry.setdefault(item_id, (group_name, tier))  # a few IDs appear in two lines; the first one wins
+    return registry
+
+
+def enable_registry_cache(path):
+    """Caches the flattened registry as JSON at `path` (somewhere writable, e.g. a cache dir) from now on."""
+    global _cache_path
+    _cache_path = path
+
+
+def disable_registry_cache():
+    global _cache_path
+    _cache_path = None
+
+
+def _read_cache(mtime_ns):
+    if _cache_path is None:
+        return None
+    try:
+        with open(_cache_path, "r", encoding="utf-8") as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(cached, dict) or cached.get("version") != CACHE_VERSION or cached.get("source_mtime_ns") != mtime_ns:
+        return None
+    groups, registry = cached.get("groups"), cached.get("registry")
+    if not isinstance(groups, dict) or not isinstance(registry, dict):
+        return None
+    if not all(isinstance(entry, list) and len(entry) == 2 for entry in registry.values()):
+        return None
+    return groups, {item_id: tuple(entry) for item_id, entry in registry.items()}
+
+
+def _write_cache(mtime_ns, groups, registry):
+    if _cache_path is None:
+        return
+    tmp_path = f"{_cache_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "version": CACHE_VERSION,
+                "source_mtime_ns": mtime_ns,
+                "groups": groups,
+                "registry": registry,
+            }, f, separators=(",", ":"))
+        os.replace(tmp_path, _cache_path)
+    except OSError as e:
+        # The registry still works, it just gets rebuilt from the source next process
+        print(f"Accessory registry cache not written: {e}")
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
+def load_registry(force=False):
+    """(Re)loads the registry if the source JSON changed since the last load (or if force is set)."""
+    global _groups, _registry, _source_mtime, _last_check
+    _last_check = time.monotonic()
+    mtime_ns = os.stat(SOURCE_PATH).st_mtime_ns
+    if not force and mtime_ns == _source_mtime:
+        return _registry
+
+    cached = None if force else _read_cache(mtime_ns)
+    if cached is not None:
+        groups, registry = cached
+    else:
+        with open(SOURCE_PATH, "r", encoding="utf-8") as f:
+            groups = json.load(f)
+        registry = _build_registry(groups)
+        _write_cache(mtime_ns, groups, registry)
+
+    _groups, _registry, _source_mtime = groups, registry, mtime_ns
+    return _registry
+
+
+def get_registry():
+    if _source_mtime is None or time.monotonic() - _last_check >= RECHECK_INTERVAL:
+        load_registry()
+    return _registry
+
+
+def get_groups():
+    get_registry()
+    return _groups
+
+
+def accessory_group(item_id):
+    """The accessory line an item belongs to, or the item id itself for accessories without a line."""
+    entry = get_registry().get(item_id)
+    return entry[0] if entry else item_id
+
+
+def accessory_tier(item_id):
+    """Position of the item within its line (0 = lowest tier), or None if it isn't in a line."""
+    entry = get_registry().get(item_id)
+    return entry[1] if entry else None
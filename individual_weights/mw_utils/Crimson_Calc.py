@@ -1,3 +1,6 @@
+from ...items import as_index
+
+
 def score_crimson_set(all_items):
     tier_weights = {
         "CRIMSON": 5,
@@ -39,7 +42,7 @@ def score_crimson_set(all_items):
 
     def enhancement_score(i):
         score = 0
-        enchants = i.get("tag", {}).get("ExtraAttributes", {}).get("enchantments", {})
+        enchants = i.enchantments
         if enchants.get("protection") == 7:
             score += 10
         if enchants.get("growth") == 7:
@@ -53,7 +56,7 @@ def score_crimson_set(all_items):
         elif ultimate_legion > 0:
             score += 5 * ultimate_legion
 
-        gems = ea.get("gems", {})
+        gems = i.gems
         unlocked = gems.get("unlocked_slots", [])
         score += len(unlocked) * 10
         for gslot in unlocked:
@@ -71,17 +74,13 @@ def score_crimson_set(all_items):
 
     best_per_piece = {}
 
-    for item in all_items:
-        ea = item.get("tag", {}).get("ExtraAttributes", {})
-        item_id = ea.get("id", "")
-        if not any(tier in item_id for tier in tier_weights):
-            continue
-
+    for item in as_index(all_items).with_prefix(*tier_weights):
+        item_id = item.id
         for tier, tier_val in tier_weights.items():
             if item_id.startswith(tier):
                 slot = item_id.replace(tier + "_", "")
                 base = tier_val
-                attr = attribute_score(ea.get("attributes", {}))
+                attr = attribute_score(item.attributes)
                 upgrade = enhancement_score(item)
                 total = base + attr + upgrade
 
@@ -1,20 +1,8 @@
 import json
 from ..get_data import to_json_safe
+from ..pet_index import as_pet_index, exp_for_level, MAX_LEVEL_EXP
 import math
 
-# Define tier values
-tier_values = {
-    "MYTHIC": 6,
-    "LEGENDARY": 5,
-    "EPIC": 4,
-    "RARE": 3,
-    "UNCOMMON": 2,
-    "COMMON": 1
-}
-
-# Define pet names to normalize
-wisp_variants = {"DROPLET_WISP", "FROST_WISP", "GLACIAL_WISP", "SUBZERO_WISP"}
-
 
 def score_golden_dragons(pets, profile_data, uuid):
     valid_items = {
@@ -27,12 +15,9 @@ def score_golden_dragons(pets, profile_data, uuid):
     valid_gdrag_found = False
     fallback_gdrag = None
 
-    for pet in pets:
-        if pet.get("type") != "GOLDEN_DRAGON":
-            continue
-
-        held_item = pet.get("heldItem")
-        level = min(int(((pet.get("exp", 0)) - 25358785) / 1886700) + 102, 200)
+    for pet in as_pet_index(pets).by_type("GOLDEN_DRAGON"):
+        held_item = pet.held_item
+        level = pet.level
         item_name = valid_items.get(held_item)
 
         if item_name and level >= 100:
@@ -69,28 +54,14 @@ def score_golden_dragons(pets, profile_data, uuid):
     return total_score, breakdown
 
 def pet_score_weight(all_pets):
-    # Track highest-tier pet per type
-    best_pets = {}
-    for pet in all_pets:
-        pet_type = pet.get("type")
-        if pet_type in wisp_variants:
-            pet_type = "WISP"
-
-        tier = pet.get("tier")
-        exp = pet.get("exp", 0)
-
-        if pet_type not in best_pets or tier_values[tier] > tier_values[best_pets[pet_type]["tier"]]:
-            best_pets[pet_type] = {
-                "tier": tier,
-                "exp": exp
-            }
+    # Highest-tier pet per type (wisps count as one type)
+    best_pets = as_pet_index(all_pets).best_by_family()
 
     # Calculate raw pet score
     pet_score = 0
-    for pet_type, info in best_pets.items():
-        tier_score = tier_values[info["tier"]]
-        bonus = 1 if info["tier"] in {"LEGENDARY", "MYTHIC"} and info["exp"] >= 25353230 else 0
-        pet_score += tier_score + bonus
+    for pet in best_pets.values():
+        bonus = 1 if pet.tier in {"LEGENDARY", "MYTHIC"} and pet.level >= 100 else 0
+        pet_score += pet.tier_rank + bonus
 
 
     return pet_weight_function(pet_score), f"Pet Score Estimate of {pet_score}"
@@ -99,49 +70,34 @@ def pet_weight_function(x):
     return int(max((x - 150) / 5, 0) ** 1.62)
 
 def score_black_cat(pets):
-    for pet in pets:
-        if pet.get("type") != "BLACK_CAT":
-            continue
-        if pet.get("heldItem") != "MINOS_RELIC":
+    for pet in as_pet_index(pets).by_type("BLACK_CAT"):
+        if pet.held_item != "MINOS_RELIC":
             continue
-        if pet.get("tier") not in {"LEGENDARY", "MYTHIC"}:
+        if pet.tier not in {"LEGENDARY", "MYTHIC"}:
             continue
-        if pet.get("exp", 0) >= 25353230:  # Level 100 threshold
+        if pet.level >= 100:
             return 50, "Level 100 Black Cat with Minos Relic — 50 points"
     return 0, None
 
 def score_phoenix(pets):
-    best_phoenix = None
-    tier_order = {"COMMON": 1, "UNCOMMON": 2, "RARE": 3, "EPIC": 4, "LEGENDARY": 5, "MYTHIC": 6}
-
-    for pet in pets:
-        if pet.get("type") != "PHOENIX":
-            continue
-        if not best_phoenix or tier_order[pet["tier"]] > tier_order[best_phoenix["tier"]]:
-            best_phoenix = pet
+    best_phoenix = as_pet_index(pets).best("PHOENIX")
 
     if not best_phoenix:
         return 0, None
 
-    exp = best_phoenix.get("exp", 0)
-    tier = best_phoenix.get("tier")
+    exp = best_phoenix.exp
+    tier = best_phoenix.tier
+    past_80 = exp > exp_for_level(80, tier)
 
     if tier == "EPIC":
-        return (50, "Phoenix Level 81+ (EPIC) — 50 points") if exp > 4234500 else (40, "Phoenix ≤ 80 (EPIC) — 40 points")
+        return (50, "Phoenix Level 81+ (EPIC) — 50 points") if past_80 else (40, "Phoenix ≤ 80 (EPIC) — 40 points")
     elif tier in {"LEGENDARY", "MYTHIC"}:
-        return (50, "Phoenix Level 81+ (LEGENDARY) — 50 points") if exp > 5619230 else (40, "Phoenix ≤ 80 (LEGENDARY) — 40 points")
+        return (50, "Phoenix Level 81+ (LEGENDARY) — 50 points") if past_80 else (40, "Phoenix ≤ 80 (LEGENDARY) — 40 points")
     else:
         return 0, "Phoenix found, but tier is too low to count"
 
 def score_parrot(pets):
-    best_parrot = None
-    tier_order = {"COMMON": 1, "UNCOMMON": 2, "RARE": 3, "EPIC": 4, "LEGENDARY": 5, "MYTHIC": 6}
-
-    for pet in pets:
-        if pet.get("type") != "PARROT":
-            continue
-        if not best_parrot or tier_order[pet["tier"]] > tier_order[best_parrot["tier"]]:
-            best_parrot = pet
+    best_parrot = as_pet_index(pets).best("PARROT")
 
     if not best_parrot:
         return 0, None
@@ -149,40 +105,34 @@ def score_parrot(pets):
     score = 20
     desc = ["Parrot Pet — 20 points"]
 
-    if best_parrot["exp"] >= 25353230:
+    if best_parrot.exp >= MAX_LEVEL_EXP:  # legendary max-level exp, whatever the parrot's rarity
         score += 10
         desc.append("Level 100 — +10")
 
-    if best_parrot["tier"] in {"LEGENDARY", "MYTHIC"}:
+    if best_parrot.tier in {"LEGENDARY", "MYTHIC"}:
         score += 5
         desc.append("Legendary or higher — +5")
 
     return score, ", ".join(desc)
 
 def score_guardian(pets):
-    for pet in pets:
-        if pet.get("type") == "GUARDIAN" and pet.get("tier") == "MYTHIC":
-            exp = pet.get("exp", 0)
-            capped_exp = min(max(exp, 0), 25_353_230)
-            weight = 1 + 9 * (capped_exp / 25_353_230)
+    for pet in as_pet_index(pets).by_type("GUARDIAN"):
+        if pet.tier == "MYTHIC":
+            weight = 1 + 9 * pet.progress
             return int(weight), f"Mythic Guardian — +{int(weight)} points" if int(weight) == 10 else f"Mythic Guardian Sub Lvl 100 — +{int(weight)} points"
     return 0, None
 
 def score_endermite(pets):
-    for pet in pets:
-        if pet.get("type") == "ENDERMITE" and pet.get("tier") == "MYTHIC":
-            exp = pet.get("exp", 0)
-            capped_exp = min(max(exp, 0), 25_353_230)
-            weight = 1 + 9 * (capped_exp / 25_353_230)
+    for pet in as_pet_index(pets).by_type("ENDERMITE"):
+        if pet.tier == "MYTHIC":
+            weight = 1 + 9 * pet.progress
             return int(weight), f"Mythic Endermite — +{int(weight)} points" if int(weight) == 10 else f"Mythic Endermite Sub Lvl 100 — +{int(weight)} points"
     return 0, None
 
 def score_grandma_wolf(pets):
-    for pet in pets:
-        if pet.get("type") == "GRANDMA_WOLF" and pet.get("tier") == "LEGENDARY":
-            exp = pet.get("exp", 0)
-            capped_exp = min(max(exp, 0), 25_353_230)
-            weight = 1 + 4 * (capped_exp / 25_353_230)
+    for pet in as_pet_index(pets).by_type("GRANDMA_WOLF"):
+        if pet.tier == "LEGENDARY":
+            weight = 1 + 4 * pet.progress
             return int(weight), f"Legendary Grandma Wolf — +{int(weight)} points" if int(weight) == 10 else f"Legendary Grandma Wolf Sub Lvl 100 — +{int(weight)} points"
     return 0, None
 
@@ -191,13 +141,10 @@ def score_ender_dragon(pets):
     best_score = 0
     best_desc = None
 
-    for pet in pets:
-        if pet.get("type") != "ENDER_DRAGON":
-            continue
-
-        tier = pet.get("tier")
-        held_item = pet.get("heldItem")
-        exp = pet.get("exp", 0)
+    for pet in as_pet_index(pets).by_type("ENDER_DRAGON"):
+        tier = pet.tier
+        held_item = pet.held_item
+        exp = pet.exp
 
         # Determine if it's tier boosted
         is_tier_boosted = tier == "EPIC" and held_item == "PET_ITEM_TIER_BOOST"
@@ -206,17 +153,17 @@ def score_ender_dragon(pets):
 
         if is_tier_boosted:
             base = 400 - 25  # tier boosted epic uses legendary base minus penalty
-            level_progress = min(exp / 18_608_500, 1.0)
+            level_progress = min(exp / exp_for_level(100, "EPIC"), 1.0)
             level_score = 25 * level_progress
             desc = f"Tier-Boosted Ender Dragon (EPIC → LEGENDARY base) — {base + round(level_score)} points"
         elif is_legendary:
             base = 400
-            level_progress = min(exp / 25_353_230, 1.0)
+            level_progress = min(exp / exp_for_level(100, "LEGENDARY"), 1.0)
             level_score = 25 * level_progress
             desc = f"Legendary Ender Dragon — {base + round(level_score)} points"
         elif is_epic:
             base = 300
-            level_progress = min(exp / 18_608_500, 1.0)
+            level_progress = min(exp / exp_for_level(100, "EPIC"), 1.0)
             level_score = 25 * level_progress
             desc = f"Epic Ender Dragon — {base + round(level_score)} points"
         else:
@@ -232,6 +179,7 @@ def score_ender_dragon(pets):
     return 0, None
 
 def pet_weight(all_pets, profile, uuid):
+    all_pets = as_pet_index(all_pets)
     pet_weights = []
 
     gdrag_score, gdrag_desc = score_golden_dragons(all_pets, profile, uuid)
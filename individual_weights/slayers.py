@@ -1,4 +1,6 @@
 import math
+from ..items import as_index
+from ..pet_index import as_pet_index
 from ..individual_weights.mw_utils.Crimson_Calc import score_crimson_set
 
 def r(x):  # Rev
@@ -27,8 +29,7 @@ def b(x): # Blaze
         return base + extra * 3 * 0.75
 
 def score_slayer_weapon(item, slayer_id):
-    extra = item.get("tag", {}).get("ExtraAttributes", {})
-    enchants = extra.get("enchantments", {})
+    enchants = item.enchantments
     if not enchants:
         return 0, "No enchantments"
 
@@ -147,19 +148,18 @@ def slayer_weapon_score(items, slayer_id, base_weapon_score_maps, slayer_name="S
     total_score = 0
     combined_breakdowns = []
 
+    items = as_index(items)
     for base_weapon_scores in base_weapon_score_maps:
         best_score = 0
         best_breakdown = ""
 
-        for item in items:
-            extra = item.get("tag", {}).get("ExtraAttributes", {})
-            item_id = extra.get("id", "")
-            base_score = base_weapon_scores.get(item_id)
-            if base_score is None:
-                continue
+        for item in items.by_ids(base_weapon_scores):
+            extra = item.extra
+            item_id = item.id
+            base_score = base_weapon_scores[item_id]
 
             enchant_score, ench_breakdown = score_slayer_weapon(item, slayer_id)
-            gem_score = gemstone_score(extra.get("gems", {}))
+            gem_score = gemstone_score(item.gems)
             book_score = enhancement_score(extra)
 
             total = base_score + enchant_score + gem_score + book_score
@@ -210,15 +210,17 @@ def revenant_points(profile, uuid, pets, items):
         desc.append("Revenant Horror 8")
 
     ghoul_score = 0
-    for pet in pets:
-        if pet["type"] == "GHOUL" and pet["tier"] in {"EPIC", "LEGENDARY"}:
-            exp = min(max(pet.get("exp", 0), 0), 25353230)
-            ghoul_score = max(ghoul_score, 1 + 9 * (exp / 25353230))
+    for pet in as_pet_index(pets).by_type("GHOUL"):
+        if pet.tier in {"EPIC", "LEGENDARY"}:
+            candidate = 1 + 9 * pet.progress
+            if candidate > ghoul_score:
+                ghoul_score = candidate
+                ghoul = pet
     ghoul_score = round(ghoul_score)
     if ghoul_score > 0:
         score += ghoul_score
-        progress = round(100 * (exp / 25353230))
-        desc.append(f"Ghoul Pet – {progress}% to Lvl 100 {pet['tier']}")
+        progress = round(100 * ghoul.progress)
+        desc.append(f"Ghoul Pet – {progress}% to Lvl 100 {ghoul.tier}")
 
     score += weapon_score  # Adjust based on your system
     desc.append(f"Weapon Score: {weapon_score} ({weapon_breakdown})")
@@ -249,12 +251,11 @@ def spider_points(profile, uuid, pets, items):
     score += int(xp_weight)
 
     pet_score = 0
-    for pet in pets:
-        if pet["type"] == "TARANTULA" and pet["tier"] in {"LEGENDARY", "MYTHIC"}:
-            exp = min(max(pet.get("exp", 0), 0), 25353230)
-            progress = round(100 * (exp / 25353230))
-            pet_score = max(pet_score, 1 + 9 * (exp / 25353230))
-            pet_desc = f"Tarantula Pet – {progress}% to Lvl 100 {pet['tier']}"
+    for pet in as_pet_index(pets).by_type("TARANTULA"):
+        if pet.tier in {"LEGENDARY", "MYTHIC"}:
+            progress = round(100 * pet.progress)
+            pet_score = max(pet_score, 1 + 9 * pet.progress)
+            pet_desc = f"Tarantula Pet – {progress}% to Lvl 100 {pet.tier}"
     pet_score = round(pet_score)
     if pet_score > 0:
         score += round(pet_score)
@@ -300,12 +301,11 @@ def sven_points(profile, uuid, pets, items):
         desc.append("Sven 3")
 
     hound_score = 0
-    for pet in pets:
-        if pet["type"] == "HOUND" and pet["tier"] == "LEGENDARY":
-            exp = min(max(pet.get("exp", 0), 0), 25353230)
-            progress = round(100 * (exp / 25353230))
-            hound_score = max(hound_score, 1 + 14 * (exp / 25353230))
-            hound_desc = f"Hound Pet – {progress}% to Lvl 100 {pet['tier']}"
+    for pet in as_pet_index(pets).by_type("HOUND"):
+        if pet.tier == "LEGENDARY":
+            progress = round(100 * pet.progress)
+            hound_score = max(hound_score, 1 + 14 * pet.progress)
+            hound_desc = f"Hound Pet – {progress}% to Lvl 100 {pet.tier}"
     hound_score = round(hound_score)
     if hound_score > 0:
         score += round(hound_score)
@@ -361,12 +361,11 @@ def enderman_points(profile, uuid, pets, items):
         desc.append("Enderman Slayer 9")
 
     pet_score = 0
-    for pet in pets:
-        if pet["type"] == "ENDERMAN" and pet["tier"] == "MYTHIC":
-            exp = min(max(pet.get("exp", 0), 0), 25353230)
-            progress = round(100 * (exp / 25353230))
-            pet_score = max(pet_score, 1 + 24 * (exp / 25353230))
-            pet_desc = f"Mythic Enderman Pet – {progress}% to Lvl 100 {pet['tier']}"
+    for pet in as_pet_index(pets).by_type("ENDERMAN"):
+        if pet.tier == "MYTHIC":
+            progress = round(100 * pet.progress)
+            pet_score = max(pet_score, 1 + 24 * pet.progress)
+            pet_desc = f"Mythic Enderman Pet – {progress}% to Lvl 100 {pet.tier}"
     pet_score = round(pet_score)
     if pet_score > 0:
         score += round(pet_score)
@@ -390,16 +389,9 @@ def enderman_points(profile, uuid, pets, items):
     desc.append(f"Weapon Score: {enderman_score} ({enderman_breakdown})")
 
     # Check for Ender Artifact or Relic
-    has_artifact = False
-    has_relic = False
-
-    for item in items:
-        item_id = item.get("tag", {}).get("ExtraAttributes", {}).get("id", "")
-        if item_id == "ENDER_RELIC":
-            has_relic = True
-            break
-        elif item_id == "ENDER_ARTIFACT":
-            has_artifact = True
+    items = as_index(items)
+    has_relic = items.has("ENDER_RELIC")
+    has_artifact = items.has("ENDER_ARTIFACT")
 
     if has_relic:
         score += 50
@@ -442,12 +434,11 @@ def blaze_points(profile, uuid, pets, items):
 
     best_score = 0
     best_name = None
-    for pet in pets:
-        pet_type = pet.get("type", "")
-        if pet_type in wisp_scores:
-            if wisp_scores[pet_type] > best_score:
-                best_score = wisp_scores[pet_type]
-                best_name = pet_type.replace("_", " ").title()
+    for pet in as_pet_index(pets).by_types(wisp_scores):
+        pet_type = pet.type
+        if wisp_scores[pet_type] > best_score:
+            best_score = wisp_scores[pet_type]
+            best_name = pet_type.replace("_", " ").title()
 
     if best_score > 0:
         score += best_score
@@ -474,18 +465,10 @@ def blaze_points(profile, uuid, pets, items):
     desc.append(f"Weapon Score: {blaze_weapon_score} ({blaze_breakdown})")
 
     # Blaze-specific accessory bonuses
-    has_nether_artifact = False
-    has_burststopper_artifact = False
-    has_burststopper_talisman = False
-
-    for item in items:
-        item_id = item.get("tag", {}).get("ExtraAttributes", {}).get("id", "")
-        if item_id == "NETHER_ARTIFACT":
-            has_nether_artifact = True
-        elif item_id == "BURSTSTOPPER_ARTIFACT":
-            has_burststopper_artifact = True
-        elif item_id == "BURSTSTOPPER_TALISMAN":
-            has_burststopper_talisman = True
+    items = as_index(items)
+    has_nether_artifact = items.has("NETHER_ARTIFACT")
+    has_burststopper_artifact = items.has("BURSTSTOPPER_ARTIFACT")
+    has_burststopper_talisman = items.has("BURSTSTOPPER_TALISMAN")
 
     if has_nether_artifact:
         score += 10
@@ -501,6 +484,8 @@ def blaze_points(profile, uuid, pets, items):
     return score, [" + ".join(desc), score]
 
 def slayer_weight(profile, uuid, all_pets, items):
+    items = as_index(items)
+    all_pets = as_pet_index(all_pets)
     slayer_weights = []
 
     auto_score = auto_slayer_points(profile, uuid)
@@ -1,12 +1,13 @@
 from ..get_data import roman
-from ..individual_weights.mw_utils.MP_Calc import calculate_magical_power, load_accessory_groups
+from ..items import as_index
+from ..individual_weights.mw_utils.MP_Calc import calculate_magical_power
 
 def count_chimera_books(all_items):
     total_books = 0
 
     for item in all_items:
         # Get the enchantments dictionary if it exists
-        enchantments = item.get('tag', {}).get('ExtraAttributes', {}).get('enchantments', {})
+        enchantments = item.enchantments
 
         if 'ultimate_chimera' in enchantments:
             level = enchantments['ultimate_chimera']
@@ -22,12 +23,9 @@ def score_terminators(all_items):
     highest_ultimates = {}
     explanations = []
 
-    for item in all_items:
-        extra = item.get("tag", {}).get("ExtraAttributes", {})
-        if extra.get("id") != "TERMINATOR":
-            continue
-
-        enchants = extra.get("enchantments", {})
+    for item in as_index(all_items).by_id("TERMINATOR"):
+        extra = item.extra
+        enchants = item.enchantments
 
         for k, v in enchants.items():
             if k.startswith("ultimate_"):
@@ -73,12 +71,9 @@ def score_hyperions(all_items):
     chimera_hype = None
     chimera_level = 0
 
-    for item in all_items:
-        extra = item.get("tag", {}).get("ExtraAttributes", {})
-        if extra.get("id") not in ["HYPERION", "ASTRAEA", "SCYLLA", "VALKYRIE"]:
-            continue
-
-        enchants = extra.get("enchantments", {})
+    for item in as_index(all_items).by_ids(("HYPERION", "ASTRAEA", "SCYLLA", "VALKYRIE")):
+        extra = item.extra
+        enchants = item.enchantments
         chimera = enchants.get("ultimate_chimera", 0)
 
         if not scroll_hype:
@@ -113,12 +108,9 @@ def score_aote_aotv(all_items):
     best_score = 0
     best_desc = ""
 
-    for item in all_items:
-        extra = item.get("tag", {}).get("ExtraAttributes", {})
-        item_id = extra.get("id")
-
-        if item_id not in {"ASPECT_OF_THE_END", "ASPECT_OF_THE_VOID"}:
-            continue
+    for item in as_index(all_items).by_ids(("ASPECT_OF_THE_END", "ASPECT_OF_THE_VOID")):
+        extra = item.extra
+        item_id = item.id
 
         name = "AOTE" if item_id == "ASPECT_OF_THE_END" else "AOTV"
         score = 5 if item_id == "ASPECT_OF_THE_END" else 6
@@ -150,11 +142,9 @@ def score_power_orbs(all_items):
     best_score = 0
     best_desc = ""
 
-    for item in all_items:
-        extra = item.get("tag", {}).get("ExtraAttributes", {})
-        item_id = extra.get("id", "")
-        if item_id not in orb_scores:
-            continue
+    for item in as_index(all_items).by_ids(orb_scores):
+        extra = item.extra
+        item_id = item.id
 
         score = orb_scores[item_id]
         desc = [item_id.replace("_", " ").title()]
@@ -184,11 +174,9 @@ def score_sos_flares(all_items):
     best_score = 0
     best_desc = ""
 
-    for item in all_items:
-        extra = item.get("tag", {}).get("ExtraAttributes", {})
-        item_id = extra.get("id", "")
-        if item_id not in flare_scores:
-            continue
+    for item in as_index(all_items).by_ids(flare_scores):
+        extra = item.extra
+        item_id = item.id
 
         score = flare_scores[item_id]
         desc = [item_id.replace("_", " ").title()]
@@ -218,6 +206,7 @@ def score_magical_power(profile, uuid, items):
 
 
 def weapon_weight(all_items, profile, uuid):
+    all_items = as_index(all_items)
     weapon_weights = []
 
     chimera_books = count_chimera_books(all_items)
@@ -0,0 +1,168 @@
+# Compact per-item records.
+# Every scorer used to walk item.get("tag", {}).get("ExtraAttributes", {})... on the decoded NBT of every item.
+# An Item is built once per decoded item with the commonly used fields pulled out, and the rest of the NBT
+# tree is dropped. ExtraAttributes is kept as-is (as `extra`) for the handful of item-specific fields.
+# Rarity and the accessory flag are read off the lore once here, instead of by every check that needs them.
+
+import re
+
+_EMPTY = {}
+
+# "§6§lLEGENDARY ACCESSORY" -> LEGENDARY. The rarity line is normally the last lore line.
+RARITY_PATTERN = re.compile(r"§.\s*(COMMON|UNCOMMON|RARE|EPIC|LEGENDARY|MYTHIC|SPECIAL|VERY SPECIAL)")
+ACCESSORY_KEYWORDS = ("ACCESSORY", "HATCCESSORY")
+
+
+def classify_lore(lore):
+    """Returns (rarity or None, is_accessory) from an item's lore lines."""
+    rarity = None
+    for line in reversed(lore):
+        match = RARITY_PATTERN.search(line)
+        if match:
+            rarity = match.group(1)
+            break
+
+    is_accessory = False
+    for line in lore[-2:]:  # the type is on the rarity line, which is one of the last two
+        upper = line.upper()
+        if any(keyword in upper for keyword in ACCESSORY_KEYWORDS):
+            is_accessory = True
+            break
+
+    return rarity, is_accessory
+
+
+class Item:
+    __slots__ = (
+        "id", "count", "name", "lore", "extra",
+        "enchantments", "gems", "attributes",
+        "upgrade_level", "modifier", "rarity_upgrades",
+        "rarity", "is_accessory", "recombobulated",
+    )
+
+    def __init__(self, id="", count=1, name="Unnamed", lore=(), extra=_EMPTY):
+        self.id = id
+        self.count = count
+        self.name = name
+        self.lore = lore
+        self.extra = extra
+        self.enchantments = extra.get("enchantments", _EMPTY)
+        self.gems = extra.get("gems", _EMPTY)
+        self.attributes = extra.get("attributes", _EMPTY)
+        self.upgrade_level = extra.get("upgrade_level", 0)
+        self.modifier = extra.get("modifier", "")
+        self.rarity_upgrades = extra.get("rarity_upgrades", 0)
+        self.rarity, self.is_accessory = classify_lore(lore)
+        self.recombobulated = bool(self.rarity_upgrades)
+
+    @classmethod
+    def from_nbt(cls, compound):
+        """Builds a record from one decoded item compound (plain dicts, see nbt_reader.ITEM_SPEC)."""
+        tag = compound.get("tag", _EMPTY)
+        extra = tag.get("ExtraAttributes", _EMPTY)
+        display = tag.get("display", _EMPTY)
+        return cls(
+            id=extra.get("id", ""),
+            count=compound.get("Count", 1),
+            name=display.get("Name", "Unnamed"),
+            lore=display.get("Lore", ()),
+            extra=extra,
+        )
+
+    def to_dict(self):
+        """The item in its original NBT shape (only the fields that were kept), e.g. for dumps."""
+        return {
+            "Count": self.count,
+            "tag": {
+                "ExtraAttributes": self.extra,
+                "display": {"Name": self.name, "Lore": list(self.lore)},
+            },
+        }
+
+    def __repr__(self):
+        return f"Item({self.id or 'EMPTY'})"
+
+
+def items_from_nbt(compounds):
+    return [Item.from_nbt(compound) for compound in compounds]
+
+
+class ItemIndex:
+    """
+    All of a profile's items, indexed once by ID so scorers can look up what they need instead of each
+    scanning the full list. Iterating the index yields every item in its original order, and every lookup
+    returns items in that same order (scorers break ties by "first seen", so order matters).
+
+    Prefix / substring / regex lookups run over the distinct IDs only and are cached per query.
+    """
+
+    def __init__(self, items):
+        self.items = list(items)
+        self._positions = {}  # item id -> positions in self.items
+        self._accessory_positions = []
+        for position, item in enumerate(self.items):
+            self._positions.setdefault(item.id, []).append(position)
+            if item.is_accessory:
+                self._accessory_positions.append(position)
+        self._id_queries = {}
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+    @property
+    def ids(self):
+        return self._positions.keys()
+
+    def has(self, item_id):
+        return item_id in self._positions
+
+    def by_id(self, item_id):
+        return [self.items[p] for p in self._positions.get(item_id, ())]
+
+    def by_ids(self, item_ids):
+        positions = []
+        for item_id in item_ids:
+            positions.extend(self._positions.get(item_id, ()))
+        positions.sort()
+        return [self.items[p] for p in positions]
+
+    def _cached_ids(self, key, predicate):
+        ids = self._id_queries.get(key)
+        if ids is None:
+            ids = self._id_queries[key] = frozenset(i for i in self._positions if predicate(i))
+        return ids
+
+    def ids_with_prefix(self, *prefixes):
+        return self._cached_ids(("prefix", prefixes), lambda i: i.startswith(prefixes))
+
+    def ids_containing(self, fragment):
+        return self._cached_ids(("contains", fragment), lambda i: fragment in i)
+
+    def ids_matching(self, pattern):
+        """IDs for which pattern.match() succeeds. `pattern` should be a precompiled regex."""
+        return self._cached_ids(("match", pattern), lambda i: pattern.match(i) is not None)
+
+    def accessories(self, include_ids=()):
+        """Items classified as accessories, plus any items with the given IDs."""
+        positions = set(self._accessory_positions)
+        for item_id in include_ids:
+            positions.update(self._positions.get(item_id, ()))
+        return [self.items[p] for p in sorted(positions)]
+
+    def with_prefix(self, *prefixes):
+        return self.by_ids(self.ids_with_prefix(*prefixes))
+
+    def containing(self, fragment):
+        return self.by_ids(self.ids_containing(fragment))
+
+    def matching(self, pattern):
+        """(item, match) pairs for every item whose ID matches the precompiled `pattern`."""
+        return [(item, pattern.match(item.id)) for item in self.by_ids(self.ids_matching(pattern))]
+
+
+def as_index(items):
+    """Lets scorers accept either a plain item list or an already-built ItemIndex."""
+    return items if isinstance(items, ItemIndex) else ItemIndex(items)
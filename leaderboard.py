@@ -0,0 +1,119 @@
+import argparse
+import asyncio
+import json
+import os
+import sys
+from .mapleWeight import main
+from .http_client import close_session
+from .worker_pool import start_pool, shutdown_pool
+
+# Bulk MapleWeight computation for guild / community leaderboards.
+# Usernames are pulled from the input lazily and at most `concurrency` lookups are in flight at once,
+# so memory stays flat no matter how long the list is. Results are yielded in completion order.
+
+DEFAULT_CONCURRENCY = 8
+
+
+async def compute_weights(usernames, api_key, *, profile=None, concurrency=DEFAULT_CONCURRENCY):
+    """
+    Yields (username, weight, breakdown) for every username as soon as its lookup finishes, where breakdown maps
+    each category to its total. A failed lookup yields (username, None, error message) instead of stopping the batch.
+    Lookups run quietly (nothing is printed per player).
+    """
+    usernames = iter(usernames)
+    pending = set()
+
+    async def lookup(username):
+        try:
+            result = await main(username, api_key, profile=profile, quiet=True)
+            return username, result.total, result.category_totals()
+        except Exception as e:
+            return username, None, str(e)
+
+    def fill():
+        while len(pending) < concurrency:
+            username = next(usernames, None)
+            if username is None:
+                return
+            pending.add(asyncio.ensure_future(lookup(username)))
+
+    fill()
+    try:
+        while pending:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                pending.discard(task)
+                yield task.result()
+            fill()
+    finally:
+        # Consumer stopped early (or was cancelled): don't leave lookups running in the background
+        for task in pending:
+            task.cancel()
+
+
+def to_record(username, weight, breakdown):
+    if weight is None:
+        return {"username": username, "error": breakdown}
+    return {"username": username, "weight": weight, "breakdown": breakdown}
+
+
+async def write_jsonl(usernames, api_key, out, *, profile=None, concurrency=DEFAULT_CONCURRENCY):
+    """Streams one JSON line per username into the file object `out`. Returns (succeeded, failed) counts."""
+    succeeded = failed = 0
+    async for username, weight, breakdown in compute_weights(usernames, api_key, profile=profile, concurrency=concurrency):
+        out.write(json.dumps(to_record(username, weight, breakdown), ensure_ascii=False) + "\n")
+        out.flush()
+        if weight is None:
+            failed += 1
+        else:
+            succeeded += 1
+    return succeeded, failed
+
+
+def read_usernames(f):
+    for line in f:
+        username = line.strip()
+        if username and not username.startswith("#"):
+            yield username
+
+
+async def _run_cli(args):
+    source = sys.stdin if args.usernames == "-" else open(args.usernames, "r", encoding="utf-8")
+    if args.workers:
+        start_pool(args.workers)
+    try:
+        with open(args.output, "w", encoding="utf-8") as out:
+            return await write_jsonl(
+                read_usernames(source), args.api_key, out,
+                profile=args.profile, concurrency=args.concurrency,
+            )
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        shutdown_pool()
+        await close_session()
+
+
+def cli(argv=None):
+    parser = argparse.ArgumentParser(description="Compute MapleWeight for a list of usernames and write the results as JSONL.")
+    parser.add_argument("usernames", help="file with one username per line, or - for stdin")
+    parser.add_argument("-o", "--output", default="leaderboard.jsonl", help="JSONL output path (default: leaderboard.jsonl)")
+    parser.add_argument("-k", "--api-key", default=os.environ.get("HYPIXEL_API_KEY"), help="Hypixel API key (default: $HYPIXEL_API_KEY)")
+    parser.add_argument("-c", "--concurrency", type=int, default=DEFAULT_CONCURRENCY, help=f"lookups in flight at once (default: {DEFAULT_CONCURRENCY})")
+    parser.add_argument("-p", "--profile", default=None, help="profile name to score instead of the selected one")
+    parser.add_argument("-w", "--workers", type=int, default=0, help="score profiles in this many worker processes (default: 0, score on the main process)")
+    args = parser.parse_args(argv)
+
+    if not args.api_key:
+        parser.error("an API key is required (--api-key or $HYPIXEL_API_KEY)")
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+    if args.workers < 0:
+        parser.error("--workers can't be negative")
+
+    succeeded, failed = asyncio.run(_run_cli(args))
+    print(f"Leaderboard done: {succeeded} scored, {failed} failed → {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    cli()
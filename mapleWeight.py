@@ -1,20 +1,57 @@
 import json
+import time
+import asyncio
 from .get_data import *
+from .single_flight import SingleFlight
+from .items import ItemIndex
+from .pet_index import PetIndex
+from .worker_pool import get_pool, run_in_pool
+from .dump_sink import get_dump_sink
+from .result import WeightResult, render
+from .incremental import CATEGORY_INPUTS, ITEM_INPUTS, PET_INPUTS, category_fingerprints, get_snapshot, save_snapshot
+from .timing import NULL_TIMINGS, Timings, emit, new_timings
+from .metrics import CATEGORY_SECONDS, ITEMS_PROCESSED
+from .result_cache import get_result, put_result
 from .individual_weights.weapons import weapon_weight
 from .individual_weights.pets import pet_weight
 from .individual_weights.slayers import slayer_weight
 from .individual_weights.farming import farming_weight
 from .individual_weights.dungeons import dungeon_weight
 from .individual_weights.generic_skills import generic_skill_weight
-from .individual_weights.mw_utils.MP_Calc import load_accessory_groups
 from .individual_weights.foraging import foraging_weight
 from .individual_weights.diana import diana_weight
 from .individual_weights.fishing import fishing_weight
 from .individual_weights.mining import mining_weight
 
-async def main(username, api_key, *, profile: str = None, infodump: bool = False):
-    uuid = await get_uuid(username)
-    profiles = await get_skyblock_profiles(api_key, username)
+_weight_flights = SingleFlight()
+
+async def main(username, api_key, *, profile: str = None, infodump: bool = False, quiet: bool = False):
+    # Returns a WeightResult (see result.py), which also unpacks as (weight, ld_breakdown).
+    # quiet=True skips printing the breakdown; pass the result to result.render() later if you want it after all.
+    # Repeat lookups of a player whose cached profile data hasn't changed are answered from the result cache
+    result = None if infodump else get_result(username, profile, profiles_fingerprint(username))
+    if result is None:
+        # Identical concurrent lookups (same player, same profile) share one computation and get the same result back
+        key = (username.lower(), (profile or "").lower(), infodump)
+        result = await _weight_flights.do(key, _compute_weight, username, api_key, profile=profile, infodump=infodump)
+    if not quiet:
+        render(result)
+    return result
+
+async def _compute_weight(username, api_key, *, profile: str = None, infodump: bool = False):
+    profile_name = profile
+    timings = new_timings()  # no-op unless timing is enabled (see timing.py)
+    # Fetch phase: UUID -> profiles -> (museum, garden). Each request is made once and the result passed along.
+    with timings.span("mojang"):
+        uuid = await get_uuid(username)
+    if not uuid:
+        # Checked here so get_skyblock_profiles doesn't go back to Mojang for the same name
+        raise NotFoundError(f"Unable to resolve UUID for username '{username}'")
+    with timings.span("profiles"):
+        payload = await get_skyblock_profiles_payload(api_key, username, uuid=uuid)
+    profiles = payload.load()
+    # The result is cached against the payload actually scored, not whatever the cache holds once scoring is done
+    fingerprint = payload.digest()
 
     if profile:
         # lowercase match for user-supplied profile name
@@ -24,110 +61,135 @@ async def main(username, api_key, *, profile: str = None, infodump: bool = False
             # Collect all available profile names for error message
             available = [p.get("cute_name") or "[Unnamed]" for p in profiles if "cute_name" in p]
 
-            raise ValueError(
+            raise NotFoundError(
                 f"No profile found with name '{profile}'. "
                 f"Available profiles: {', '.join(available) if available else '[none found]'}"
             )
 
         profile = matching[0]
     else:
-        profile = [p for p in profiles if p.get("selected")][0]
+        selected = [p for p in profiles if p.get("selected")]
+        if not selected:
+            # Hypixel sends "profiles": null for players who never joined SkyBlock
+            raise NotFoundError(f"'{username}' has no SkyBlock profiles")
+        profile = selected[0]
     profile_id = profile.get("profile_id")
-    museum_data = await get_museum_data(api_key, profile_id)
-    garden_data = await get_garden_data(api_key, profile_id)
-    all_items = extract_all_items(profile, uuid, museum_data=museum_data)
+    # Museum and garden only depend on profile_id, so fetch them at the same time
+    museum_data, garden_data = await asyncio.gather(
+        timings.timed("museum", get_museum_data(api_key, profile_id)),
+        timings.timed("garden", get_garden_data(api_key, profile_id)),
+    )
 
     if infodump:
         with open("profile_dump_full.json", "w") as f:
             json.dump(to_json_safe(profile), f, indent=2)
 
-    all_pets = extract_pets(profile, uuid)
-
-    weight = 0
-
-    # Weapons
-    await load_accessory_groups()
-    ld_breakdown = []
-    weapons, weapon_desc = weapon_weight(all_items, profile, uuid)
-    weight += weapons
-    print(f"↳ Weapons: {weapons}")
-    ld_breakdown.append(f"↳ Weapons: {weapons}")
-    print(f"  Weapon Score Breakdown: {weapon_desc}")
-
-    # Pets
-    pets, pets_desc = pet_weight(all_pets, profile, uuid)
-    weight += pets
-    print(f"↳ Pets: {pets}")
-    ld_breakdown.append(f"↳ Pets: {pets}")
-    print(f"  Pet Score Breakdown: {pets_desc}")
-
-    # Slayers
-    slayers, slayer_desc, crimson_armor = slayer_weight(profile, uuid, all_pets, all_items)
-    weight += slayers
-    print(f"↳ Slayers: {slayers}")
-    ld_breakdown.append(f"↳ Slayers: {slayers}")
-    print(f"  Slayer Score Breakdown: {slayer_desc}")
-    if crimson_armor:
-        print(f"  Crimson Score Breakdown: {crimson_armor}")
-
-    # Farming
-    farming, farming_desc = farming_weight(profile, uuid, all_pets, all_items, garden_data)
-    weight += farming
-    print(f"↳ Farming: {farming}")
-    ld_breakdown.append(f"↳ Farming: {farming}")
-    print(f"  Farming Score Breakdown: {farming_desc}")
-
-    # Generic Skills
-    generic_skills, generic_skills_desc = generic_skill_weight(profile, uuid)
-    weight += generic_skills
-    print(f"↳ Generic Skills (Alchemy, Carpentry, Enchanting, Taming): {generic_skills}")
-    ld_breakdown.append(f"↳ Generic Skills (Alchemy, Carpentry, Enchanting, Taming): {generic_skills}")
-    print(f"  Generic Skill Score Breakdown: {generic_skills_desc}")
-
-    # Dungeons
-    dungeons, dungeon_desc = dungeon_weight(profile, uuid, all_pets, all_items)
-    weight += dungeons
-    print(f"↳ Dungeon Weight: {dungeons}")
-    ld_breakdown.append(f"↳ Dungeon Weight: {dungeons}")
-    print(f"  Dungeon Score Breakdown: {dungeon_desc}")
-
-    # Foraging
-    foraging, foraging_desc = foraging_weight(profile, uuid, all_items)
-    weight += foraging
-    print(f"↳ Foraging Weight: {foraging}")
-    ld_breakdown.append(f"↳ Foraging Weight: {foraging}")
-    print(f"  Foraging Score Breakdown: {foraging_desc}")
-
-    # Diana Event
-    diana, diana_desc = diana_weight(profile, uuid, all_items)
-    weight += diana
-    print(f"↳ Diana Weight: {diana}")
-    ld_breakdown.append(f"↳ Diana Weight: {diana}")
-    print(f"  Diana Score Breakdown: {diana_desc}")
-
-    # Fishing
-    fishing, fishing_desc = fishing_weight(profile, uuid, all_pets, all_items)
-    weight += fishing
-    print(f"↳ Fishing Weight: {fishing}")
-    ld_breakdown.append(f"↳ Fishing Weight: {fishing}")
-    print(f"  Fishing Score Breakdown: {fishing_desc}")
-
-    # Mining
-    mining, mining_desc = mining_weight(profile, uuid, all_items, all_pets)
-    weight += mining
-    print(f"↳ Mining Weight: {mining}")
-    ld_breakdown.append(f"↳ Mining Weight: {mining}")
-    print(f"  Mining Score Breakdown: {mining_desc}")
-
-    # Total
-    print(f"{username}'s MapleWeight{str(' (' + profile.get('cute_name', '') + ')') if profile.get('cute_name', '') != '' else ''}: {weight}")
-    print(uuid)
-
-    # Infodump
-    '''
-    if infodump:
-        with open("pet_dump2.txt", "w") as f:
-            json.dump(to_json_safe(all_pets), f, indent=2)
-    '''
-
-    return weight, ld_breakdown
+    # Diagnostic item dump, only when enabled. Decoding again here is cheap: the NBT blobs are cached by content.
+    dump_sink = get_dump_sink()
+    if dump_sink is not None:
+        items = extract_all_items(profile, uuid, museum_data=museum_data)
+        await dump_sink.write({"username": username, "uuid": uuid, "profile_id": profile_id, "items": items})
+
+    # Only categories whose inputs changed since the last lookup of this profile get rescored (see incremental.py)
+    previous = get_snapshot(uuid, profile_id)
+
+    # Decode + scoring is CPU-bound; hand it to the worker pool if one is running (see worker_pool.py)
+    score_start = timings.now()
+    with timings.span("score"):
+        if get_pool() is not None:
+            result = await run_in_pool(score_profile, username, profile, uuid, museum_data, garden_data, previous, bool(timings))
+        else:
+            result = score_profile(username, profile, uuid, museum_data, garden_data, previous, bool(timings))
+
+    if timings:
+        # Scoring may have run in another process, so its spans are placed relative to when scoring started here
+        timings.merge(result.timings, offset=score_start)
+        result.timings = timings
+        emit(username, result)
+
+    save_snapshot(result)
+    put_result(username, profile_name, result, fingerprint)
+    return result
+
+class ProfileInputs:
+    """Items and pets for one profile, decoded on first use so fully reused snapshots never decode anything."""
+
+    def __init__(self, profile, uuid, museum_data, garden_data):
+        self.profile = profile
+        self.uuid = uuid
+        self.museum_data = museum_data
+        self.garden_data = garden_data
+        self._items = None
+        self._pets = None
+
+    @property
+    def items(self):
+        # Items are indexed once; every scorer queries the index instead of rescanning the item list
+        if self._items is None:
+            self._items = ItemIndex(extract_all_items(self.profile, self.uuid, museum_data=self.museum_data))
+            ITEMS_PROCESSED.inc(len(self._items))
+        return self._items
+
+    @property
+    def pets(self):
+        if self._pets is None:
+            self._pets = PetIndex(extract_pets(self.profile, self.uuid))
+        return self._pets
+
+
+def _score_slayers(p):
+    slayers, slayer_desc, crimson_armor = slayer_weight(p.profile, p.uuid, p.pets, p.items)
+    return slayers, slayer_desc, {"crimson_armor": crimson_armor}
+
+# category -> scorer returning (total, breakdown, details), in scoring order.
+# What each category reads is declared in incremental.CATEGORY_INPUTS.
+CATEGORY_SCORERS = {
+    "weapons": lambda p: (*weapon_weight(p.items, p.profile, p.uuid), {}),
+    "pets": lambda p: (*pet_weight(p.pets, p.profile, p.uuid), {}),
+    "slayers": _score_slayers,
+    "farming": lambda p: (*farming_weight(p.profile, p.uuid, p.pets, p.items, p.garden_data), {}),
+    "generic_skills": lambda p: (*generic_skill_weight(p.profile, p.uuid), {}),
+    "dungeons": lambda p: (*dungeon_weight(p.profile, p.uuid, p.pets, p.items), {}),
+    "foraging": lambda p: (*foraging_weight(p.profile, p.uuid, p.items), {}),
+    "diana": lambda p: (*diana_weight(p.profile, p.uuid, p.items), {}),
+    "fishing": lambda p: (*fishing_weight(p.profile, p.uuid, p.pets, p.items), {}),
+    "mining": lambda p: (*mining_weight(p.profile, p.uuid, p.items, p.pets), {}),
+}
+
+def score_profile(username, profile, uuid, museum_data, garden_data, previous=None, timed=False):
+    # Synchronous from here on, so this can run on the event loop or in a worker process.
+    # With a previous result for the same profile, categories whose inputs haven't changed are carried over.
+    # timed=True records a span per stage on result.timings.
+    timings = Timings() if timed else NULL_TIMINGS
+    inputs = ProfileInputs(profile, uuid, museum_data, garden_data)
+    with timings.span("fingerprint"):
+        fingerprints = category_fingerprints(profile, uuid, museum_data, garden_data)
+
+    stale = [
+        name for name in CATEGORY_SCORERS
+        if previous is None or name not in previous.categories
+        or previous.categories[name].fingerprint != fingerprints[name]
+    ]
+    # Decode up front (if anything needs it) so the category spans below only cover the scorers themselves
+    if any(ITEM_INPUTS[0] in CATEGORY_INPUTS[name] for name in stale):
+        with timings.span("decode_items"):
+            inputs.items
+    if any(PET_INPUTS[0] in CATEGORY_INPUTS[name] for name in stale):
+        with timings.span("decode_pets"):
+            inputs.pets
+
+    result = WeightResult(username, uuid, profile_id=profile.get("profile_id"), profile_name=profile.get("cute_name", ""))
+    for name, scorer in CATEGORY_SCORERS.items():
+        if name not in stale:
+            result.categories[name] = previous.categories[name]
+            continue
+        start = time.perf_counter()
+        with timings.span(f"category:{name}"):
+            total, breakdown, details = scorer(inputs)
+        CATEGORY_SECONDS.observe(time.perf_counter() - start, category=name)
+        result.add(name, total, breakdown, **details).fingerprint = fingerprints[name]
+
+    result.metadata["reused_categories"] = [name for name in CATEGORY_SCORERS if name not in stale]
+    if timed:
+        result.timings = timings
+    return result
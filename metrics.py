@@ -0,0 +1,187 @@
+import math
+
+# In-process metrics: counters and histograms with labels, exportable in the Prometheus text format.
+# Everything that's measured is declared at the bottom of this file, so there's one place to look.
+# Worker processes keep their own registry; worker_pool ships each job's changes back and merges them here.
+#   text = metrics.render_prometheus()   (or GET /metrics on server.py)
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name, help, labelnames=()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values = {}  # label values tuple -> float
+        _registry.append(self)
+
+    def _key(self, labels):
+        return tuple(str(labels[label]) for label in self.labelnames)
+
+    def inc(self, amount=1, **labels):
+        if amount:
+            key = self._key(labels)
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        return self._values.get(self._key(labels), 0)
+
+    def _samples(self):
+        for key, value in self._values.items():
+            yield self.name, dict(zip(self.labelnames, key)), value
+
+    def _dump(self):
+        return dict(self._values)
+
+    def _merge(self, delta):
+        for key, value in delta.items():
+            self._values[key] = self._values.get(key, 0) + value
+
+    def _clear(self):
+        self._values.clear()
+
+    def _diff(self, before):
+        return {key: value - before.get(key, 0) for key, value in self._values.items() if value != before.get(key, 0)}
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name, help, labelnames=(), buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        self._series = {}  # label values tuple -> [per-bucket counts..., sum, count]
+        _registry.append(self)
+
+    def _key(self, labels):
+        return tuple(str(labels[label]) for label in self.labelnames)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = [0] * (len(self.buckets) + 2)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                series[i] += 1
+                break
+        series[-2] += value
+        series[-1] += 1
+
+    def count(self, **labels):
+        series = self._series.get(self._key(labels))
+        return series[-1] if series else 0
+
+    def _samples(self):
+        for key, series in self._series.items():
+            labels = dict(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                yield f"{self.name}_bucket", {**labels, "le": "+Inf" if bound == math.inf else repr(float(bound))}, cumulative
+            yield f"{self.name}_sum", labels, series[-2]
+            yield f"{self.name}_count", labels, series[-1]
+
+    def _dump(self):
+        return {key: list(series) for key, series in self._series.items()}
+
+    def _merge(self, delta):
+        for key, values in delta.items():
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0] * len(values)
+            for i, value in enumerate(values):
+                series[i] += value
+
+    def _clear(self):
+        self._series.clear()
+
+    def _diff(self, before):
+        delta = {}
+        for key, series in self._series.items():
+            old = before.get(key)
+            if old != series:
+                delta[key] = [a - b for a, b in zip(series, old or [0] * len(series))]
+        return delta
+
+
+_registry = []
+
+
+def snapshot():
+    """Current values of every metric, for diff() later."""
+    return {metric.name: metric._dump() for metric in _registry}
+
+
+def diff(before):
+    """What changed since snapshot() returned `before`; can be applied elsewhere with merge()."""
+    delta = {}
+    for metric in _registry:
+        changes = metric._diff(before.get(metric.name, {}))
+        if changes:
+            delta[metric.name] = changes
+    return delta
+
+
+def merge(delta):
+    by_name = {metric.name: metric for metric in _registry}
+    for name, changes in delta.items():
+        metric = by_name.get(name)
+        if metric is not None:
+            metric._merge(changes)
+
+
+def reset():
+    for metric in _registry:
+        metric._clear()
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def _format_value(value):
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+def render_prometheus():
+    """Every metric in the Prometheus text exposition format (version 0.0.4)."""
+    lines = []
+    for metric in _registry:
+        lines.append(f"# HELP {metric.name} {metric.help}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        for name, labels, value in metric._samples():
+            lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
+
+
+# What's measured
+
+CACHE_HITS = Counter("mapleweight_cache_hits_total", "Cache lookups answered from the cache.", ("cache",))
+CACHE_MISSES = Counter("mapleweight_cache_misses_total", "Cache lookups that had to fall through.", ("cache",))
+CACHE_EVICTIONS = Counter("mapleweight_cache_evictions_total", "Entries dropped from a cache (size limit or expiry).", ("cache",))
+
+HTTP_LATENCY = Histogram(
+    "mapleweight_http_request_seconds", "Latency of each API request attempt.", ("endpoint", "status"),
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10, 15),
+)
+
+NBT_BYTES_DECODED = Counter("mapleweight_nbt_decoded_bytes_total", "Decompressed NBT bytes parsed (cache misses only).")
+NBT_BLOBS_DECODED = Counter("mapleweight_nbt_decoded_blobs_total", "NBT blobs parsed (cache misses only).")
+ITEMS_PROCESSED = Counter("mapleweight_items_processed_total", "Items indexed for scoring.")
+
+CATEGORY_SECONDS = Histogram(
+    "mapleweight_category_seconds", "Time spent scoring one category for one profile.", ("category",),
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25),
+)
@@ -0,0 +1,207 @@
+import struct
+
+# Minimal streaming NBT reader for Hypixel item blobs.
+# nbtlib builds a full tag tree for every item, every lore line and every nested compound, but the scorers
+# only ever look at Count, tag.ExtraAttributes and tag.display.Name/Lore. This reader walks the binary buffer
+# with a memoryview and only materialises whitelisted paths into plain dicts / lists / ints / strs.
+# Everything else is skipped by advancing the offset, without building any objects for it.
+#
+# A whitelist ("spec") is either:
+#   FULL           -> materialise the whole subtree
+#   {name: spec}   -> for a compound, keep only the named children (each filtered by its own spec)
+# A compound spec applied to a list is applied to every element of the list.
+
+FULL = True
+
+ITEM_SPEC = {
+    b"Count": FULL,
+    b"tag": {
+        b"ExtraAttributes": FULL,
+        b"display": {
+            b"Name": FULL,
+            b"Lore": FULL,
+        },
+    },
+}
+ROOT_SPEC = {b"i": ITEM_SPEC}
+
+TAG_END = 0
+TAG_BYTE = 1
+TAG_SHORT = 2
+TAG_INT = 3
+TAG_LONG = 4
+TAG_FLOAT = 5
+TAG_DOUBLE = 6
+TAG_BYTE_ARRAY = 7
+TAG_STRING = 8
+TAG_LIST = 9
+TAG_COMPOUND = 10
+TAG_INT_ARRAY = 11
+TAG_LONG_ARRAY = 12
+
+# tag type -> (struct format char, size in bytes) for fixed-size numerics
+_NUMERIC = {
+    TAG_BYTE: ("b", 1),
+    TAG_SHORT: ("h", 2),
+    TAG_INT: ("i", 4),
+    TAG_LONG: ("q", 8),
+    TAG_FLOAT: ("f", 4),
+    TAG_DOUBLE: ("d", 8),
+}
+_NUMERIC_UNPACK = {tag: struct.Struct(">" + fmt).unpack_from for tag, (fmt, _) in _NUMERIC.items()}
+_ARRAY_ELEMENT = {
+    TAG_INT_ARRAY: ("i", 4),
+    TAG_LONG_ARRAY: ("q", 8),
+}
+
+_unpack_ushort = struct.Struct(">H").unpack_from
+_unpack_int = struct.Struct(">i").unpack_from
+
+
+class NBTError(ValueError):
+    pass
+
+
+class _Reader:
+    __slots__ = ("buf", "pos")
+
+    def __init__(self, data):
+        self.buf = memoryview(data)
+        self.pos = 0
+
+    def _need(self, n):
+        if self.pos + n > len(self.buf):
+            raise NBTError(f"Unexpected end of NBT data at offset {self.pos}")
+
+    def tag_type(self):
+        self._need(1)
+        value = self.buf[self.pos]
+        self.pos += 1
+        return value
+
+    def length(self):
+        self._need(4)
+        (value,) = _unpack_int(self.buf, self.pos)
+        self.pos += 4
+        return max(value, 0)
+
+    def name(self):
+        """Returns a tag name (or string payload) as a memoryview over the buffer, without decoding it."""
+        self._need(2)
+        (size,) = _unpack_ushort(self.buf, self.pos)
+        start = self.pos + 2
+        self.pos = start + size
+        self._need(0)
+        return self.buf[start:self.pos]
+
+    def string(self):
+        return bytes(self.name()).decode("utf-8", "replace")
+
+    # -- skipping ------------------------------------------------------------------------------
+
+    def skip(self, tag_type):
+        numeric = _NUMERIC.get(tag_type)
+        if numeric is not None:
+            self.pos += numeric[1]
+        elif tag_type == TAG_STRING:
+            self._need(2)
+            (size,) = _unpack_ushort(self.buf, self.pos)
+            self.pos += 2 + size
+        elif tag_type == TAG_COMPOUND:
+            while True:
+                child_type = self.tag_type()
+                if child_type == TAG_END:
+                    break
+                self.name()
+                self.skip(child_type)
+        elif tag_type == TAG_LIST:
+            element_type = self.tag_type()
+            count = self.length()
+            numeric = _NUMERIC.get(element_type)
+            if numeric is not None:
+                self.pos += count * numeric[1]
+            else:
+                for _ in range(count):
+                    self.skip(element_type)
+        elif tag_type == TAG_BYTE_ARRAY:
+            self.pos += self.length()
+        elif tag_type in _ARRAY_ELEMENT:
+            self.pos += self.length() * _ARRAY_ELEMENT[tag_type][1]
+        elif tag_type != TAG_END:
+            raise NBTError(f"Unknown NBT tag type {tag_type} at offset {self.pos}")
+        self._need(0)
+
+    # -- reading -------------------------------------------------------------------------------
+
+    def read(self, tag_type, spec):
+        numeric = _NUMERIC.get(tag_type)
+        if numeric is not None:
+            size = numeric[1]
+            self._need(size)
+            (value,) = _NUMERIC_UNPACK[tag_type](self.buf, self.pos)
+            self.pos += size
+            return value
+        if tag_type == TAG_STRING:
+            return self.string()
+        if tag_type == TAG_COMPOUND:
+            return self.compound(spec)
+        if tag_type == TAG_LIST:
+            return self.list(spec)
+        if tag_type == TAG_BYTE_ARRAY:
+            size = self.length()
+            self._need(size)
+            value = bytes(self.buf[self.pos:self.pos + size])
+            self.pos += size
+            return value
+        if tag_type in _ARRAY_ELEMENT:
+            fmt, size = _ARRAY_ELEMENT[tag_type]
+            count = self.length()
+            self._need(count * size)
+            value = list(struct.unpack_from(f">{count}{fmt}", self.buf, self.pos))
+            self.pos += count * size
+            return value
+        raise NBTError(f"Unknown NBT tag type {tag_type} at offset {self.pos}")
+
+    def compound(self, spec):
+        result = {}
+        while True:
+            child_type = self.tag_type()
+            if child_type == TAG_END:
+                return result
+            name = bytes(self.name())
+
+            child_spec = FULL if spec is FULL else spec.get(name)
+            if child_spec is None:
+                self.skip(child_type)
+            else:
+                result[name.decode("utf-8", "replace")] = self.read(child_type, child_spec)
+
+    def list(self, spec):
+        element_type = self.tag_type()
+        count = self.length()
+
+        numeric = _NUMERIC.get(element_type)
+        if numeric is not None:
+            fmt, size = numeric
+            self._need(count * size)
+            values = list(struct.unpack_from(f">{count}{fmt}", self.buf, self.pos))
+            self.pos += count * size
+            return values
+
+        return [self.read(element_type, spec) for _ in range(count)]
+
+
+def read_nbt(data, spec=FULL):
+    """Parses an uncompressed NBT document and returns its root compound filtered by `spec`."""
+    reader = _Reader(data)
+    root_type = reader.tag_type()
+    if root_type != TAG_COMPOUND:
+        raise NBTError(f"Expected a compound at the NBT root, found tag type {root_type}")
+    reader.name()
+    return reader.compound(spec)
+
+
+def read_items(data):
+    """Returns the item list ('i') of a Hypixel inventory blob, keeping only the fields the scorers use."""
+    root = read_nbt(data, ROOT_SPEC)
+    return root.get("i", [])
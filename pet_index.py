@@ -0,0 +1,164 @@
+from bisect import bisect_right
+from itertools import accumulate
+
+# Pets grouped by type once per profile, with levels looked up from the shared pet exp table.
+# Scorers used to rescan the raw pets list for every check and compare exp against inline constants
+# (25353230 = level 100 at legendary, etc.).
+
+# Exp needed for each level-up (1 -> 2, 2 -> 3, ...). A pet's rarity decides where in this table it starts.
+PET_LEVEL_EXP = [
+    100, 110, 120, 130, 145, 160, 175, 190, 210, 230, 250, 275, 300, 330, 360, 400, 440, 490, 540, 600,
+    660, 730, 800, 880, 960, 1050, 1150, 1260, 1380, 1510, 1650, 1800, 1960, 2130, 2310, 2500, 2700, 2920,
+    3160, 3420, 3700, 4000, 4350, 4750, 5200, 5700, 6300, 7000, 7800, 8700, 9700, 10800, 12000, 13300,
+    14700, 16200, 17800, 19500, 21300, 23200, 25200, 27400, 29800, 32400, 35200, 38200, 41400, 44800,
+    48400, 52200, 56200, 60400, 64800, 69400, 74200, 79200, 84700, 90700, 97200, 104200, 111700, 119700,
+    128200, 137200, 146700, 156700, 167700, 179700, 192700, 206700, 221700, 237700, 254700, 272700,
+    291700, 311700, 333700, 357700, 383700, 411700, 441700, 476700, 516700, 561700, 611700, 666700,
+    726700, 791700, 861700, 936700, 1016700, 1101700, 1191700, 1286700, 1386700, 1496700, 1616700,
+    1746700, 1886700,
+]
+RARITY_OFFSET = {
+    "COMMON": 0,
+    "UNCOMMON": 6,
+    "RARE": 11,
+    "EPIC": 16,
+    "LEGENDARY": 20,
+    "MYTHIC": 20,
+}
+TIER_RANK = {
+    "COMMON": 1,
+    "UNCOMMON": 2,
+    "RARE": 3,
+    "EPIC": 4,
+    "LEGENDARY": 5,
+    "MYTHIC": 6,
+}
+MAX_LEVEL = 100
+
+# Golden Dragons go past 100: level 101 comes free, 5,555 more exp for 102, then 1,886,700 per level up to 200
+GOLDEN_DRAGON_EXTRA_LEVELS = [0, 5555] + [1886700] * 98
+
+# Types that count as one pet family (e.g. for "best pet per type")
+TYPE_FAMILIES = {
+    "DROPLET_WISP": "WISP",
+    "FROST_WISP": "WISP",
+    "GLACIAL_WISP": "WISP",
+    "SUBZERO_WISP": "WISP",
+}
+
+
+def _thresholds(tier, pet_type=None):
+    offset = RARITY_OFFSET.get(tier, 0)
+    steps = PET_LEVEL_EXP[offset:offset + MAX_LEVEL - 1]
+    if pet_type == "GOLDEN_DRAGON":
+        steps = steps + GOLDEN_DRAGON_EXTRA_LEVELS
+    # thresholds[n] = total exp needed to reach level n + 1
+    return [0] + list(accumulate(steps))
+
+
+_LEVEL_THRESHOLDS = {tier: _thresholds(tier) for tier in RARITY_OFFSET}
+_LEVEL_THRESHOLDS_GDRAG = {tier: _thresholds(tier, "GOLDEN_DRAGON") for tier in RARITY_OFFSET}
+
+
+def _thresholds_for(tier, pet_type):
+    table = _LEVEL_THRESHOLDS_GDRAG if pet_type == "GOLDEN_DRAGON" else _LEVEL_THRESHOLDS
+    return table.get(tier) or table["COMMON"]
+
+
+def pet_level(exp, tier, pet_type=None):
+    return bisect_right(_thresholds_for(tier, pet_type), exp)
+
+
+def exp_for_level(level, tier, pet_type=None):
+    """Total exp a pet of this tier needs to reach `level`."""
+    return _thresholds_for(tier, pet_type)[level - 1]
+
+
+# Exp for a legendary/mythic pet to hit level 100, which most scorers use as "maxed"
+MAX_LEVEL_EXP = exp_for_level(MAX_LEVEL, "LEGENDARY")
+
+
+def normalise_type(pet_type):
+    return TYPE_FAMILIES.get(pet_type, pet_type)
+
+
+class Pet:
+    __slots__ = ("type", "tier", "exp", "held_item", "level")
+
+    def __init__(self, type=None, tier=None, exp=0, held_item=None):
+        self.type = type
+        self.tier = tier
+        self.exp = exp
+        self.held_item = held_item
+        self.level = pet_level(exp, tier, type)
+
+    @classmethod
+    def from_api(cls, pet):
+        return cls(
+            type=pet.get("type"),
+            tier=pet.get("tier"),
+            exp=pet.get("exp", 0),
+            held_item=pet.get("heldItem"),
+        )
+
+    @property
+    def tier_rank(self):
+        return TIER_RANK.get(self.tier, 0)
+
+    @property
+    def progress(self):
+        """Fraction of the way to MAX_LEVEL_EXP, clamped to [0, 1]."""
+        return min(max(self.exp, 0), MAX_LEVEL_EXP) / MAX_LEVEL_EXP
+
+    def to_dict(self):
+        return {"type": self.type, "tier": self.tier, "exp": self.exp, "heldItem": self.held_item}
+
+    def __repr__(self):
+        return f"Pet({self.type} {self.tier} lvl {self.level})"
+
+
+class PetIndex:
+    """
+    A profile's pets grouped by type, built once. Lookups return pets in their original order.
+    """
+
+    def __init__(self, pets):
+        self.pets = [pet if isinstance(pet, Pet) else Pet.from_api(pet) for pet in pets]
+        self._positions = {}  # type -> positions in self.pets
+        self._best_by_type = {}
+        self._best_by_family = {}
+        for position, pet in enumerate(self.pets):
+            self._positions.setdefault(pet.type, []).append(position)
+            # Highest tier wins, first seen wins ties
+            for best, key in ((self._best_by_type, pet.type), (self._best_by_family, normalise_type(pet.type))):
+                current = best.get(key)
+                if current is None or pet.tier_rank > current.tier_rank:
+                    best[key] = pet
+
+    def __iter__(self):
+        return iter(self.pets)
+
+    def __len__(self):
+        return len(self.pets)
+
+    def by_type(self, pet_type):
+        return [self.pets[p] for p in self._positions.get(pet_type, ())]
+
+    def by_types(self, pet_types):
+        positions = []
+        for pet_type in pet_types:
+            positions.extend(self._positions.get(pet_type, ()))
+        positions.sort()
+        return [self.pets[p] for p in positions]
+
+    def best(self, pet_type):
+        """Highest-tier pet of an exact type, or None."""
+        return self._best_by_type.get(pet_type)
+
+    def best_by_family(self):
+        """Highest-tier pet per normalised type (wisps count as one type)."""
+        return self._best_by_family
+
+
+def as_pet_index(pets):
+    return pets if isinstance(pets, PetIndex) else PetIndex(pets)
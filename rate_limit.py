@@ -0,0 +1,108 @@
+import asyncio
+import random
+import time
+
+# Client-side pacing for the Hypixel API key quota.
+# Hypixel tells us where we stand on every response through the RateLimit-Limit / RateLimit-Remaining /
+# RateLimit-Reset headers. We keep a token bucket per key that refills at limit/period and is corrected
+# from those headers, so batch jobs run right up to the quota without tripping 429s.
+
+DEFAULT_LIMIT = 300    # requests per window (Hypixel's default key limit)
+DEFAULT_PERIOD = 300   # window length in seconds
+
+MAX_RETRIES = 4
+BACKOFF_BASE = 0.5     # seconds, doubled every attempt
+BACKOFF_MAX = 30
+
+
+class TokenBucket:
+    def __init__(self, limit=DEFAULT_LIMIT, period=DEFAULT_PERIOD):
+        self.limit = limit
+        self.period = period
+        self.tokens = float(limit)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+
+    @property
+    def rate(self):
+        return self.limit / self.period
+
+    def _refill(self, now):
+        self.tokens = min(self.limit, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self):
+        """Waits until a request may be sent and takes a token for it."""
+        while True:
+            now = time.monotonic()
+            self._refill(now)
+
+            if now < self.blocked_until:
+                await asyncio.sleep(self.blocked_until - now)
+                continue
+
+            # No await between the check and the decrement, so this is safe across tasks on one loop
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def update_from_headers(self, headers):
+        """Syncs the bucket with what the server says is left of the quota."""
+        limit = _header_number(headers, "RateLimit-Limit")
+        remaining = _header_number(headers, "RateLimit-Remaining")
+        reset = _header_number(headers, "RateLimit-Reset")
+
+        if limit:
+            self.limit = limit
+
+        if remaining is None:
+            return
+
+        now = time.monotonic()
+        self._refill(now)
+        # The server is authoritative (other processes may be spending the same key)
+        self.tokens = min(self.tokens, remaining)
+
+        if remaining <= 0 and reset is not None:
+            self.blocked_until = max(self.blocked_until, now + reset)
+
+
+def _header_number(headers, name):
+    value = headers.get(name)
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+_buckets = {}  # api_key -> TokenBucket
+
+
+def get_limiter(api_key):
+    """Returns the bucket for an API key. Every request made with the same key shares it."""
+    bucket = _buckets.get(api_key)
+    if bucket is None:
+        bucket = _buckets[api_key] = TokenBucket()
+    return bucket
+
+
+def retry_delay(attempt, headers=None):
+    """Jittered exponential backoff, never shorter than what Retry-After / RateLimit-Reset asks for."""
+    delay = random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+
+    if headers is not None:
+        server_wait = _header_number(headers, "Retry-After")
+        if server_wait is None:
+            server_wait = _header_number(headers, "RateLimit-Reset")
+        if server_wait is not None:
+            delay += min(server_wait, BACKOFF_MAX * 10)
+
+    return delay
+
+
+def should_retry(status):
+    return status == 429 or status >= 500
@@ -0,0 +1,116 @@
+import sys
+import time
+
+# Structured MapleWeight results.
+# Scoring fills in a WeightResult without printing or formatting anything; render() produces the classic console
+# output from it when someone actually wants to read it. A WeightResult still behaves like the old
+# (weight, ld_breakdown) tuple, so existing `weight, ld_breakdown = await main(...)` callers keep working.
+
+# category key -> (label, breakdown label), in scoring order
+CATEGORY_LABELS = {
+    "weapons": ("Weapons", "Weapon Score Breakdown"),
+    "pets": ("Pets", "Pet Score Breakdown"),
+    "slayers": ("Slayers", "Slayer Score Breakdown"),
+    "farming": ("Farming", "Farming Score Breakdown"),
+    "generic_skills": ("Generic Skills (Alchemy, Carpentry, Enchanting, Taming)", "Generic Skill Score Breakdown"),
+    "dungeons": ("Dungeon Weight", "Dungeon Score Breakdown"),
+    "foraging": ("Foraging Weight", "Foraging Score Breakdown"),
+    "diana": ("Diana Weight", "Diana Score Breakdown"),
+    "fishing": ("Fishing Weight", "Fishing Score Breakdown"),
+    "mining": ("Mining Weight", "Mining Score Breakdown"),
+}
+DETAIL_LABELS = {
+    "crimson_armor": "Crimson Score Breakdown",
+}
+
+
+class CategoryResult:
+    __slots__ = ("name", "total", "breakdown", "details", "fingerprint")
+
+    def __init__(self, name, total, breakdown, details=None, fingerprint=None):
+        self.name = name
+        self.total = total
+        self.breakdown = breakdown  # whatever the scorer returned: a string or (nested) lists
+        self.details = details or {}
+        self.fingerprint = fingerprint  # hash of the inputs this was scored from (see incremental.py)
+
+    @property
+    def label(self):
+        return CATEGORY_LABELS.get(self.name, (self.name, None))[0]
+
+    def to_dict(self):
+        return {"name": self.name, "total": self.total, "breakdown": self.breakdown, "details": self.details}
+
+    def __repr__(self):
+        return f"CategoryResult({self.name}={self.total})"
+
+
+class WeightResult:
+    __slots__ = ("username", "uuid", "profile_id", "profile_name", "categories", "metadata", "timings")
+
+    def __init__(self, username, uuid, profile_id=None, profile_name="", metadata=None):
+        self.username = username
+        self.uuid = uuid
+        self.profile_id = profile_id
+        self.profile_name = profile_name
+        self.categories = {}  # name -> CategoryResult, in scoring order
+        self.metadata = metadata if metadata is not None else {"computed_at": time.time()}
+        self.timings = None  # a timing.Timings when timing is enabled
+
+    def add(self, name, total, breakdown, **details):
+        category = CategoryResult(name, total, breakdown, details)
+        self.categories[name] = category
+        return category
+
+    @property
+    def total(self):
+        return sum(category.total for category in self.categories.values())
+
+    def category_totals(self):
+        return {name: category.total for name, category in self.categories.items()}
+
+    @property
+    def ld_breakdown(self):
+        """The short per-category lines main() used to return, e.g. "↳ Weapons: 8147"."""
+        return [f"↳ {category.label}: {category.total}" for category in self.categories.values()]
+
+    def to_dict(self):
+        return {
+            "username": self.username,
+            "uuid": self.uuid,
+            "profile_id": self.profile_id,
+            "profile_name": self.profile_name,
+            "weight": self.total,
+            "categories": [category.to_dict() for category in self.categories.values()],
+            "metadata": self.metadata,
+            "timings": self.timings.to_dict() if self.timings else None,
+        }
+
+    # Tuple compatibility: weight, ld_breakdown = result (or result[0], result[1])
+    def __iter__(self):
+        return iter((self.total, self.ld_breakdown))
+
+    def __getitem__(self, index):
+        return (self.total, self.ld_breakdown)[index]
+
+    def __len__(self):
+        return 2
+
+    def __repr__(self):
+        return f"WeightResult({self.username}: {self.total})"
+
+
+def render(result, file=None):
+    """Prints a result the way main() always has: every category total and breakdown, then the overall weight."""
+    out = file or sys.stdout
+    for category in result.categories.values():
+        label, breakdown_label = CATEGORY_LABELS.get(category.name, (category.name, "Breakdown"))
+        print(f"↳ {label}: {category.total}", file=out)
+        print(f"  {breakdown_label}: {category.breakdown}", file=out)
+        for key, value in category.details.items():
+            if value:
+                print(f"  {DETAIL_LABELS.get(key, key)}: {value}", file=out)
+
+    profile_suffix = f" ({result.profile_name})" if result.profile_name else ""
+    print(f"{result.username}'s MapleWeight{profile_suffix}: {result.total}", file=out)
+    print(result.uuid, file=out)
@@ -0,0 +1,61 @@
+import time
+from collections import OrderedDict
+from .metrics import CACHE_HITS, CACHE_MISSES, CACHE_EVICTIONS
+
+# Final-result cache.
+# Finished WeightResults are kept per (uuid, profile_id) together with a fingerprint of the inputs they were
+# computed from (the cached profiles payload, see get_data.profiles_fingerprint). A repeat lookup within
+# RESULT_TTL whose fingerprint still matches is answered straight from here: no profile decode, no museum or
+# garden request, no scoring. Lookups come in by username and profile name, so those are mapped to the
+# (uuid, profile_id) they last resolved to.
+
+RESULT_TTL = 120  # seconds; keep it at or below get_data.CACHE_TTL
+MAX_RESULTS = 4096
+
+_results = OrderedDict()  # (uuid, profile_id) -> (result, fingerprint, stored_at)
+_aliases = {}  # (username, profile name or "") -> (uuid, profile_id)
+
+
+def _alias(username, profile):
+    return username.lower(), (profile or "").lower()
+
+
+def get_result(username, profile, fingerprint, ttl=None):
+    """The cached result for this lookup if it's younger than the TTL and was computed from `fingerprint`."""
+    key = _aliases.get(_alias(username, profile))
+    entry = _results.get(key) if key is not None else None
+    if entry is not None and fingerprint is not None:
+        result, stored_fingerprint, stored_at = entry
+        if stored_fingerprint == fingerprint and time.monotonic() - stored_at < (RESULT_TTL if ttl is None else ttl):
+            _results.move_to_end(key)
+            CACHE_HITS.inc(cache="result")
+            return result
+    CACHE_MISSES.inc(cache="result")
+    return None
+
+
+def put_result(username, profile, result, fingerprint):
+    if fingerprint is None:
+        return  # nothing to validate a later hit against
+    key = (result.uuid, result.profile_id)
+    _aliases[_alias(username, profile)] = key
+    _results[key] = (result, fingerprint, time.monotonic())
+    _results.move_to_end(key)
+    while len(_results) > MAX_RESULTS:
+        _results.popitem(last=False)
+        CACHE_EVICTIONS.inc(cache="result")
+    if len(_aliases) > 2 * MAX_RESULTS:
+        # Drop aliases whose result has been evicted
+        for alias in [a for a, k in _aliases.items() if k not in _results]:
+            del _aliases[alias]
+
+
+def invalidate(uuid, profile_id=None):
+    """Forgets the cached results for a player (or just one of their profiles)."""
+    for key in [k for k in _results if k[0] == uuid and (profile_id is None or k[1] == profile_id)]:
+        del _results[key]
+
+
+def clear_results():
+    _results.clear()
+    _aliases.clear()
@@ -1,21 +1,25 @@
-import asyncio
 from .mapleWeight import main
+from .client import get_background_loop
 
-def run_maple_weight(username, api_key, *, profile=None, infodump=False):
-    return asyncio.run(main(username, api_key, profile=profile, infodump=infodump))
+def run_maple_weight(username, api_key, *, profile=None, infodump=False, quiet=False):
+    # Runs on the shared background loop (see client.py) rather than a fresh asyncio.run per call,
+    # so consecutive lookups reuse the same HTTP connections and in-flight lookups.
+    return get_background_loop().run(main(username, api_key, profile=profile, infodump=infodump, quiet=quiet))
 
 # This is the entrypoint to the project. To use the entire software, you must run this function.
+# If you're already inside an event loop, use client.MapleWeightClient instead and await it directly:
+# all calls on that loop share one pooled HTTP session (see http_client.py).
 
 # For the code to be run, set up another project, import this project, and then use the following:
 '''
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-import MapleWeight.runner
-import asyncio
-import functools
+from MapleWeight.client import MapleWeightClient
 
-loop = asyncio.get_event_loop()
-fn = functools.partial(MapleWeight.runner.run_maple_weight, username, API_KEY, profile=profile)
-weight_val, ld_breakdown = await loop.run_in_executor(None, fn)
+client = MapleWeightClient(API_KEY)
+weight_val, ld_breakdown = await client.get_weight(username, profile=profile)
+
+# or, from sync code:
+weight_val, ld_breakdown = MapleWeight.runner.run_maple_weight(username, API_KEY, profile=profile)
 '''
 # I'm not the best programmer so this project may have some faults. Some unoptimal stuff. Etc.
@@ -0,0 +1,148 @@
+import argparse
+import asyncio
+import os
+from aiohttp import web
+from .mapleWeight import main
+from .get_data import NotFoundError, UpstreamError
+from .http_client import close_session
+from .worker_pool import start_pool, shutdown_pool
+from .metrics import render_prometheus
+
+# Local HTTP service: GET /weight/{username} and /weight/{username}/{profile} return the WeightResult as JSON.
+# Everything runs on one event loop, so all requests share the pooled HTTP session, the caches and in-flight
+# deduplication. At most `concurrency` lookups run at once and up to `queue_depth` more may wait for a slot;
+# anything beyond that gets a 503 straight away instead of piling up. Unknown players and profiles are 404s,
+# Hypixel/Mojang errors are 502s, except rate limiting (429), which is passed on as a 503 with Retry-After.
+# GET /metrics serves Prometheus metrics.
+#   python -m MapleWeight.server -k API_KEY --port 8080
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8080
+DEFAULT_CONCURRENCY = 8
+DEFAULT_QUEUE_DEPTH = 32
+RETRY_AFTER = 5  # seconds, sent with 503s
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class Backpressure:
+    """A semaphore that refuses new work once `concurrency + queue_depth` callers are inside."""
+
+    def __init__(self, concurrency, queue_depth):
+        self.concurrency = concurrency
+        self.queue_depth = queue_depth
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self.active = 0  # running + waiting
+        self.running = 0
+
+    def try_enter(self):
+        if self.active >= self.concurrency + self.queue_depth:
+            return False
+        self.active += 1
+        return True
+
+    def leave(self):
+        self.active -= 1
+
+    async def __aenter__(self):
+        await self._semaphore.acquire()
+        self.running += 1
+
+    async def __aexit__(self, *exc):
+        self.running -= 1
+        self._semaphore.release()
+
+
+def _overloaded(message="Server is busy, try again shortly."):
+    return web.json_response(
+        {"error": message},
+        status=503, headers={"Retry-After": str(RETRY_AFTER)},
+    )
+
+
+async def weight_handler(request):
+    username = request.match_info["username"]
+    profile = request.match_info.get("profile")
+    limiter = request.app["backpressure"]
+
+    if not limiter.try_enter():
+        return _overloaded()
+    try:
+        async with limiter:
+            result = await main(username, request.app["api_key"], profile=profile, quiet=True)
+    except NotFoundError as e:
+        # Unknown player or profile (see get_data / mapleWeight)
+        return web.json_response({"error": str(e)}, status=404)
+    except UpstreamError as e:
+        print(f"Lookup failed for {username}: {e}")
+        if e.status == 429:
+            return _overloaded("Rate limited by the API, try again shortly.")
+        return web.json_response({"error": f"Lookup failed: {e}"}, status=502)
+    except Exception as e:
+        print(f"Lookup failed for {username}: {e}")
+        return web.json_response({"error": f"Lookup failed: {e}"}, status=502)
+    finally:
+        limiter.leave()
+
+    return web.json_response(result.to_dict())
+
+
+async def health_handler(request):
+    limiter = request.app["backpressure"]
+    return web.json_response({
+        "status": "ok",
+        "running": limiter.running,
+        "queued": limiter.active - limiter.running,
+        "concurrency": limiter.concurrency,
+        "queue_depth": limiter.queue_depth,
+    })
+
+
+async def metrics_handler(request):
+    # Prometheus scrape target
+    return web.Response(body=render_prometheus().encode("utf-8"), headers={"Content-Type": PROMETHEUS_CONTENT_TYPE})
+
+
+async def _on_cleanup(app):
+    shutdown_pool()
+    await close_session()
+
+
+def create_app(api_key, *, concurrency=DEFAULT_CONCURRENCY, queue_depth=DEFAULT_QUEUE_DEPTH, workers=0):
+    app = web.Application()
+    app["api_key"] = api_key
+    app["backpressure"] = Backpressure(concurrency, queue_depth)
+    app.router.add_get("/weight/{username}", weight_handler)
+    app.router.add_get("/weight/{username}/{profile}", weight_handler)
+    app.router.add_get("/health", health_handler)
+    app.router.add_get("/metrics", metrics_handler)
+    if workers:
+        start_pool(workers)
+    app.on_cleanup.append(_on_cleanup)
+    return app
+
+
+def cli(argv=None):
+    parser = argparse.ArgumentParser(description="Serve MapleWeight lookups over HTTP.")
+    parser.add_argument("--host", default=DEFAULT_HOST, help=f"interface to bind (default: {DEFAULT_HOST})")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"port to listen on (default: {DEFAULT_PORT})")
+    parser.add_argument("-k", "--api-key", default=os.environ.get("HYPIXEL_API_KEY"), help="Hypixel API key (default: $HYPIXEL_API_KEY)")
+    parser.add_argument("-c", "--concurrency", type=int, default=DEFAULT_CONCURRENCY, help=f"lookups computed at once (default: {DEFAULT_CONCURRENCY})")
+    parser.add_argument("-q", "--queue-depth", type=int, default=DEFAULT_QUEUE_DEPTH, help=f"lookups allowed to wait before answering 503 (default: {DEFAULT_QUEUE_DEPTH})")
+    parser.add_argument("-w", "--workers", type=int, default=0, help="score profiles in this many worker processes (default: 0, score on the main process)")
+    args = parser.parse_args(argv)
+
+    if not args.api_key:
+        parser.error("an API key is required (--api-key or $HYPIXEL_API_KEY)")
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+    if args.queue_depth < 0:
+        parser.error("--queue-depth can't be negative")
+    if args.workers < 0:
+        parser.error("--workers can't be negative")
+
+    app = create_app(args.api_key, concurrency=args.concurrency, queue_depth=args.queue_depth, workers=args.workers)
+    web.run_app(app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    cli()
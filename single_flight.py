@@ -0,0 +1,33 @@
+import asyncio
+
+# In-flight request deduplication.
+# When several callers ask for the same thing at the same moment (e.g. a popular player being looked up
+# by a handful of Discord users), only the first one actually does the work; everyone else awaits the same task.
+
+
+class SingleFlight:
+    def __init__(self):
+        self._calls = {}  # key -> running task
+
+    async def do(self, key, fn, *args, **kwargs):
+        """Runs fn(*args, **kwargs) unless a call with the same key is already running, and returns its result."""
+        loop = asyncio.get_running_loop()
+        task = self._calls.get(key)
+
+        if task is None or task.get_loop() is not loop:
+            task = asyncio.ensure_future(fn(*args, **kwargs))
+            self._calls[key] = task
+            task.add_done_callback(lambda t: self._forget(key, t))
+
+        # shield() so one impatient caller being cancelled doesn't cancel the work for everyone else
+        return await asyncio.shield(task)
+
+    def in_flight(self, key):
+        return key in self._calls
+
+    def _forget(self, key, task):
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # Mark the exception as retrieved in case every waiter was cancelled before it finished
+        if not task.cancelled():
+            task.exception()
@@ -0,0 +1,123 @@
+import json
+import os
+import pytest
+from ..individual_weights.mw_utils import Accessory_Registry as registry
+from ..individual_weights.mw_utils.MP_Calc import calculate_magical_power
+from ..items import Item, ItemIndex
+from ..mapleWeight import score_profile
+
+PACKAGE_DIR = os.path.dirname(os.path.dirname(__file__))
+
+
+def accessory(item_id, rarity):
+    return Item(id=item_id, lore=("Some stat", f"§f§l{rarity} ACCESSORY"))
+
+
+def magical_power(*items):
+    return calculate_magical_power(ItemIndex(items), {"members": {}}, "uuid")
+
+
+# Magical power
+
+def test_only_the_best_tier_of_a_line_counts():
+    assert magical_power(accessory("AGARIMOO_TALISMAN", "COMMON"), accessory("AGARIMOO_RING", "UNCOMMON")) == 5
+    assert magical_power(accessory("AGARIMOO_RING", "UNCOMMON"), accessory("AGARIMOO_TALISMAN", "COMMON")) == 5
+
+
+def test_a_recombobulated_lower_tier_can_be_the_better_one():
+    assert magical_power(accessory("AGARIMOO_TALISMAN", "RARE"), accessory("AGARIMOO_RING", "UNCOMMON")) == 8
+
+
+def test_different_lines_add_up():
+    assert magical_power(accessory("AGARIMOO_RING", "UNCOMMON"), accessory("ANITA_TALISMAN", "COMMON")) == 8
+
+
+def test_duplicates_count_once():
+    assert magical_power(accessory("ARCHAEOLOGIST_COMPASS", "RARE"), accessory("ARCHAEOLOGIST_COMPASS", "RARE")) == 8
+
+
+# Registry loading
+
+@pytest.fixture
+def source(monkeypatch, tmp_path):
+    """A throwaway Accessory_Lines.json, with the registry's module state restored afterwards."""
+    path = tmp_path / "Accessory_Lines.json"
+    write_source(path, {"Line": [["Small", "SMALL"], ["Big", "BIG"]]}, mtime=1_000_000_000)
+    monkeypatch.setattr(registry, "SOURCE_PATH", str(path))
+    for name in ("_cache_path", "_groups", "_registry", "_source_mtime", "_last_check"):
+        monkeypatch.setattr(registry, name, getattr(registry, name))
+    registry.disable_registry_cache()
+    registry._source_mtime = None
+    return path
+
+
+def write_source(path, groups, mtime):
+    path.write_text(json.dumps(groups), encoding="utf-8")
+    os.utime(path, (mtime, mtime))
+
+
+def test_load_flattens_lines(source):
+    assert registry.load_registry() == {"SMALL": ("Line", 0), "BIG": ("Line", 1)}
+    assert registry.accessory_group("BIG") == "Line"
+    assert registry.accessory_tier("SMALL") == 0
+    assert registry.accessory_group("LONER") == "LONER"
+    assert registry.accessory_tier("LONER") is None
+
+
+def test_reloads_when_the_source_changes(source):
+    registry.load_registry()
+    write_source(source, {"Other": [["New", "NEW"]]}, mtime=1_000_000_001)
+    assert registry.load_registry() == {"NEW": ("Other", 0)}
+    assert registry.get_groups() == {"Other": [["New", "NEW"]]}
+
+
+def test_unchanged_source_is_not_reread(source):
+    loaded = registry.load_registry()
+    source.write_text("not json", encoding="utf-8")
+    os.utime(source, (1_000_000_000, 1_000_000_000))  # same mtime as before
+    assert registry.load_registry() is loaded
+
+
+def test_no_cache_file_unless_enabled(source, tmp_path):
+    registry.load_registry(force=True)
+    assert os.listdir(tmp_path) == ["Accessory_Lines.json"]
+
+
+def test_cache_round_trip(source, tmp_path):
+    cache = tmp_path / "registry.json"
+    registry.enable_registry_cache(str(cache))
+    expected = registry.load_registry()
+    assert cache.exists()
+
+    # A fresh process (module state reset) reads the cache instead of the source
+    source.write_text("not json", encoding="utf-8")
+    os.utime(source, (1_000_000_000, 1_000_000_000))
+    registry._source_mtime = None
+    assert registry.load_registry() == expected
+
+
+@pytest.mark.parametrize("contents", [
+    "garbage",
+    json.dumps([1, 2, 3]),
+    json.dumps({"version": registry.CACHE_VERSION, "source_mtime_ns": 1, "groups": {}, "registry": {}}),  # stale
+    json.dumps({"version": 0, "groups": {}, "registry": {}}),
+    json.dumps({"version": registry.CACHE_VERSION, "source_mtime_ns": 1_000_000_000 * 10 ** 9, "groups": [], "registry": {}}),
+    json.dumps({"version": registry.CACHE_VERSION, "source_mtime_ns": 1_000_000_000 * 10 ** 9, "groups": {}, "registry": {"X": 5}}),
+])
+def test_bad_cache_files_are_ignored(source, tmp_path, contents):
+    cache = tmp_path / "registry.json"
+    cache.write_text(contents, encoding="utf-8")
+    registry.enable_registry_cache(str(cache))
+    assert registry.load_registry() == {"SMALL": ("Line", 0), "BIG": ("Line", 1)}
+
+
+# Bundled profiles: accessory lines being deduplicated moved these weapon scores
+# (Strawberry 8147 -> 7891, Pomegranate 5949 -> 5921)
+
+@pytest.mark.parametrize("username, profile_name, expected", [("kalabash", "Strawberry", 7891), ("theokons", "Pomegranate", 5921)])
+def test_bundled_weapon_scores(username, profile_name, expected):
+    with open(os.path.join(PACKAGE_DIR, "profile_cache.json"), encoding="utf-8") as f:
+        cache = json.load(f)
+    uuid = cache["uuid_cache"][username][0]
+    profile = next(p for p in cache["profile_cache"][username][0] if p.get("cute_name") == profile_name)
+    assert score_profile(username, profile, uuid, {}, {}).categories["weapons"].total == expected
@@ -0,0 +1,67 @@
+from ..byte_lru import ByteLRU
+from ..metrics import CACHE_EVICTIONS, CACHE_HITS, CACHE_MISSES
+
+
+def test_get_and_put():
+    cache = ByteLRU(100, name="test_get_put")
+    assert cache.get("a") is None
+    assert cache.get("a", "default") == "default"
+    cache.put("a", [1, 2], 10)
+    assert cache.get("a") == [1, 2]
+    assert "a" in cache and len(cache) == 1 and cache.size == 10
+
+
+def test_evicts_least_recently_used_by_size():
+    cache = ByteLRU(100, name="test_evict")
+    cache.put("a", "A", 40)
+    cache.put("b", "B", 40)
+    cache.get("a")  # b is now the oldest
+    cache.put("c", "C", 40)
+    assert "b" not in cache
+    assert "a" in cache and "c" in cache
+    assert cache.size == 80
+
+
+def test_one_put_can_evict_several():
+    cache = ByteLRU(100, name="test_evict_several")
+    for key in "abcd":
+        cache.put(key, key, 25)
+    cache.put("big", "BIG", 70)
+    assert list(cache._entries) == ["d", "big"]
+    assert cache.size == 95
+
+
+def test_replacing_a_key_updates_its_size():
+    cache = ByteLRU(100, name="test_replace")
+    cache.put("a", "old", 60)
+    cache.put("a", "new", 30)
+    assert cache.get("a") == "new"
+    assert cache.size == 30 and len(cache) == 1
+
+
+def test_oversized_values_are_not_cached():
+    cache = ByteLRU(100, name="test_oversized")
+    cache.put("a", "A", 50)
+    cache.put("huge", "HUGE", 101)
+    assert "huge" not in cache
+    assert "a" in cache and cache.size == 50
+
+
+def test_clear():
+    cache = ByteLRU(100, name="test_clear")
+    cache.put("a", "A", 50)
+    cache.clear()
+    assert len(cache) == 0 and cache.size == 0 and "a" not in cache
+
+
+def test_counts_go_to_the_registry():
+    name = "test_registry"
+    cache = ByteLRU(100, name=name)
+    cache.get("a")
+    cache.put("a", "A", 60)
+    cache.get("a")
+    cache.get("a")
+    cache.put("b", "B", 60)
+    assert CACHE_MISSES.value(cache=name) == 1
+    assert CACHE_HITS.value(cache=name) == 2
+    assert CACHE_EVICTIONS.value(cache=name) == 1
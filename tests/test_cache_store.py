@@ -0,0 +1,89 @@
+import multiprocessing
+import threading
+import pytest
+from ..cache_store import CacheStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = CacheStore(str(tmp_path / "cache.sqlite3"))
+    yield store
+    store.close()
+
+
+def test_put_then_get(store):
+    store.put("uuid", "kalabash", b"abc", 100.0, 200.0)
+    assert store.get("uuid", "kalabash", now=150.0) == (b"abc", 100.0)
+
+
+def test_missing_and_expired_entries(store):
+    store.put("uuid", "kalabash", b"abc", 100.0, 200.0)
+    assert store.get("uuid", "nobody", now=150.0) is None
+    assert store.get("profiles", "kalabash", now=150.0) is None  # namespaces are separate
+    assert store.get("uuid", "kalabash", now=200.0) is None
+
+
+def test_put_replaces(store):
+    store.put("uuid", "kalabash", b"old", 100.0, 200.0)
+    store.put("uuid", "kalabash", b"new", 120.0, 220.0)
+    assert store.get("uuid", "kalabash", now=150.0) == (b"new", 120.0)
+
+
+def test_delete(store):
+    store.put("uuid", "kalabash", b"abc", 100.0, 200.0)
+    store.delete("uuid", "kalabash")
+    assert store.get("uuid", "kalabash", now=150.0) is None
+
+
+def test_purge_expired(store):
+    store.put("uuid", "old", b"1", 0.0, 100.0)
+    store.put("uuid", "older", b"2", 0.0, 50.0)
+    store.put("uuid", "fresh", b"3", 0.0, 500.0)
+    assert store.purge_expired(now=100.0) == 2
+    assert store.get("uuid", "fresh", now=100.0) == (b"3", 0.0)
+    assert store.purge_expired(now=100.0) == 0
+
+
+def test_entries_survive_reopening(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    first = CacheStore(path)
+    first.put("uuid", "kalabash", b"abc", 100.0, 200.0)
+    first.close()
+    second = CacheStore(path)
+    assert second.get("uuid", "kalabash", now=150.0) == (b"abc", 100.0)
+    second.close()
+
+
+def test_threads_share_one_store(store):
+    def write(n):
+        for i in range(50):
+            store.put("t", f"{n}-{i}", bytes([i]), 0.0, 1000.0)
+
+    threads = [threading.Thread(target=write, args=(n,)) for n in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert all(store.get("t", f"{n}-{i}", now=1.0) == (bytes([i]), 0.0) for n in range(4) for i in range(50))
+
+
+def _child_put(path, key):
+    store = CacheStore(path)
+    store.put("proc", key, key.encode(), 0.0, 1000.0)
+    store.close()
+
+
+def test_processes_share_the_file(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    store = CacheStore(path)
+    store.put("proc", "parent", b"parent", 0.0, 1000.0)  # open before the children start
+    ctx = multiprocessing.get_context("spawn")
+    children = [ctx.Process(target=_child_put, args=(path, f"child{n}")) for n in range(3)]
+    for child in children:
+        child.start()
+    for child in children:
+        child.join(30)
+        assert child.exitcode == 0
+    for key in ("parent", "child0", "child1", "child2"):
+        assert store.get("proc", key, now=1.0) == (key.encode(), 0.0)
+    store.close()
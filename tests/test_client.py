@@ -0,0 +1,31 @@
+import asyncio
+from ..client import BackgroundLoop, MapleWeightClient
+from ..http_client import close_session, get_session
+
+
+def test_closing_a_client_keeps_the_shared_session():
+    async def go():
+        session = await get_session()
+        async with MapleWeightClient("key"):
+            pass
+        await MapleWeightClient("key").aclose()
+        still_open = not session.closed and await get_session() is session
+        await close_session()
+        return still_open, session.closed
+
+    assert asyncio.run(go()) == (True, True)
+
+
+def test_background_loop_closes_only_its_own_session():
+    background = BackgroundLoop(name="test-loop")
+    background_session = background.run(get_session())
+
+    async def go():
+        session = await get_session()
+        background.stop()
+        own_open = not session.closed
+        await close_session()
+        return own_open
+
+    assert asyncio.run(go())
+    assert background_session.closed
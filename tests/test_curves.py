@@ -0,0 +1,106 @@
+import math
+import random
+import numpy as np
+import pytest
+from .. import curves
+from ..individual_weights import diana, dungeons, farming, mining, slayers
+from ..individual_weights.generic_skills import skill_curve
+
+_rng = random.Random(1)
+VALUES = (
+    [_rng.randint(0, 10 ** 9) for _ in range(20000)]
+    + [_rng.uniform(0, 1e10) for _ in range(20000)]
+    + list(range(0, 200000, 7))
+    + [0, 1, 400_000, 488_640, 999_999, 1_000_000, 1_000_001]
+)
+# Inputs that land right on an int() boundary of the zombie curve, where a last-bit log difference would show
+BOUNDARY_VALUES = [x for x in (30000 * 100 ** ((1.5 * k + 400) / 1100) - 300000 for k in range(0, 3000, 3)) if x >= 0]
+VALUES += BOUNDARY_VALUES
+
+
+def _farming(value):
+    return 0 if value <= 0 else farming.farming_exp_curve(value)
+
+
+PAIRS = {
+    "r": (curves.r, slayers.r),
+    "s": (curves.s, slayers.s),
+    "w": (curves.w, slayers.w),
+    "e": (curves.e, slayers.e),
+    "b": (curves.b, slayers.b),
+    "catacombs_weight": (curves.catacombs_weight, dungeons.catacombs_weight),
+    "m_weight": (curves.m_weight, mining.m_weight),
+    "g_weight": (curves.g_weight, mining.g_weight),
+    "mythos_kill_weight": (curves.mythos_kill_weight, diana.mythos_kill_weight),
+    "farming_exp_curve": (curves.farming_exp_curve, _farming),
+    **{
+        f"skill_weight[{scale}]": (
+            lambda x, scale=scale: curves.skill_weight(x, scale),
+            lambda v, scale=scale: skill_curve(v, scale),
+        )
+        for scale in sorted(set(curves.SKILL_SCALES.values()))
+    },
+}
+
+
+def _identical(out, expected):
+    expected = np.array(expected, dtype=out.dtype)
+    if out.dtype == np.float64:
+        return np.array_equal(out.view(np.uint64), expected.view(np.uint64))  # bit for bit
+    return np.array_equal(out, expected)
+
+
+@pytest.mark.parametrize("name", PAIRS)
+def test_vector_curve_matches_scalar(name):
+    vector, scalar = PAIRS[name]
+    out = vector(VALUES)
+    expected = [scalar(v) for v in VALUES]
+    assert out.tolist() == expected
+    assert _identical(out, expected)
+
+
+def test_boundary_repair_uses_the_scalar_result(monkeypatch):
+    # With the log forced one ulp low everywhere, only the boundary repair keeps results exact
+    real_log = curves.np.log
+    monkeypatch.setattr(curves.np, "log", lambda x: np.nextafter(real_log(x), -np.inf))
+    assert curves.r(BOUNDARY_VALUES).tolist() == [slayers.r(v) for v in BOUNDARY_VALUES]
+
+
+def test_out_of_domain_raises_like_math_log():
+    with pytest.raises(ValueError):
+        slayers.r(-400_000)
+    with pytest.raises(ValueError):
+        curves.r([0, -400_000])
+
+
+def test_batch_score_matches_the_curves():
+    columns = {"zombie": [120_000, 2_400_000], "catacombs": [5.6e8, 1.2e7], "alchemy": [5e7, 0]}
+    scores = curves.batch_score(columns)
+    assert scores["zombie"].tolist() == [slayers.r(v) for v in columns["zombie"]]
+    assert scores["catacombs"].tolist() == [dungeons.catacombs_weight(v) for v in columns["catacombs"]]
+    assert scores["alchemy"].tolist() == [skill_curve(v, 0.5) for v in columns["alchemy"]]
+
+
+def test_batch_score_rejects_unknown_columns():
+    with pytest.raises(KeyError):
+        curves.batch_score({"zombie": [1], "sheep": [1]})
+
+
+def test_experience_columns():
+    members = [
+        {
+            "slayer": {"slayer_bosses": {"zombie": {"xp": 123456}}},
+            "player_data": {"experience": {"SKILL_ALCHEMY": 5e7, "SKILL_FARMING": 1e8}},
+            "mining_core": {"powder_glacite": 10, "powder_spent_glacite": 5, "powder_gemstone": 7},
+        },
+        {},
+    ]
+    columns = curves.experience_columns(members)
+    assert set(columns) == set(curves.CURVES)
+    assert columns["zombie"].tolist() == [123456, 0]
+    assert columns["alchemy"].tolist() == [5e7, 0]
+    assert columns["farming"].tolist() == [1e8, 0]
+    assert columns["mithril_powder"].tolist() == [15, 0]
+    assert columns["gemstone_powder"].tolist() == [7, 0]
+    assert not math.isnan(columns["spider"].sum())
+    assert curves.batch_score({"farming": columns["farming"]})["farming"].tolist() == [_farming(1e8), 0]
@@ -0,0 +1,90 @@
+import copy
+import json
+import os
+import pytest
+from ..incremental import CATEGORY_INPUTS, ITEM_INPUTS, category_fingerprints, clear_snapshots, get_snapshot, save_snapshot
+from ..mapleWeight import score_profile
+
+PACKAGE_DIR = os.path.dirname(os.path.dirname(__file__))
+USERNAME = "kalabash"
+
+with open(os.path.join(PACKAGE_DIR, "profile_cache.json"), encoding="utf-8") as f:
+    _CACHE = json.load(f)
+UUID = _CACHE["uuid_cache"][USERNAME][0]
+PROFILE = next(p for p in _CACHE["profile_cache"][USERNAME][0] if p.get("selected"))
+ITEM_CATEGORIES = {name for name, paths in CATEGORY_INPUTS.items() if set(ITEM_INPUTS) <= set(paths)}
+
+
+@pytest.fixture
+def profile():
+    return copy.deepcopy(PROFILE)
+
+
+def changed(before, after):
+    return {name for name in before if before[name] != after[name]}
+
+
+def test_one_fingerprint_per_category(profile):
+    fingerprints = category_fingerprints(profile, UUID, {}, {})
+    assert set(fingerprints) == set(CATEGORY_INPUTS)
+    assert category_fingerprints(copy.deepcopy(profile), UUID, {}, {}) == fingerprints
+
+
+def test_key_order_does_not_matter(profile):
+    member = profile["members"][UUID]
+    reordered = copy.deepcopy(profile)
+    reordered["members"][UUID] = dict(reversed(list(member.items())))
+    assert category_fingerprints(reordered, UUID, {}, {}) == category_fingerprints(profile, UUID, {}, {})
+
+
+@pytest.mark.parametrize("edit, expected", [
+    (lambda p: p["members"][UUID]["slayer"]["slayer_bosses"]["zombie"].update(xp=10 ** 9), {"slayers"}),
+    (lambda p: p["members"][UUID]["player_data"]["experience"].update(SKILL_ALCHEMY=10 ** 9), {"generic_skills"}),
+    (lambda p: p["members"][UUID]["player_data"]["experience"].update(SKILL_FARMING=10 ** 9), {"farming"}),
+    (lambda p: p.setdefault("banking", {}).update(balance=10 ** 9), {"pets"}),
+    (lambda p: p["members"][UUID]["pets_data"]["pets"].append({"type": "PARROT", "tier": "EPIC", "exp": 0}),
+     {"pets", "slayers", "farming", "dungeons", "fishing", "mining"}),
+    (lambda p: p["members"][UUID]["inventory"].clear(), ITEM_CATEGORIES),
+])
+def test_edits_only_touch_the_categories_that_read_them(profile, edit, expected):
+    before = category_fingerprints(profile, UUID, {}, {})
+    edit(profile)
+    assert changed(before, category_fingerprints(profile, UUID, {}, {})) == expected
+
+
+def test_museum_and_garden(profile):
+    before = category_fingerprints(profile, UUID, {}, {})
+    museum = category_fingerprints(profile, UUID, {UUID: {"items": {"ROYAL_PIGEON": {}}}}, {})
+    garden = category_fingerprints(profile, UUID, {}, {"commission_data": {"total_completed": 5}})
+    assert changed(before, museum) == ITEM_CATEGORIES
+    assert changed(before, garden) == {"farming"}
+
+
+def test_missing_member(profile):
+    fingerprints = category_fingerprints(profile, "0" * 32, {}, {})
+    assert set(fingerprints) == set(CATEGORY_INPUTS)
+    assert fingerprints != category_fingerprints(profile, UUID, {}, {})
+
+
+def test_rescoring_reuses_unchanged_categories(profile):
+    first = score_profile(USERNAME, profile, UUID, {}, {})
+    again = score_profile(USERNAME, profile, UUID, {}, {}, first)
+    assert again.metadata["reused_categories"] == list(CATEGORY_INPUTS)
+    assert again.to_dict() == first.to_dict() | {"metadata": again.to_dict()["metadata"]}
+
+    profile["members"][UUID]["player_data"]["experience"]["SKILL_ALCHEMY"] = 10 ** 9
+    incremental = score_profile(USERNAME, profile, UUID, {}, {}, again)
+    fresh = score_profile(USERNAME, profile, UUID, {}, {})
+    assert "generic_skills" not in incremental.metadata["reused_categories"]
+    assert incremental.total == fresh.total
+    assert incremental.to_dict()["categories"] == fresh.to_dict()["categories"]
+
+
+def test_snapshots(profile):
+    clear_snapshots()
+    result = score_profile(USERNAME, profile, UUID, {}, {})
+    assert get_snapshot(result.uuid, result.profile_id) is None
+    save_snapshot(result)
+    assert get_snapshot(result.uuid, result.profile_id) is result
+    clear_snapshots()
+    assert get_snapshot(result.uuid, result.profile_id) is None
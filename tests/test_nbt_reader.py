@@ -0,0 +1,107 @@
+import base64
+import gzip
+import io
+import json
+import os
+import nbtlib
+import pytest
+from nbtlib import tag
+from ..nbt_reader import FULL, ITEM_SPEC, NBTError, read_items, read_nbt
+
+PACKAGE_DIR = os.path.dirname(os.path.dirname(__file__))
+FIXTURES = ("profile_cache.json", "full_profile_data_dump.json")
+
+
+def _blobs(value):
+    # Every base64 gzip blob (inventories, backpacks, museum items, ...) anywhere in a fixture
+    if isinstance(value, dict):
+        for child in value.values():
+            yield from _blobs(child)
+    elif isinstance(value, list):
+        for child in value:
+            yield from _blobs(child)
+    elif isinstance(value, str) and value.startswith("H4sI"):
+        yield value
+
+
+def _load_blobs():
+    blobs = []
+    for name in FIXTURES:
+        with open(os.path.join(PACKAGE_DIR, name), encoding="utf-8") as f:
+            blobs.extend(gzip.decompress(base64.b64decode(blob)) for blob in _blobs(json.load(f)))
+    return blobs
+
+
+BLOBS = _load_blobs()
+
+
+def _plain(value):
+    """nbtlib tag tree -> the plain values nbt_reader produces."""
+    if isinstance(value, tag.ByteArray):
+        return value.tobytes()
+    if isinstance(value, (tag.IntArray, tag.LongArray)):
+        return [int(v) for v in value]
+    if isinstance(value, dict):
+        return {str(k): _plain(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_plain(v) for v in value]
+    if isinstance(value, str):
+        return str(value)
+    if isinstance(value, (tag.Float, tag.Double)):
+        return float(value)
+    return int(value)
+
+
+def _filtered(value, spec):
+    if spec is FULL:
+        return value
+    if isinstance(value, list):
+        return [_filtered(v, spec) for v in value]
+    return {k: _filtered(v, spec[k.encode()]) for k, v in value.items() if k.encode() in spec}
+
+
+def _nbtlib_root(data):
+    return _plain(nbtlib.File.parse(io.BytesIO(data)))
+
+
+def test_fixtures_have_blobs():
+    assert len(BLOBS) > 100
+
+
+@pytest.mark.parametrize("index", range(len(BLOBS)))
+def test_read_items_matches_nbtlib(index):
+    data = BLOBS[index]
+    expected = [_filtered(item, ITEM_SPEC) for item in _nbtlib_root(data).get("i", [])]
+    assert read_items(data) == expected
+
+
+@pytest.mark.parametrize("index", range(0, len(BLOBS), 10))
+def test_read_nbt_full_matches_nbtlib(index):
+    data = BLOBS[index]
+    assert read_nbt(data) == _nbtlib_root(data)
+
+
+def test_truncated_buffers_raise():
+    data = min(BLOBS, key=len)
+    for end in range(len(data)):
+        with pytest.raises(NBTError):
+            read_nbt(data[:end])
+    for end in range(0, len(data), 7):
+        with pytest.raises(NBTError):
+            read_items(data[:end])
+
+
+@pytest.mark.parametrize("data", [
+    b"",
+    b"\x08\x00\x00\x00\x00",                      # root isn't a compound
+    b"\x0a\x00\x00\x63\x00\x01a\x00",              # unknown tag type inside the root
+    b"\x0a\x00\x00\x09\x00\x01i\x63\x00\x00\x00\x01\x00",  # list of an unknown tag type
+    b"\x0a\x00\x00\x09\x00\x01i\x00\x00\x00\x00\x02\x00",  # non-empty list of TAG_End
+    b"\x0a\x00\x00\x08\x00\x01a\xff\xff",          # string longer than the buffer
+    b"\x0a\x00\x00\x0b\x00\x01a\x00\x00\x10\x00",  # int array longer than the buffer
+])
+def test_invalid_buffers_raise(data):
+    with pytest.raises(NBTError):
+        read_nbt(data)
+    with pytest.raises(NBTError):
+        read_items(data)
@@ -0,0 +1,90 @@
+import pytest
+from ..pet_index import MAX_LEVEL_EXP, Pet, PetIndex, exp_for_level, pet_level
+
+# Constants the scorers used to hard-code before the level tables existed
+L100_LEGENDARY = 25_353_230
+L80_EPIC = 4_234_500
+L80_LEGENDARY = 5_619_230
+L100_EPIC = 18_608_500
+GDRAG_L102 = 25_358_785
+GDRAG_STEP = 1_886_700
+
+
+def test_hard_coded_thresholds():
+    assert MAX_LEVEL_EXP == L100_LEGENDARY
+    assert exp_for_level(100, "LEGENDARY") == L100_LEGENDARY
+    assert exp_for_level(100, "MYTHIC") == L100_LEGENDARY
+    assert exp_for_level(80, "EPIC") == L80_EPIC
+    assert exp_for_level(80, "LEGENDARY") == L80_LEGENDARY
+    assert exp_for_level(100, "EPIC") == L100_EPIC
+
+
+@pytest.mark.parametrize("tier, level, exp", [
+    ("LEGENDARY", 100, L100_LEGENDARY),
+    ("EPIC", 80, L80_EPIC),
+    ("LEGENDARY", 80, L80_LEGENDARY),
+    ("EPIC", 100, L100_EPIC),
+])
+def test_levels_start_exactly_at_their_threshold(tier, level, exp):
+    assert pet_level(exp, tier) == level
+    assert pet_level(exp - 1, tier) == level - 1
+
+
+def test_levels_stop_at_100():
+    assert pet_level(0, "LEGENDARY") == 1
+    assert pet_level(10 ** 12, "LEGENDARY") == 100
+    assert pet_level(10 ** 12, "COMMON") == 100
+
+
+def test_unknown_tier_uses_common():
+    assert pet_level(L100_EPIC, "SOMETHING_NEW") == pet_level(L100_EPIC, "COMMON")
+
+
+def test_golden_dragon_levels():
+    assert pet_level(L100_LEGENDARY, "LEGENDARY", "GOLDEN_DRAGON") == 101
+    assert pet_level(GDRAG_L102 - 1, "LEGENDARY", "GOLDEN_DRAGON") == 101
+    assert pet_level(GDRAG_L102, "LEGENDARY", "GOLDEN_DRAGON") == 102
+    assert pet_level(GDRAG_L102 + GDRAG_STEP - 1, "LEGENDARY", "GOLDEN_DRAGON") == 102
+    assert pet_level(GDRAG_L102 + GDRAG_STEP, "LEGENDARY", "GOLDEN_DRAGON") == 103
+    assert pet_level(GDRAG_L102 + 98 * GDRAG_STEP, "LEGENDARY", "GOLDEN_DRAGON") == 200
+    assert pet_level(GDRAG_L102 + 98 * GDRAG_STEP - 1, "LEGENDARY", "GOLDEN_DRAGON") == 199
+    assert pet_level(10 ** 12, "LEGENDARY", "GOLDEN_DRAGON") == 200
+    assert exp_for_level(102, "LEGENDARY", "GOLDEN_DRAGON") == GDRAG_L102
+
+
+def test_progress():
+    assert Pet("GHOUL", "EPIC", 0).progress == 0
+    assert Pet("GHOUL", "EPIC", L100_LEGENDARY // 2).progress == pytest.approx(0.5, abs=1e-6)
+    assert Pet("GHOUL", "EPIC", 10 ** 12).progress == 1
+    assert Pet("GHOUL", "EPIC", -5).progress == 0
+
+
+def test_best_prefers_higher_tier():
+    pets = PetIndex([
+        {"type": "PARROT", "tier": "EPIC", "exp": 10 ** 9},
+        {"type": "PARROT", "tier": "LEGENDARY", "exp": 0},
+    ])
+    assert pets.best("PARROT").tier == "LEGENDARY"
+    assert pets.best("GRIFFIN") is None
+
+
+def test_best_first_seen_wins_ties():
+    pets = PetIndex([
+        {"type": "PARROT", "tier": "LEGENDARY", "exp": 0, "heldItem": "FIRST"},
+        {"type": "PARROT", "tier": "LEGENDARY", "exp": 10 ** 9, "heldItem": "SECOND"},
+    ])
+    assert pets.best("PARROT").held_item == "FIRST"
+
+
+def test_best_by_family_groups_wisps():
+    pets = PetIndex([
+        {"type": "DROPLET_WISP", "tier": "UNCOMMON", "exp": 0},
+        {"type": "FROST_WISP", "tier": "RARE", "exp": 0},
+        {"type": "GLACIAL_WISP", "tier": "EPIC", "exp": 0},
+        {"type": "SUBZERO_WISP", "tier": "EPIC", "exp": 0},
+        {"type": "PARROT", "tier": "RARE", "exp": 0},
+    ])
+    best = pets.best_by_family()
+    assert set(best) == {"WISP", "PARROT"}
+    assert best["WISP"].type == "GLACIAL_WISP"  # first of the two epics
+    assert pets.best("FROST_WISP").tier == "RARE"
@@ -0,0 +1,56 @@
+import asyncio
+import json
+import os
+import time
+import pytest
+from .. import get_data
+from ..cache_store import CacheStore
+from ..compression import CompressedJSON
+from ..get_data import NotFoundError
+from ..mapleWeight import main
+from ..result_cache import clear_results
+
+PACKAGE_DIR = os.path.dirname(os.path.dirname(__file__))
+
+with open(os.path.join(PACKAGE_DIR, "profile_cache.json"), encoding="utf-8") as f:
+    _CACHE = json.load(f)
+
+
+@pytest.fixture
+def api(monkeypatch, tmp_path):
+    """Stubs the APIs: Mojang knows kalabash only, Hypixel has the bundled profiles, museum and garden are refused."""
+    async def fetch_json(url, **kwargs):
+        if "mojang" in url:
+            if url.endswith("/kalabash"):
+                return 200, {"id": _CACHE["uuid_cache"]["kalabash"][0]}
+            return 204, None
+        if "skyblock/profiles" in url:
+            return 200, {"success": True, "profiles": _CACHE["profile_cache"]["kalabash"][0]}
+        return 403, {"success": False, "cause": "Museum API disabled"}
+
+    store = CacheStore(str(tmp_path / "cache.sqlite3"))
+    monkeypatch.setattr(get_data, "fetch_json", fetch_json)
+    monkeypatch.setattr(get_data, "_store", store)
+    monkeypatch.setattr(get_data, "_uuid_cache", {})
+    monkeypatch.setattr(get_data, "_profile_cache", {})
+    clear_results()
+    yield
+    clear_results()
+    store.close()
+
+
+def test_quiet_lookup_writes_nothing(api, capsys):
+    # An entry old enough to be purged on the way
+    stale = time.time() - get_data.CACHE_MAX_AGE - 1
+    get_data._profile_cache["someone_else"] = (CompressedJSON.from_value([]), stale)
+
+    result = asyncio.run(main("kalabash", "key", quiet=True))
+    assert result.total > 0
+    assert "someone_else" not in get_data._profile_cache
+    assert capsys.readouterr() == ("", "")
+
+
+def test_quiet_unknown_player_writes_nothing(api, capsys):
+    with pytest.raises(NotFoundError):
+        asyncio.run(main("nobody", "key", quiet=True))
+    assert capsys.readouterr() == ("", "")
@@ -0,0 +1,113 @@
+import asyncio
+import types
+import pytest
+from .. import rate_limit
+from ..rate_limit import TokenBucket, get_limiter, retry_delay, should_retry
+
+
+class FakeClock:
+    """Stands in for time.monotonic / asyncio.sleep: sleeping just moves the clock forward."""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.slept = []
+
+    def monotonic(self):
+        return self.now
+
+    async def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limit, "time", types.SimpleNamespace(monotonic=clock.monotonic))
+    monkeypatch.setattr(rate_limit, "asyncio", types.SimpleNamespace(sleep=clock.sleep))
+    return clock
+
+
+def acquire(bucket, times=1):
+    async def go():
+        for _ in range(times):
+            await bucket.acquire()
+    asyncio.run(go())
+
+
+def test_full_bucket_does_not_wait(clock):
+    bucket = TokenBucket(limit=10, period=10)
+    acquire(bucket, 10)
+    assert clock.slept == []
+    assert bucket.tokens == pytest.approx(0)
+
+
+def test_empty_bucket_waits_for_one_token(clock):
+    bucket = TokenBucket(limit=10, period=20)  # one token every 2s
+    acquire(bucket, 10)
+    acquire(bucket)
+    assert sum(clock.slept) == pytest.approx(2)
+    assert bucket.tokens == pytest.approx(0)
+
+
+def test_refill_is_capped_at_the_limit(clock):
+    bucket = TokenBucket(limit=5, period=5)
+    acquire(bucket, 5)
+    clock.now += 3600
+    bucket._refill(clock.now)
+    assert bucket.tokens == 5
+
+
+def test_remaining_header_lowers_tokens(clock):
+    bucket = TokenBucket(limit=300, period=300)
+    bucket.update_from_headers({"RateLimit-Limit": "120", "RateLimit-Remaining": "3", "RateLimit-Reset": "40"})
+    assert bucket.limit == 120
+    assert bucket.tokens == 3
+    acquire(bucket, 3)
+    assert clock.slept == []
+
+
+def test_remaining_header_never_raises_tokens(clock):
+    bucket = TokenBucket(limit=10, period=10)
+    acquire(bucket, 8)
+    bucket.update_from_headers({"RateLimit-Remaining": "10"})
+    assert bucket.tokens == pytest.approx(2)
+
+
+def test_exhausted_quota_blocks_until_reset(clock):
+    bucket = TokenBucket(limit=300, period=300)
+    start = clock.now
+    bucket.update_from_headers({"RateLimit-Remaining": "0", "RateLimit-Reset": "42"})
+    acquire(bucket)
+    assert clock.now - start >= 42
+
+
+def test_bad_headers_are_ignored(clock):
+    bucket = TokenBucket(limit=10, period=10)
+    bucket.update_from_headers({"RateLimit-Limit": "lots", "RateLimit-Remaining": "soon"})
+    assert bucket.limit == 10
+    assert bucket.tokens == 10
+
+
+def test_get_limiter_is_per_key():
+    assert get_limiter("test-key-a") is get_limiter("test-key-a")
+    assert get_limiter("test-key-a") is not get_limiter("test-key-b")
+
+
+def test_retry_delay_backs_off_within_bounds():
+    for attempt in range(10):
+        delay = retry_delay(attempt)
+        assert 0 <= delay <= min(rate_limit.BACKOFF_MAX, rate_limit.BACKOFF_BASE * 2 ** attempt)
+
+
+def test_retry_delay_honours_server_wait():
+    assert retry_delay(0, {"Retry-After": "7"}) >= 7
+    assert retry_delay(0, {"RateLimit-Reset": "9"}) >= 9
+    assert 7 <= retry_delay(0, {"Retry-After": "7", "RateLimit-Reset": "100"}) < 100
+    assert retry_delay(0, {"Retry-After": "100000"}) <= rate_limit.BACKOFF_MAX * 10 + rate_limit.BACKOFF_BASE
+
+
+def test_should_retry():
+    assert should_retry(429)
+    assert should_retry(500) and should_retry(503)
+    assert not should_retry(200) and not should_retry(403) and not should_retry(404)
@@ -0,0 +1,150 @@
+import asyncio
+import json
+import os
+import time
+import types
+import pytest
+from .. import get_data, mapleWeight, result_cache
+from ..compression import CompressedJSON
+from ..result_cache import clear_results, get_result, invalidate, put_result
+
+PACKAGE_DIR = os.path.dirname(os.path.dirname(__file__))
+
+
+def fake_result(uuid="uuid-a", profile_id="profile-1"):
+    return types.SimpleNamespace(uuid=uuid, profile_id=profile_id)
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    clear_results()
+    yield
+    clear_results()
+
+
+def test_hit_needs_a_matching_fingerprint():
+    result = fake_result()
+    put_result("Kalabash", None, result, "fp1")
+    assert get_result("kalabash", None, "fp1") is result  # usernames and profile names are case-insensitive
+    assert get_result("kalabash", None, "fp2") is None
+    assert get_result("kalabash", None, None) is None
+    assert get_result("kalabash", "Tomato", "fp1") is None  # different profile name
+    assert get_result("theokons", None, "fp1") is None
+
+
+def test_no_fingerprint_is_not_cached():
+    put_result("kalabash", None, fake_result(), None)
+    assert get_result("kalabash", None, None) is None
+
+
+def test_entries_expire(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(result_cache, "time", types.SimpleNamespace(monotonic=lambda: now[0]))
+    result = fake_result()
+    put_result("kalabash", None, result, "fp")
+    now[0] += result_cache.RESULT_TTL - 1
+    assert get_result("kalabash", None, "fp") is result
+    assert get_result("kalabash", None, "fp", ttl=10) is None
+    now[0] += 2
+    assert get_result("kalabash", None, "fp") is None
+
+
+def test_profile_names_share_the_entry_they_resolved_to():
+    result = fake_result()
+    put_result("kalabash", None, result, "fp")
+    put_result("kalabash", "Tomato", result, "fp")
+    assert get_result("kalabash", None, "fp") is result
+    assert get_result("kalabash", "tomato", "fp") is result
+    assert len(result_cache._results) == 1
+
+
+def test_invalidate():
+    put_result("kalabash", "Tomato", fake_result("uuid-a", "profile-1"), "fp")
+    put_result("kalabash", "Pineapple", fake_result("uuid-a", "profile-2"), "fp")
+    put_result("theokons", None, fake_result("uuid-b", "profile-3"), "fp")
+    invalidate("uuid-a", "profile-1")
+    assert get_result("kalabash", "tomato", "fp") is None
+    assert get_result("kalabash", "pineapple", "fp") is not None
+    invalidate("uuid-a")
+    assert get_result("kalabash", "pineapple", "fp") is None
+    assert get_result("theokons", None, "fp") is not None
+
+
+def test_size_limit(monkeypatch):
+    monkeypatch.setattr(result_cache, "MAX_RESULTS", 3)
+    for n in range(5):
+        put_result(f"player{n}", None, fake_result(f"uuid-{n}"), "fp")
+    assert len(result_cache._results) == 3
+    assert get_result("player0", None, "fp") is None
+    assert get_result("player4", None, "fp") is not None
+
+
+@pytest.fixture
+def offline(monkeypatch):
+    """mapleWeight.main against the bundled profiles, with every API call replaced and counted."""
+    with open(os.path.join(PACKAGE_DIR, "profile_cache.json"), encoding="utf-8") as f:
+        cache = json.load(f)
+    calls = []
+
+    async def get_uuid(username):
+        calls.append("uuid")
+        return cache["uuid_cache"][username][0]
+
+    async def get_skyblock_profiles_payload(api_key, username, uuid=None):
+        calls.append("profiles")
+        return get_data._profile_cache[username][0]
+
+    async def empty(api_key, profile_id):
+        calls.append("museum/garden")
+        return {}
+
+    monkeypatch.setattr(mapleWeight, "get_uuid", get_uuid)
+    monkeypatch.setattr(mapleWeight, "get_skyblock_profiles_payload", get_skyblock_profiles_payload)
+    monkeypatch.setattr(mapleWeight, "get_museum_data", empty)
+    monkeypatch.setattr(mapleWeight, "get_garden_data", empty)
+    monkeypatch.setitem(get_data._profile_cache, "kalabash",
+                        (CompressedJSON.from_value(cache["profile_cache"]["kalabash"][0]), time.time()))
+    return calls
+
+
+def test_repeat_lookup_skips_fetching_and_scoring(offline):
+    async def go():
+        first = await mapleWeight.main("kalabash", "key", quiet=True)
+        fetches = len(offline)
+        second = await mapleWeight.main("kalabash", "key", quiet=True)
+        return first, second, fetches
+
+    first, second, fetches = asyncio.run(go())
+    assert second is first
+    assert len(offline) == fetches
+
+
+def test_changed_profile_data_is_rescored(offline):
+    async def go():
+        first = await mapleWeight.main("kalabash", "key", quiet=True)
+        _refresh_profiles()
+        return first, await mapleWeight.main("kalabash", "key", quiet=True)
+
+    first, second = asyncio.run(go())
+    assert second is not first
+    assert second.total == first.total
+
+
+def _refresh_profiles():
+    payload, _ = get_data._profile_cache["kalabash"]
+    profiles = payload.load()
+    profiles[0]["changed"] = True
+    get_data._profile_cache["kalabash"] = (CompressedJSON.from_value(profiles), time.time())
+
+
+def test_result_is_stored_under_the_payload_it_was_scored_from(offline, monkeypatch):
+    scored_digest = get_data._profile_cache["kalabash"][0].digest()
+
+    async def refresh_while_scoring(api_key, profile_id):
+        _refresh_profiles()  # another lookup of the same player refreshed the cache meanwhile
+        return {}
+
+    monkeypatch.setattr(mapleWeight, "get_garden_data", refresh_while_scoring)
+    result = asyncio.run(mapleWeight.main("kalabash", "key", quiet=True))
+    assert get_result("kalabash", None, get_data.profiles_fingerprint("kalabash")) is None
+    assert get_result("kalabash", None, scored_digest) is result
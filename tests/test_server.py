@@ -0,0 +1,76 @@
+import asyncio
+import pytest
+from aiohttp.test_utils import TestClient, TestServer
+from .. import get_data
+from ..cache_store import CacheStore
+from ..server import RETRY_AFTER, create_app
+
+
+@pytest.fixture(autouse=True)
+def scratch_store(monkeypatch, tmp_path):
+    # Keep these lookups out of the package's on-disk cache
+    store = CacheStore(str(tmp_path / "cache.sqlite3"))
+    monkeypatch.setattr(get_data, "_store", store)
+    yield
+    store.close()
+
+
+def lookup(monkeypatch, mojang, hypixel=None, path="/weight/someone"):
+    """GETs path from a fresh app whose Mojang / Hypixel answers are the given (status, data) pairs."""
+    async def fetch_json(url, **kwargs):
+        return mojang if "mojang" in url else hypixel
+
+    monkeypatch.setattr(get_data, "fetch_json", fetch_json)
+    monkeypatch.setattr(get_data, "_uuid_cache", {})
+    monkeypatch.setattr(get_data, "_profile_cache", {})
+
+    async def go():
+        async with TestClient(TestServer(create_app("key"))) as client:
+            resp = await client.get(path)
+            return resp.status, resp.headers.get("Retry-After"), await resp.json()
+
+    return asyncio.run(go())
+
+
+UUID = (200, {"id": "0123456789abcdef0123456789abcdef"})
+
+
+@pytest.mark.parametrize("mojang", [(204, None), (404, {"errorMessage": "x"}), (400, {"errorMessage": "bad name"})])
+def test_unknown_or_malformed_name_is_404(monkeypatch, mojang):
+    status, _, body = lookup(monkeypatch, mojang)
+    assert status == 404
+    assert "Unable to resolve UUID" in body["error"]
+
+
+@pytest.mark.parametrize("profiles", [None, [], [{"cute_name": "Apple", "profile_id": "p"}]])
+def test_no_selected_profile_is_404(monkeypatch, profiles):
+    status, _, body = lookup(monkeypatch, UUID, (200, {"success": True, "profiles": profiles}))
+    assert status == 404
+    assert "has no SkyBlock profiles" in body["error"]
+
+
+def test_unknown_profile_name_is_404(monkeypatch):
+    profiles = [{"cute_name": "Apple", "profile_id": "p", "selected": True}]
+    status, _, body = lookup(monkeypatch, UUID, (200, {"success": True, "profiles": profiles}), "/weight/someone/banana")
+    assert status == 404
+    assert "Apple" in body["error"]
+
+
+@pytest.mark.parametrize("mojang, hypixel", [
+    ((429, None), None),
+    (UUID, (429, {"success": False, "throttle": True})),
+])
+def test_rate_limited_upstream_is_503(monkeypatch, mojang, hypixel):
+    status, retry_after, _ = lookup(monkeypatch, mojang, hypixel)
+    assert status == 503
+    assert retry_after == str(RETRY_AFTER)
+
+
+@pytest.mark.parametrize("mojang, hypixel", [
+    ((500, None), None),
+    (UUID, (403, {"success": False, "cause": "Invalid API key"})),
+    (UUID, (503, None)),
+])
+def test_upstream_failure_is_502(monkeypatch, mojang, hypixel):
+    status, _, _ = lookup(monkeypatch, mojang, hypixel)
+    assert status == 502
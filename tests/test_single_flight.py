@@ -0,0 +1,88 @@
+import asyncio
+import pytest
+from ..single_flight import SingleFlight
+
+
+def test_concurrent_calls_share_one_run():
+    flights = SingleFlight()
+    calls = []
+
+    async def work(value):
+        calls.append(value)
+        await asyncio.sleep(0.01)
+        return value * 2
+
+    async def go():
+        results = await asyncio.gather(*[flights.do("k", work, 21) for _ in range(5)])
+        return results, flights.in_flight("k")
+
+    results, still_in_flight = asyncio.run(go())
+    assert results == [42] * 5
+    assert calls == [21]
+    assert not still_in_flight
+
+
+def test_different_keys_run_separately():
+    flights = SingleFlight()
+    calls = []
+
+    async def work(value):
+        calls.append(value)
+        await asyncio.sleep(0.01)
+        return value
+
+    async def go():
+        return await asyncio.gather(flights.do("a", work, 1), flights.do("b", work, 2))
+
+    assert asyncio.run(go()) == [1, 2]
+    assert sorted(calls) == [1, 2]
+
+
+def test_later_calls_run_again():
+    flights = SingleFlight()
+    calls = []
+
+    async def work():
+        calls.append(1)
+        return len(calls)
+
+    async def go():
+        return await flights.do("k", work), await flights.do("k", work)
+
+    assert asyncio.run(go()) == (1, 2)
+
+
+def test_exception_reaches_every_waiter_and_is_forgotten():
+    flights = SingleFlight()
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    async def go():
+        results = await asyncio.gather(*[flights.do("k", fail) for _ in range(3)], return_exceptions=True)
+        return results, flights.in_flight("k")
+
+    results, still_in_flight = asyncio.run(go())
+    assert all(isinstance(r, ValueError) for r in results)
+    assert not still_in_flight
+
+
+def test_cancelled_waiter_does_not_cancel_the_work():
+    flights = SingleFlight()
+
+    async def work():
+        await asyncio.sleep(0.02)
+        return "done"
+
+    async def go():
+        impatient = asyncio.ensure_future(flights.do("k", work))
+        patient = asyncio.ensure_future(flights.do("k", work))
+        await asyncio.sleep(0.005)
+        impatient.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await impatient
+        return await patient
+
+    assert asyncio.run(go()) == "done"
+
@@ -0,0 +1,140 @@
+import time
+
+# Per-stage timing spans for a lookup (Mojang, profiles, museum, garden, decoding, each category scorer).
+# Off by default. enable_timing() makes every computed lookup carry a Timings on result.timings and, if a
+# callback is given, hands (username, result) to it as soon as the lookup finishes. While disabled every span
+# is a shared no-op object, so the instrumented code costs next to nothing.
+
+
+class Timings:
+    __slots__ = ("spans", "_origin")
+
+    def __init__(self):
+        self.spans = []  # (name, start, duration) in seconds, start relative to when this was created
+        self._origin = time.perf_counter()
+
+    def __bool__(self):
+        return True
+
+    def now(self):
+        return time.perf_counter() - self._origin
+
+    def span(self, name):
+        return _Span(self, name)
+
+    async def timed(self, name, awaitable):
+        start = time.perf_counter()
+        try:
+            return await awaitable
+        finally:
+            self.add(name, start - self._origin, time.perf_counter() - start)
+
+    def add(self, name, start, duration):
+        self.spans.append((name, start, duration))
+
+    def merge(self, other, offset=0.0):
+        """Adds another Timings' spans (e.g. from a worker process), shifted to start at `offset`."""
+        for name, start, duration in other.spans:
+            self.spans.append((name, offset + start, duration))
+
+    def totals(self):
+        """name -> total seconds spent in spans with that name."""
+        totals = {}
+        for name, _, duration in self.spans:
+            totals[name] = totals.get(name, 0.0) + duration
+        return totals
+
+    def to_dict(self):
+        return [{"name": name, "start_ms": round(start * 1000, 3), "ms": round(duration * 1000, 3)}
+                for name, start, duration in self.spans]
+
+    def __repr__(self):
+        return "Timings(" + ", ".join(f"{name}={duration * 1000:.1f}ms" for name, _, duration in self.spans) + ")"
+
+
+class _Span:
+    __slots__ = ("timings", "name", "start")
+
+    def __init__(self, timings, name):
+        self.timings = timings
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter()
+        self.timings.add(self.name, self.start - self.timings._origin, end - self.start)
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+
+class _NullTimings:
+    """Stands in for Timings while timing is disabled. Falsy, records nothing."""
+    __slots__ = ()
+    spans = ()
+
+    def __bool__(self):
+        return False
+
+    def now(self):
+        return 0.0
+
+    def span(self, name):
+        return _NULL_SPAN
+
+    async def timed(self, name, awaitable):
+        return await awaitable
+
+    def add(self, name, start, duration):
+        pass
+
+    def merge(self, other, offset=0.0):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+NULL_TIMINGS = _NullTimings()
+
+_enabled = False
+_callback = None
+
+
+def enable_timing(callback=None):
+    """Turns timing on. callback(username, result) is called after every computed lookup."""
+    global _enabled, _callback
+    _enabled = True
+    _callback = callback
+
+
+def disable_timing():
+    global _enabled, _callback
+    _enabled = False
+    _callback = None
+
+
+def timing_enabled():
+    return _enabled
+
+
+def new_timings():
+    return Timings() if _enabled else NULL_TIMINGS
+
+
+def emit(username, result):
+    if _callback is None:
+        return
+    try:
+        _callback(username, result)
+    except Exception as e:
+        # A broken hook shouldn't fail the lookup
+        print(f"Timing callback failed: {e}")
@@ -0,0 +1,51 @@
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor
+from . import metrics
+
+# Optional process pool for the CPU-bound half of a lookup.
+# Fetching stays on the event loop; decoding the NBT and running the scorers is plain Python and holds the GIL,
+# so with a pool started, each profile's decode+score job runs in a worker process and only the small
+# (weight, breakdown) result comes back. Without a pool everything runs in-process as before.
+
+_pool = None
+
+
+def _init_worker():
+    # Load the accessory registry up front rather than during the first job
+    from .individual_weights.mw_utils.Accessory_Registry import load_registry
+    load_registry()
+
+
+def _call_with_metrics(fn, args):
+    # Runs in the worker: returns fn's result along with whatever it added to the worker's metrics
+    before = metrics.snapshot()
+    result = fn(*args)
+    return result, metrics.diff(before)
+
+
+def start_pool(workers=None):
+    """Starts (or restarts) the worker pool. `workers` defaults to the number of CPUs."""
+    global _pool
+    shutdown_pool()
+    _pool = ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1, initializer=_init_worker)
+    return _pool
+
+
+def shutdown_pool(wait=True):
+    global _pool
+    if _pool is not None:
+        pool, _pool = _pool, None
+        pool.shutdown(wait=wait, cancel_futures=True)
+
+
+def get_pool():
+    return _pool
+
+
+async def run_in_pool(fn, *args):
+    """Runs fn(*args) in the worker pool. fn and its arguments must be picklable."""
+    loop = asyncio.get_running_loop()
+    result, metrics_delta = await loop.run_in_executor(_pool, _call_with_metrics, fn, args)
+    metrics.merge(metrics_delta)
+    return result